@@ -1,3 +1,8 @@
-from sodium_uncertainty.calculator import compute_from_json
+from sodium_uncertainty.cache import ResponseCache
+from sodium_uncertainty.scenarios import compute_scenarios_from_json
 
-__all__ = ["compute_from_json"]
+# Clinicians re-enter the same pairs with unchanged defaults; reuse the serialized response.
+_cache = ResponseCache(max_entries=256, cache_json=True)
+compute_from_json = _cache.compute_from_json
+
+__all__ = ["compute_from_json", "compute_scenarios_from_json"]
@@ -0,0 +1,51 @@
+// Scores bulk CSV chunks with its own Pyodide instance; docs/index.html runs a pool of these
+// sized to the machine. Chunks arrive as whole CSV records and only scored CSV text and bucket
+// counts go back to the page, so the file never leaves the browser.
+let pyodide = null;
+let scoreCsvText = null;
+let loadsJson = null;
+
+const load = async ({ pyodideBase, packageFiles }) => {
+  importScripts(`${pyodideBase}pyodide.js`);
+  pyodide = await loadPyodide({ indexURL: pyodideBase });
+  pyodide.FS.mkdirTree("/home/pyodide/sodium_uncertainty");
+  for (const file of packageFiles) {
+    const response = await fetch(file);
+    if (!response.ok) {
+      throw new Error(`Failed to load ${file}: ${response.status}`);
+    }
+    pyodide.FS.writeFile(`/home/pyodide/${file}`, await response.text());
+  }
+  pyodide.runPython('import sys; sys.path.append("/home/pyodide")');
+  const runner = pyodide.pyimport("sodium_uncertainty.runner");
+  scoreCsvText = runner.score_csv_text;
+  loadsJson = pyodide.pyimport("json").loads;
+  return runner.SCORED_CSV_COLUMNS.toJs();
+};
+
+const score = ({ text, header, base }) => {
+  const pyHeader = pyodide.toPy(header);
+  const pyBase = loadsJson(JSON.stringify(base));
+  const result = scoreCsvText(text, pyHeader, pyBase);
+  try {
+    const [csv, counts] = result.toJs({ dict_converter: Object.fromEntries });
+    return { csv, counts };
+  } finally {
+    result.destroy();
+    pyBase.destroy();
+    pyHeader.destroy();
+  }
+};
+
+self.addEventListener("message", async (event) => {
+  const message = event.data;
+  try {
+    if (message.type === "init") {
+      self.postMessage({ type: "ready", columns: await load(message) });
+    } else if (message.type === "score") {
+      self.postMessage({ type: "scored", ...score(message) });
+    }
+  } catch (error) {
+    self.postMessage({ type: "error", message: String(error) });
+  }
+});
@@ -0,0 +1,508 @@
+// Layered canvas renderer shared by plot-worker.js (OffscreenCanvas in a worker) and the
+// main-thread fallback in index.html. Each plot keeps one offscreen canvas per layer and
+// repaints a layer only when its inputs change; the visible canvas is a stack of blits.
+(() => {
+  const PADDING = { left: 28, right: 16, top: 16, bottom: 32 };
+  const TICK_FONT = "11px system-ui, -apple-system, Segoe UI, sans-serif";
+  const LABEL_FONT = "12px system-ui, -apple-system, Segoe UI, sans-serif";
+  const SMALL_FONT = "10px system-ui, -apple-system, Segoe UI, sans-serif";
+  const INTERVAL_STYLES = [
+    { level: 0.99, fill: "rgba(31,111,235,0.08)", stroke: "rgba(31,111,235,0.3)" },
+    { level: 0.95, fill: "rgba(31,111,235,0.16)", stroke: "rgba(31,111,235,0.45)" },
+    { level: 0.5, fill: "rgba(31,111,235,0.28)", stroke: "rgba(31,111,235,0.6)" },
+  ];
+  const SELECTED_CI_FILL = "rgba(15, 118, 110, 0.12)";
+  const TAIL_FILL = "rgba(239, 68, 68, 0.18)";
+
+  const niceStep = (rawStep) => {
+    if (!Number.isFinite(rawStep) || rawStep <= 0) {
+      return 1;
+    }
+    const magnitude = 10 ** Math.floor(Math.log10(rawStep));
+    const normalized = rawStep / magnitude;
+    let step = 10;
+    if (normalized <= 1) {
+      step = 1;
+    } else if (normalized <= 2) {
+      step = 2;
+    } else if (normalized <= 5) {
+      step = 5;
+    }
+    return step * magnitude;
+  };
+
+  const decimalsForStep = (step) => {
+    if (step >= 1) {
+      return 0;
+    }
+    if (step >= 0.1) {
+      return 1;
+    }
+    if (step >= 0.01) {
+      return 2;
+    }
+    return 3;
+  };
+
+  const sameInputs = (a, b) => {
+    if (a === b) {
+      return true;
+    }
+    if (typeof a !== "object" || typeof b !== "object" || a === null || b === null) {
+      return Number.isNaN(a) && Number.isNaN(b);
+    }
+    const keysA = Object.keys(a);
+    if (keysA.length !== Object.keys(b).length) {
+      return false;
+    }
+    return keysA.every((key) => sameInputs(a[key], b[key]));
+  };
+
+  const extent = (arrays) => {
+    let min = Infinity;
+    let max = -Infinity;
+    arrays.forEach((values) => {
+      for (let index = 0; index < values.length; index += 1) {
+        const value = values[index];
+        if (value < min) {
+          min = value;
+        }
+        if (value > max) {
+          max = value;
+        }
+      }
+    });
+    return [min, max];
+  };
+
+  const makeFrame = (width, height, xs, ys) => {
+    const [xMin, xMax] = extent(xs);
+    const xSpan = xMax - xMin || 1;
+    const yMax = Math.max(extent(ys)[1], 0.001);
+    const axisY = height - PADDING.bottom;
+    return {
+      width,
+      height,
+      xMin,
+      xMax,
+      yMax,
+      axisY,
+      scaleX: (x) => PADDING.left + ((x - xMin) / xSpan) * (width - PADDING.left - PADDING.right),
+      scaleY: (y) => axisY - (y / yMax) * (height - PADDING.top - PADDING.bottom),
+    };
+  };
+
+  const seriesPath = (frame, curve) => {
+    const path = new Path2D();
+    const { x, y } = curve;
+    for (let index = 0; index < x.length; index += 1) {
+      if (index === 0) {
+        path.moveTo(frame.scaleX(x[index]), frame.scaleY(y[index]));
+      } else {
+        path.lineTo(frame.scaleX(x[index]), frame.scaleY(y[index]));
+      }
+    }
+    return path;
+  };
+
+  const drawAxis = (ctx, frame, axisLabel) => {
+    const step = niceStep((frame.xMax - frame.xMin) / 6);
+    const decimals = decimalsForStep(step);
+    const start = Math.ceil(frame.xMin / step) * step;
+    ctx.strokeStyle = "#cbd5f5";
+    ctx.lineWidth = 1;
+    ctx.beginPath();
+    ctx.moveTo(PADDING.left, frame.axisY);
+    ctx.lineTo(frame.width - PADDING.right, frame.axisY);
+    ctx.stroke();
+    ctx.fillStyle = "#6b7280";
+    ctx.font = TICK_FONT;
+    for (let value = start; value <= frame.xMax + step * 0.5; value += step) {
+      const x = frame.scaleX(value);
+      ctx.beginPath();
+      ctx.moveTo(x, frame.axisY);
+      ctx.lineTo(x, frame.axisY + 4);
+      ctx.stroke();
+      const label = (Math.abs(value) < 1e-6 ? 0 : value).toFixed(decimals);
+      ctx.fillText(label, x - ctx.measureText(label).width / 2, frame.axisY + 16);
+    }
+    if (axisLabel) {
+      ctx.fillStyle = "#111827";
+      ctx.font = LABEL_FONT;
+      ctx.fillText(
+        axisLabel,
+        frame.width / 2 - ctx.measureText(axisLabel).width / 2,
+        frame.height - 4,
+      );
+    }
+  };
+
+  const drawSelectedCI = (ctx, frame, selectedCI) => {
+    if (!selectedCI) {
+      return;
+    }
+    const xLow = frame.scaleX(selectedCI.low);
+    const xHigh = frame.scaleX(selectedCI.high);
+    ctx.fillStyle = SELECTED_CI_FILL;
+    ctx.fillRect(xLow, PADDING.top, xHigh - xLow, frame.axisY - PADDING.top);
+  };
+
+  const drawIntervals = (ctx, frame, intervals) => {
+    if (!intervals || intervals.length === 0) {
+      return;
+    }
+    const intervalMap = new Map(intervals.map((entry) => [entry.level, entry]));
+    INTERVAL_STYLES.forEach((style) => {
+      const entry = intervalMap.get(style.level);
+      if (!entry) {
+        return;
+      }
+      const xLow = frame.scaleX(entry.low);
+      const xHigh = frame.scaleX(entry.high);
+      ctx.fillStyle = style.fill;
+      ctx.strokeStyle = style.stroke;
+      ctx.lineWidth = 1;
+      ctx.beginPath();
+      ctx.moveTo(xLow, PADDING.top);
+      ctx.lineTo(xLow, frame.axisY);
+      if (Math.abs(xHigh - xLow) >= 1) {
+        ctx.fillRect(xLow, PADDING.top, xHigh - xLow, frame.axisY - PADDING.top);
+        ctx.moveTo(xHigh, PADDING.top);
+        ctx.lineTo(xHigh, frame.axisY);
+      }
+      ctx.stroke();
+    });
+  };
+
+  const fillTail = (ctx, frame, curve, predicate) => {
+    const { scaleX, scaleY, axisY } = frame;
+    ctx.fillStyle = TAIL_FILL;
+    let started = false;
+    ctx.beginPath();
+    curve.x.forEach((x, index) => {
+      const y = curve.y[index];
+      if (predicate(x)) {
+        if (!started) {
+          ctx.moveTo(scaleX(x), axisY);
+          started = true;
+        }
+        ctx.lineTo(scaleX(x), scaleY(y));
+      } else if (started) {
+        ctx.lineTo(scaleX(curve.x[index - 1]), axisY);
+        ctx.closePath();
+        ctx.fill();
+        started = false;
+        ctx.beginPath();
+      }
+    });
+    if (started) {
+      ctx.lineTo(scaleX(curve.x[curve.x.length - 1]), axisY);
+      ctx.closePath();
+      ctx.fill();
+    }
+  };
+
+  const strokeSeries = (ctx, path, color, dashed = false) => {
+    ctx.strokeStyle = color;
+    ctx.lineWidth = 2;
+    ctx.setLineDash(dashed ? [4, 4] : []);
+    ctx.stroke(path);
+    ctx.setLineDash([]);
+  };
+
+  const drawMarkers = (ctx, frame, markers) => {
+    ctx.font = SMALL_FONT;
+    (markers || []).forEach((marker) => {
+      const x = frame.scaleX(marker.value);
+      ctx.strokeStyle = marker.color || "#111827";
+      ctx.lineWidth = 1.5;
+      ctx.setLineDash(marker.dashed ? [4, 4] : []);
+      ctx.beginPath();
+      ctx.moveTo(x, PADDING.top);
+      ctx.lineTo(x, frame.axisY);
+      ctx.stroke();
+      ctx.setLineDash([]);
+      if (marker.label) {
+        ctx.fillStyle = marker.color || "#111827";
+        ctx.fillText(marker.label, x - ctx.measureText(marker.label).width / 2, PADDING.top - 2);
+      }
+    });
+  };
+
+  const drawIntervalLegend = (ctx) => {
+    const legendX = PADDING.left + 4;
+    let legendY = PADDING.top + 6;
+    ctx.font = TICK_FONT;
+    INTERVAL_STYLES.forEach((style) => {
+      ctx.fillStyle = style.fill;
+      ctx.strokeStyle = style.stroke;
+      ctx.lineWidth = 1;
+      ctx.fillRect(legendX, legendY - 8, 10, 10);
+      ctx.strokeRect(legendX, legendY - 8, 10, 10);
+      ctx.fillStyle = "#111827";
+      ctx.fillText(`${Math.round(style.level * 100)}%`, legendX + 14, legendY);
+      legendY += 14;
+    });
+  };
+
+  const drawDeltaLegend = (ctx) => {
+    ctx.font = TICK_FONT;
+    ctx.strokeStyle = "#1f6feb";
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    ctx.moveTo(PADDING.left + 6, PADDING.top + 8);
+    ctx.lineTo(PADDING.left + 20, PADDING.top + 8);
+    ctx.stroke();
+    ctx.fillStyle = "#111827";
+    ctx.fillText("Plausible true Δ", PADDING.left + 24, PADDING.top + 12);
+    ctx.strokeStyle = "#9ca3af";
+    ctx.setLineDash([4, 4]);
+    ctx.beginPath();
+    ctx.moveTo(PADDING.left + 6, PADDING.top + 22);
+    ctx.lineTo(PADDING.left + 20, PADDING.top + 22);
+    ctx.stroke();
+    ctx.setLineDash([]);
+    ctx.fillStyle = "#6b7280";
+    ctx.fillText("No-change (chance) Δ", PADDING.left + 24, PADDING.top + 26);
+  };
+
+  const drawProbabilityGrid = (ctx, frame) => {
+    ctx.font = SMALL_FONT;
+    ctx.lineWidth = 1;
+    [0.25, 0.5, 0.75, 1].forEach((level) => {
+      const y = frame.scaleY(level);
+      ctx.strokeStyle = "#e5e7eb";
+      ctx.beginPath();
+      ctx.moveTo(PADDING.left, y);
+      ctx.lineTo(frame.width - PADDING.right, y);
+      ctx.stroke();
+      if (level === 0.5 || level === 1) {
+        const label = String(level);
+        ctx.fillStyle = "#6b7280";
+        ctx.fillText(label, PADDING.left - ctx.measureText(label).width - 4, y + 3);
+      }
+    });
+  };
+
+  const drawExceedanceLegend = (ctx, frame) => {
+    const right = frame.width - PADDING.right;
+    ctx.font = TICK_FONT;
+    ctx.strokeStyle = "#1f6feb";
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    ctx.moveTo(right - 118, PADDING.top + 8);
+    ctx.lineTo(right - 104, PADDING.top + 8);
+    ctx.stroke();
+    ctx.fillStyle = "#111827";
+    ctx.fillText("True |Δ| > t", right - 100, PADDING.top + 12);
+    ctx.strokeStyle = "#9ca3af";
+    ctx.setLineDash([4, 4]);
+    ctx.beginPath();
+    ctx.moveTo(right - 118, PADDING.top + 22);
+    ctx.lineTo(right - 104, PADDING.top + 22);
+    ctx.stroke();
+    ctx.setLineDash([]);
+    ctx.fillStyle = "#6b7280";
+    ctx.fillText("Noise |Δ| > t", right - 100, PADDING.top + 26);
+  };
+
+  const drawIntervalLabels = (ctx, frame, intervals) => {
+    if (!intervals || intervals.length === 0) {
+      return;
+    }
+    ctx.font = SMALL_FONT;
+    ctx.fillStyle = "#111827";
+    [...intervals]
+      .sort((a, b) => b.level - a.level)
+      .forEach((entry, row) => {
+        const label = `${Math.round(entry.level * 100)}%: ${entry.low.toFixed(2)}–${entry.high.toFixed(2)}`;
+        const y = PADDING.top + 12 + row * 12;
+        ctx.fillText(label, frame.width - PADDING.right - ctx.measureText(label).width, y);
+      });
+  };
+
+  // Layers are composited bottom to top in the order the original single-pass
+  // renderers painted them.
+  const LAYERS = {
+    curve: [
+      {
+        name: "bands",
+        inputs: (f, a) => [f.xMin, f.xMax, a.intervals, a.options.selectedCI],
+        draw: (ctx, f, a) => {
+          drawIntervals(ctx, f, a.intervals);
+          drawSelectedCI(ctx, f, a.options.selectedCI);
+        },
+      },
+      {
+        name: "axis",
+        inputs: (f, a) => [f.xMin, f.xMax, a.axisLabel],
+        draw: (ctx, f, a) => drawAxis(ctx, f, a.axisLabel),
+      },
+      {
+        name: "series",
+        inputs: (f, a) => [f.xMin, f.xMax, f.yMax, a.curve, a.options.strokeColor],
+        draw: (ctx, f, a) =>
+          strokeSeries(ctx, seriesPath(f, a.curve), a.options.strokeColor || "#1f6feb"),
+      },
+      {
+        name: "markers",
+        inputs: (f, a) => [f.xMin, f.xMax, a.options.markers],
+        draw: (ctx, f, a) => drawMarkers(ctx, f, a.options.markers),
+      },
+      { name: "legend", inputs: () => [], draw: (ctx) => drawIntervalLegend(ctx) },
+      {
+        name: "labels",
+        inputs: (f, a) => [a.intervals],
+        draw: (ctx, f, a) => drawIntervalLabels(ctx, f, a.intervals),
+      },
+    ],
+    delta: [
+      {
+        name: "bands",
+        inputs: (f, a) => [
+          f.xMin,
+          f.xMax,
+          f.yMax,
+          a.nullCurve,
+          a.options.selectedCI,
+          a.options.deltaObs,
+        ],
+        draw: (ctx, f, a) => {
+          drawSelectedCI(ctx, f, a.options.selectedCI);
+          const { deltaObs } = a.options;
+          if (deltaObs !== null && Number.isFinite(deltaObs)) {
+            const cut = Math.abs(deltaObs);
+            fillTail(ctx, f, a.nullCurve, (x) => x <= -cut);
+            fillTail(ctx, f, a.nullCurve, (x) => x >= cut);
+          }
+        },
+      },
+      {
+        name: "axis",
+        inputs: (f, a) => [f.xMin, f.xMax, a.options.axisLabel],
+        draw: (ctx, f, a) => drawAxis(ctx, f, a.options.axisLabel),
+      },
+      {
+        name: "series",
+        inputs: (f, a) => [f.xMin, f.xMax, f.yMax, a.posterior, a.nullCurve],
+        draw: (ctx, f, a) => {
+          strokeSeries(ctx, seriesPath(f, a.nullCurve), "#9ca3af", true);
+          strokeSeries(ctx, seriesPath(f, a.posterior), "#1f6feb");
+        },
+      },
+      {
+        name: "markers",
+        inputs: (f, a) => [f.xMin, f.xMax, a.options.markers],
+        draw: (ctx, f, a) => drawMarkers(ctx, f, a.options.markers),
+      },
+      { name: "legend", inputs: () => [], draw: (ctx) => drawDeltaLegend(ctx) },
+    ],
+    exceedance: [
+      { name: "grid", inputs: () => [], draw: (ctx, f) => drawProbabilityGrid(ctx, f) },
+      {
+        name: "axis",
+        inputs: (f, a) => [f.xMin, f.xMax, a.options.axisLabel],
+        draw: (ctx, f, a) => drawAxis(ctx, f, a.options.axisLabel),
+      },
+      {
+        name: "series",
+        inputs: (f, a) => [f.xMin, f.xMax, a.posterior, a.nullCurve],
+        draw: (ctx, f, a) => {
+          strokeSeries(ctx, seriesPath(f, a.nullCurve), "#9ca3af", true);
+          strokeSeries(ctx, seriesPath(f, a.posterior), "#1f6feb");
+        },
+      },
+      {
+        name: "markers",
+        inputs: (f, a) => [f.xMin, f.xMax, a.options.markers],
+        draw: (ctx, f, a) => drawMarkers(ctx, f, a.options.markers),
+      },
+      { name: "legend", inputs: () => [], draw: (ctx, f) => drawExceedanceLegend(ctx, f) },
+    ],
+  };
+
+  // Exceedance probabilities share a fixed 0–1 y-range so curves stay comparable.
+  const FRAMES = {
+    curve: (width, height, a) => makeFrame(width, height, [a.curve.x], [a.curve.y]),
+    delta: (width, height, a) =>
+      makeFrame(width, height, [a.posterior.x, a.nullCurve.x], [a.posterior.y, a.nullCurve.y]),
+    exceedance: (width, height, a) => makeFrame(width, height, [a.posterior.x], [[1]]),
+  };
+
+  const createLayerCanvas = (width, height) => {
+    if (typeof OffscreenCanvas !== "undefined") {
+      return new OffscreenCanvas(width, height);
+    }
+    const canvas = document.createElement("canvas");
+    canvas.width = width;
+    canvas.height = height;
+    return canvas;
+  };
+
+  const createPlot = (canvas) => {
+    const ctx = canvas.getContext("2d");
+    const layers = new Map();
+    const stats = { draws: 0, layerPaints: 0 };
+
+    const render = (kind, args) => {
+      const { width, height } = canvas;
+      const frame = FRAMES[kind](width, height, args);
+      const shared = [width, height];
+      stats.draws += 1;
+      ctx.clearRect(0, 0, width, height);
+      LAYERS[kind].forEach((layer) => {
+        const key = `${kind}:${layer.name}`;
+        const inputs = [...shared, ...layer.inputs(frame, args)];
+        let cached = layers.get(key);
+        if (!cached || cached.canvas.width !== width || cached.canvas.height !== height) {
+          cached = { canvas: createLayerCanvas(width, height), inputs: null };
+          layers.set(key, cached);
+        }
+        if (!sameInputs(cached.inputs, inputs)) {
+          const layerCtx = cached.canvas.getContext("2d");
+          layerCtx.clearRect(0, 0, width, height);
+          layer.draw(layerCtx, frame, args);
+          cached.inputs = inputs;
+          stats.layerPaints += 1;
+        }
+        ctx.drawImage(cached.canvas, 0, 0);
+      });
+    };
+
+    return {
+      stats,
+      draw: render,
+      drawCurve: (curve, mean, intervals, axisLabel, options = {}) =>
+        render("curve", { curve, mean, intervals, axisLabel, options }),
+      drawDeltaPlot: (posterior, nullCurve, options = {}) =>
+        render("delta", { posterior, nullCurve, options }),
+      drawExceedance: (posterior, nullCurve, options = {}) =>
+        render("exceedance", { posterior, nullCurve, options }),
+    };
+  };
+
+  // Main-thread client: transfers each canvas to plot-worker.js when OffscreenCanvas is
+  // available, otherwise renders in place with the same layered renderer.
+  const createClient = (canvasIds, workerUrl = "plot-worker.js") => {
+    const canvases = canvasIds.map((id) => document.getElementById(id));
+    const canTransfer =
+      typeof Worker !== "undefined" &&
+      canvases.every((canvas) => typeof canvas.transferControlToOffscreen === "function");
+    if (canTransfer) {
+      const worker = new Worker(workerUrl);
+      canvases.forEach((canvas) => {
+        const offscreen = canvas.transferControlToOffscreen();
+        worker.postMessage({ type: "attach", id: canvas.id, canvas: offscreen }, [offscreen]);
+      });
+      return {
+        draw: (id, kind, args) => worker.postMessage({ type: "draw", id, kind, args }),
+      };
+    }
+    const plots = new Map(canvases.map((canvas) => [canvas.id, createPlot(canvas)]));
+    return {
+      draw: (id, kind, args) => plots.get(id).draw(kind, args),
+    };
+  };
+
+  self.PlotRender = { createPlot, createClient, niceStep, decimalsForStep, sameInputs };
+})();
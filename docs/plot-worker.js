@@ -0,0 +1,33 @@
+// Renders the result plots on OffscreenCanvas off the main thread. Draw requests that
+// arrive faster than frames are coalesced so only the latest request per canvas is painted.
+importScripts("plot-render.js");
+
+const plots = new Map();
+const pending = new Map();
+let scheduled = false;
+
+const schedule =
+  typeof self.requestAnimationFrame === "function"
+    ? (callback) => self.requestAnimationFrame(callback)
+    : (callback) => setTimeout(callback, 0);
+
+const flush = () => {
+  scheduled = false;
+  pending.forEach(({ kind, args }, id) => plots.get(id).draw(kind, args));
+  pending.clear();
+};
+
+self.addEventListener("message", (event) => {
+  const message = event.data;
+  if (message.type === "attach") {
+    plots.set(message.id, self.PlotRender.createPlot(message.canvas));
+    return;
+  }
+  if (message.type === "draw") {
+    pending.set(message.id, message);
+    if (!scheduled) {
+      scheduled = true;
+      schedule(flush);
+    }
+  }
+});
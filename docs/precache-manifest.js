@@ -0,0 +1,43 @@
+// Generated by scripts/stage_docs_python.py; do not edit.
+self.PRECACHE_MANIFEST = {
+  "assets": {
+    "app.py": "bd582fe82ac7b1cf",
+    "bulk-worker.js": "356bdd610e60bcb0",
+    "index.html": "f6d65cf5803a32b8",
+    "plot-render.js": "a6fe27b07a9d2a38",
+    "plot-worker.js": "fa81f6eeaec5d5e5",
+    "sodium_uncertainty/__init__.py": "4fcfd99e93485de8",
+    "sodium_uncertainty/aggregates.py": "1f8a42a0e90ded03",
+    "sodium_uncertainty/batch.py": "d921e6c8fbe659bc",
+    "sodium_uncertainty/cache.py": "26a9eda3d343875b",
+    "sodium_uncertainty/calculator.py": "80cf862cc04b5cbd",
+    "sodium_uncertainty/columnar.py": "b5e56a962ed42068",
+    "sodium_uncertainty/convolution.py": "db6ad17b2e8e147d",
+    "sodium_uncertainty/defaults.py": "5317e1a1ce1f21d7",
+    "sodium_uncertainty/estimation.py": "612104ff1a4d8d6d",
+    "sodium_uncertainty/memprofile.py": "23fd2659c1bff8b8",
+    "sodium_uncertainty/model.py": "b82969f3afd350e3",
+    "sodium_uncertainty/pairing.py": "971105464f2ce993",
+    "sodium_uncertainty/panel.py": "ff2b303116229d1b",
+    "sodium_uncertainty/precision.py": "1c2b93e55b55433c",
+    "sodium_uncertainty/provider.py": "91692e069041773c",
+    "sodium_uncertainty/query.py": "bd619c59a7993dc7",
+    "sodium_uncertainty/registry.py": "e71967c4cfae72a8",
+    "sodium_uncertainty/runner.py": "ac9aba14d3c20433",
+    "sodium_uncertainty/scenarios.py": "0f0fdcd2ca52167e",
+    "sodium_uncertainty/synthetic.py": "fb99e02d9c269938",
+    "sodium_uncertainty/types.py": "32c98c8128169291",
+    "sodium_uncertainty/validation.py": "50a498940722778a",
+    "styles.css": "6994cf1735ca75f2",
+    "variability_defaults.json": "5e805e883a998759"
+  },
+  "runtime": [
+    "https://cdn.jsdelivr.net/pyodide/v0.25.1/full/pyodide.js",
+    "https://cdn.jsdelivr.net/pyodide/v0.25.1/full/pyodide.asm.js",
+    "https://cdn.jsdelivr.net/pyodide/v0.25.1/full/pyodide.asm.wasm",
+    "https://cdn.jsdelivr.net/pyodide/v0.25.1/full/python_stdlib.zip",
+    "https://cdn.jsdelivr.net/pyodide/v0.25.1/full/pyodide-lock.json"
+  ],
+  "runtime_version": "500e6a2894194c74",
+  "version": "062923251dc3d6f7"
+};
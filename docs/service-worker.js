@@ -0,0 +1,108 @@
+// Precaches the static app and the pinned Pyodide runtime, then serves them cache-first.
+// The asset list and content hashes come from precache-manifest.js, which
+// scripts/stage_docs_python.py regenerates on every `make stage-docs`.
+importScripts("precache-manifest.js");
+
+const { version, assets, runtime, runtime_version: runtimeVersion } = self.PRECACHE_MANIFEST;
+const CACHE_PREFIX = "sodium-uncertainty-";
+const APP_CACHE = `${CACHE_PREFIX}app-${version}`;
+const RUNTIME_CACHE = `${CACHE_PREFIX}pyodide-${runtimeVersion}`;
+
+const scopeUrl = (path) => new URL(path, self.registration.scope).href;
+
+const sha256Prefix = async (buffer, length) => {
+  const digest = await crypto.subtle.digest("SHA-256", buffer);
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, "0"))
+    .join("")
+    .slice(0, length);
+};
+
+const precacheApp = async () => {
+  const cache = await caches.open(APP_CACHE);
+  await Promise.all(
+    Object.entries(assets).map(async ([path, hash]) => {
+      const url = scopeUrl(path);
+      if (await cache.match(url)) {
+        return;
+      }
+      const response = await fetch(url, { cache: "no-cache" });
+      if (!response.ok) {
+        throw new Error(`Failed to precache ${path}: ${response.status}`);
+      }
+      // A deploy landing mid-install must not mix versions: reject bytes that
+      // do not match the manifest and let the next visit retry.
+      const body = await response.clone().arrayBuffer();
+      if ((await sha256Prefix(body, hash.length)) !== hash) {
+        throw new Error(`Precache hash mismatch for ${path}.`);
+      }
+      await cache.put(url, response);
+    }),
+  );
+};
+
+const precacheRuntime = async () => {
+  const cache = await caches.open(RUNTIME_CACHE);
+  await Promise.all(
+    runtime.map(async (url) => {
+      if (await cache.match(url)) {
+        return;
+      }
+      const response = await fetch(url, { mode: "cors" });
+      if (!response.ok) {
+        throw new Error(`Failed to precache ${url}: ${response.status}`);
+      }
+      await cache.put(url, response);
+    }),
+  );
+};
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(Promise.all([precacheApp(), precacheRuntime()]));
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    (async () => {
+      const keep = new Set([APP_CACHE, RUNTIME_CACHE]);
+      const names = await caches.keys();
+      await Promise.all(
+        names
+          .filter((name) => name.startsWith(CACHE_PREFIX) && !keep.has(name))
+          .map((name) => caches.delete(name)),
+      );
+      await self.clients.claim();
+    })(),
+  );
+});
+
+self.addEventListener("message", (event) => {
+  if (event.data === "SKIP_WAITING") {
+    self.skipWaiting();
+  }
+});
+
+const cacheKey = (request) => {
+  const url = new URL(request.url);
+  if (url.origin === self.location.origin && url.pathname.endsWith("/")) {
+    url.pathname += "index.html";
+  }
+  return url.href;
+};
+
+self.addEventListener("fetch", (event) => {
+  if (event.request.method !== "GET") {
+    return;
+  }
+  event.respondWith(
+    (async () => {
+      const key = cacheKey(event.request);
+      for (const name of [APP_CACHE, RUNTIME_CACHE]) {
+        const cached = await (await caches.open(name)).match(key);
+        if (cached) {
+          return cached;
+        }
+      }
+      return fetch(event.request);
+    })(),
+  );
+});
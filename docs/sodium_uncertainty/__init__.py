@@ -1,24 +1,64 @@
 """Core sodium uncertainty model utilities."""
 
-from .calculator import compute_from_json, compute_payload
-from .defaults import load_defaults, resolve_sigma
-from .model import (
-    chance_probability_under_null,
-    loa_half_pair_to_sigma,
-    make_curve,
-    normal_cdf,
-    normal_ci,
-    normal_pdf,
-    posterior_same_sample,
-    posterior_sequential_draws,
-    qualitative_bucket,
-    same_sample_p_value,
-    sigma_to_loa_half_pair,
-    summarize_normal,
-)
-from .types import NormalSummary, ScenarioResult
+from importlib import import_module
+
+# Importing typing costs more than the rest of the package init; type checkers
+# treat a module-level TYPE_CHECKING = False like typing.TYPE_CHECKING.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .calculator import compute_from_json, compute_payload
+    from .defaults import load_defaults, resolve_sigma
+    from .model import (
+        chance_probability_under_null,
+        loa_half_pair_to_sigma,
+        make_curve,
+        normal_cdf,
+        normal_ci,
+        normal_pdf,
+        normal_sf,
+        posterior_same_sample,
+        posterior_sequential_draws,
+        qualitative_bucket,
+        same_sample_p_value,
+        sigma_to_loa_half_pair,
+        standard_normal_ppf,
+        summarize_normal,
+        two_sided_tail,
+        two_sided_z,
+    )
+    from .types import BulkValidation, NormalSummary, ScenarioResult
+    from .validation import error_messages, validate_columns, warning_messages
+
+# Public names resolve on first attribute access so `import sodium_uncertainty`
+# stays cheap for CLIs and Pyodide startup; see tests/test_import_time.py.
+_LAZY_EXPORTS = {
+    "calculator": ("compute_from_json", "compute_payload"),
+    "defaults": ("load_defaults", "resolve_sigma"),
+    "model": (
+        "chance_probability_under_null",
+        "loa_half_pair_to_sigma",
+        "make_curve",
+        "normal_cdf",
+        "normal_ci",
+        "normal_pdf",
+        "normal_sf",
+        "posterior_same_sample",
+        "posterior_sequential_draws",
+        "qualitative_bucket",
+        "same_sample_p_value",
+        "sigma_to_loa_half_pair",
+        "standard_normal_ppf",
+        "summarize_normal",
+        "two_sided_tail",
+        "two_sided_z",
+    ),
+    "types": ("BulkValidation", "NormalSummary", "ScenarioResult"),
+    "validation": ("error_messages", "validate_columns", "warning_messages"),
+}
+_EXPORTS = {name: module for module, names in _LAZY_EXPORTS.items() for name in names}
 
 __all__ = [
+    "BulkValidation",
     "NormalSummary",
     "ScenarioResult",
     "compute_from_json",
@@ -31,10 +71,30 @@ __all__ = [
     "normal_cdf",
     "normal_ci",
     "normal_pdf",
+    "normal_sf",
     "posterior_same_sample",
     "posterior_sequential_draws",
     "qualitative_bucket",
     "same_sample_p_value",
     "sigma_to_loa_half_pair",
+    "standard_normal_ppf",
     "summarize_normal",
+    "two_sided_tail",
+    "two_sided_z",
+    "error_messages",
+    "validate_columns",
+    "warning_messages",
 ]
+
+
+def __getattr__(name: str) -> object:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,196 @@
+import math
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from .calculator import evaluate_payload
+from .columnar import ColumnarWriter
+from .model import QUALITATIVE_BUCKETS, abs_exceedance, qualitative_bucket
+
+RESULT_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("row_id", "q"),
+    ("observed_delta", "d"),
+    ("delta_true_mean", "d"),
+    ("delta_true_sd", "d"),
+    ("delta_true_ci_low", "d"),
+    ("delta_true_ci_high", "d"),
+    ("chance_under_null", "d"),
+    ("bucket", "b"),
+)
+BUCKET_KEYS: tuple[str, ...] = tuple(key for _threshold, key, _label in QUALITATIVE_BUCKETS)
+BUCKET_CODES: dict[str, int] = {key: code for code, key in enumerate(BUCKET_KEYS)}
+ERROR_BUCKET = -1
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def empty_results() -> dict[str, array]:
+    return {name: array(typecode) for name, typecode in RESULT_COLUMNS}
+
+
+def iter_payloads(
+    rows: Iterable[Mapping[str, Any]],
+    base: Mapping[str, Any] | None = None,
+) -> Iterator[dict[str, Any]]:
+    base = dict(base or {})
+    for row in rows:
+        yield {**base, **row}
+
+
+def iter_column_payloads(
+    columns: Mapping[str, Any],
+    base: Mapping[str, Any] | None = None,
+) -> Iterator[dict[str, Any]]:
+    # Yields one payload dict, updated in place per row; consume each before advancing.
+    payload = dict(base or {})
+    names = []
+    values = []
+    for name, column in columns.items():
+        if isinstance(column, str | bytes) or not isinstance(column, Sequence | array):
+            payload[name] = column
+        else:
+            names.append(name)
+            values.append(column)
+    if len({len(column) for column in values}) > 1:
+        raise ValueError("All column inputs must have the same length.")
+    update = payload.update
+    for row in zip(*values, strict=True):
+        update(zip(names, row, strict=True))
+        yield payload
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    if size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def score_payloads(
+    payloads: Iterable[Mapping[str, Any]],
+    first_row_id: int = 0,
+) -> dict[str, array]:
+    results = empty_results()
+    row_id = results["row_id"].append
+    observed = results["observed_delta"].append
+    mean = results["delta_true_mean"].append
+    sd = results["delta_true_sd"].append
+    ci_low = results["delta_true_ci_low"].append
+    ci_high = results["delta_true_ci_high"].append
+    chance = results["chance_under_null"].append
+    bucket = results["bucket"].append
+    for index, payload in enumerate(payloads, start=first_row_id):
+        evaluation = evaluate_payload(payload)
+        row_id(index)
+        if evaluation.errors:
+            for append in (observed, mean, sd, ci_low, ci_high, chance):
+                append(math.nan)
+            bucket(ERROR_BUCKET)
+            continue
+        delta_true = evaluation.result.delta_true
+        observed(evaluation.result.observed_delta)
+        mean(delta_true.mean)
+        sd(delta_true.sd)
+        ci_low(delta_true.ci_low)
+        ci_high(delta_true.ci_high)
+        chance(evaluation.chance_under_null)
+        bucket(BUCKET_CODES[qualitative_bucket(evaluation.chance_under_null)[0]])
+    return results
+
+
+def scatter_results(
+    unique: Mapping[str, array],
+    index: Sequence[int],
+    first_row_id: int = 0,
+) -> dict[str, array]:
+    # Expands results scored once per distinct input back to row order; index[row] is the
+    # position of that row's input in `unique`.
+    results = {}
+    for name, typecode in RESULT_COLUMNS:
+        if name == "row_id":
+            results[name] = array(typecode, range(first_row_id, first_row_id + len(index)))
+        else:
+            results[name] = array(typecode, map(unique[name].__getitem__, index))
+    return results
+
+
+def score_unique(
+    rows: Iterable[tuple[Any, ...]],
+    fields: Sequence[str],
+    base: Mapping[str, Any] | None = None,
+    first_row_id: int = 0,
+) -> dict[str, array]:
+    # Every row is `base` plus its values for `fields`, so rows with equal value tuples have
+    # equal results: evaluate each distinct tuple once and scatter. Values must be hashable.
+    codes: dict[tuple[Any, ...], int] = {}
+    distinct: list[tuple[Any, ...]] = []
+    index = array("q")
+    append = index.append
+    for row in rows:
+        code = codes.get(row)
+        if code is None:
+            code = codes[row] = len(distinct)
+            distinct.append(row)
+        append(code)
+    payload = dict(base or {})
+
+    def payloads() -> Iterator[dict[str, Any]]:
+        update = payload.update
+        for row in distinct:
+            update(zip(fields, row, strict=True))
+            yield payload
+
+    return scatter_results(score_payloads(payloads()), index, first_row_id)
+
+
+def score_columns(
+    columns: Mapping[str, Any],
+    base: Mapping[str, Any] | None = None,
+    first_row_id: int = 0,
+) -> dict[str, array]:
+    shared = dict(base or {})
+    names = []
+    values = []
+    for name, column in columns.items():
+        if isinstance(column, str | bytes) or not isinstance(column, Sequence | array):
+            shared[name] = column
+        else:
+            names.append(name)
+            values.append(column)
+    if len({len(column) for column in values}) > 1:
+        raise ValueError("All column inputs must have the same length.")
+    try:
+        return score_unique(zip(*values, strict=True), names, shared, first_row_id)
+    except TypeError:
+        # Unhashable cell values (lists, dicts) cannot be grouped; score row by row.
+        return score_payloads(iter_column_payloads(columns, base), first_row_id=first_row_id)
+
+
+def exceedance_matrix(
+    results: Mapping[str, Sequence[float]],
+    thresholds: Sequence[float],
+) -> array:
+    # Row-major P(|delta_true| > t): one row of len(thresholds) values per scored row,
+    # NaN for rows that failed validation.
+    thresholds = list(thresholds)
+    missing = [math.nan] * len(thresholds)
+    matrix = array("d")
+    extend = matrix.extend
+    for mean, sd in zip(results["delta_true_mean"], results["delta_true_sd"], strict=True):
+        extend(missing if math.isnan(sd) else abs_exceedance(mean, sd, thresholds))
+    return matrix
+
+
+def score_to_file(
+    payloads: Iterable[Mapping[str, Any]],
+    path: str | Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    meta: Mapping[str, Any] | None = None,
+) -> int:
+    header_meta = {"bucket_keys": list(BUCKET_KEYS), **(meta or {})}
+    with ColumnarWriter(path, RESULT_COLUMNS, header_meta) as writer:
+        for chunk in chunked(payloads, chunk_size):
+            writer.write(score_payloads(chunk, first_row_id=writer.n_rows))
+    return writer.n_rows
@@ -0,0 +1,105 @@
+import json
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+from .calculator import compute_payload
+from .defaults import params_hash
+
+NUMERIC_FIELDS = ("y1", "y2", "ci_level", "threshold", "na_ref", "resolution")
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def _normalize_number(value: Any) -> Any:
+    # compute_payload only ever sees float(value), so "130", 130 and 130.0 share a key.
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def canonical_key(payload: Mapping[str, Any]) -> str | None:
+    fields = {}
+    for key, value in payload.items():
+        if key == "params":
+            continue
+        fields[key] = _normalize_number(value) if key in NUMERIC_FIELDS else value
+    try:
+        fields["params"] = params_hash(payload["params"]) if "params" in payload else None
+        return json.dumps(fields, sort_keys=True, separators=(",", ":"), allow_nan=False)
+    except (TypeError, ValueError):
+        # Payloads that cannot be serialized canonically (NaN, custom objects) bypass the cache.
+        return None
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, cache_json: bool = False) -> None:
+        if max_entries < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.max_entries = max_entries
+        self.cache_json = cache_json
+        self._entries: OrderedDict[str, list[Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bypassed": self.bypassed,
+        }
+
+    def _lookup(self, key: str) -> list[Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _store(self, key: str, response: dict[str, Any]) -> list[Any]:
+        entry = [response, None]
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def compute_payload(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+        # Hits return the stored response object; callers must treat it as read-only.
+        key = canonical_key(payload)
+        if key is None:
+            self.bypassed += 1
+            return compute_payload(payload)
+        entry = self._lookup(key)
+        if entry is None:
+            entry = self._store(key, compute_payload(payload))
+        return entry[0]
+
+    def compute_from_json(self, payload_json: str) -> str:
+        payload = json.loads(payload_json)
+        key = canonical_key(payload)
+        if key is None:
+            self.bypassed += 1
+            return json.dumps(compute_payload(payload))
+        entry = self._lookup(key)
+        if entry is None:
+            entry = self._store(key, compute_payload(payload))
+        if entry[1] is not None:
+            return entry[1]
+        serialized = json.dumps(entry[0])
+        if self.cache_json:
+            entry[1] = serialized
+        return serialized
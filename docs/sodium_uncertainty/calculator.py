@@ -1,18 +1,48 @@
 import json
-from collections.abc import Mapping
+import math
+from collections.abc import Mapping, Sequence
+from dataclasses import replace
 from typing import Any
 
-from .defaults import resolve_sigma
+from .defaults import precision_table_for, resolve_sigma
 from .model import (
+    abs_exceedance,
     chance_probability_under_null,
+    curve_spec,
     make_curve,
     normal_cdf,
     normal_ci,
+    normal_sf,
     posterior_same_sample,
     posterior_sequential_draws,
     qualitative_bucket,
+    rounded_chance_under_null,
     same_sample_p_value,
 )
+from .precision import PrecisionTable
+from .types import Evaluation, NormalSummary
+
+CONTEXTS = ("analytic_repeatability", "sequential_draws")
+ERROR_ENGINES = ("normal", "convolution")
+INTERVAL_LEVELS = (0.5, 0.95, 0.99)
+MISSING_PARAMS_MESSAGE = "Variability parameters are missing for the selected context or method."
+INVALID_PARAMS_MESSAGE = "Invalid variability parameters."
+EXCEEDANCE_THRESHOLDS = tuple(index * 0.5 for index in range(31))
+MAX_EXCEEDANCE_THRESHOLDS = 1000
+EXCEEDANCE_MESSAGE = "Exceedance thresholds must be a list of non-negative numbers."
+# "points" samples each curve at 401 x/y pairs; "parametric" returns curve_spec dicts for
+# the client to evaluate at its own resolution.
+CURVE_MODES = ("points", "parametric")
+CURVE_MODE_MESSAGE = f"Curve mode must be one of: {', '.join(CURVE_MODES)}."
+EXCEEDANCE_COUNT_MESSAGE = f"At most {MAX_EXCEEDANCE_THRESHOLDS} exceedance thresholds are allowed."
+RESOLUTION_MESSAGE = (
+    "Na values are not multiples of the reporting resolution; ΔNa was rounded to the nearest step."
+)
+# Finer steps than this are continuous reporting for any real analyzer, and the rounded null
+# table grows as sd / resolution.
+MIN_RESOLUTION = 0.001
+RESOLUTION_BOUNDS_MESSAGE = f"Reporting resolution must be finite and at least {MIN_RESOLUTION}."
+RESOLUTION_ENGINE_MESSAGE = "Reporting resolution is only supported with the normal error engine."
 
 
 def _parse_float(value: Any, label: str, errors: list[str]) -> float | None:
@@ -26,32 +56,102 @@ def _parse_float(value: Any, label: str, errors: list[str]) -> float | None:
 def _probability_gt_zero(mean: float, sd: float) -> float:
     if sd == 0:
         return 1.0 if mean > 0 else 0.0
-    return 1 - normal_cdf(0.0, mean, sd)
+    return normal_sf(0.0, mean, sd)
 
 
 def _probability_abs_gt_threshold(mean: float, sd: float, threshold: float) -> float:
     if sd == 0:
         return 1.0 if abs(mean) > threshold else 0.0
-    upper = 1 - normal_cdf(threshold, mean, sd)
+    upper = normal_sf(threshold, mean, sd)
     lower = normal_cdf(-threshold, mean, sd)
     return upper + lower
 
 
+def parse_exceedance_thresholds(value: Any) -> list[float]:
+    if value is None:
+        return list(EXCEEDANCE_THRESHOLDS)
+    if isinstance(value, str | bytes) or not isinstance(value, Sequence):
+        raise ValueError(EXCEEDANCE_MESSAGE)
+    if len(value) > MAX_EXCEEDANCE_THRESHOLDS:
+        raise ValueError(EXCEEDANCE_COUNT_MESSAGE)
+    try:
+        thresholds = [float(item) for item in value]
+    except (TypeError, ValueError) as exc:
+        raise ValueError(EXCEEDANCE_MESSAGE) from exc
+    if not all(threshold >= 0 for threshold in thresholds):
+        raise ValueError(EXCEEDANCE_MESSAGE)
+    return thresholds
+
+
+def off_resolution_grid(values: Sequence[float], resolution: float) -> bool:
+    # True when any value is not a whole number of reporting steps.
+    for value in values:
+        step = value / resolution
+        if not math.isfinite(step) or abs(step - round(step)) > 1e-9:
+            return True
+    return False
+
+
+def _exceedance(distribution: Any, summary: NormalSummary, thresholds: list[float]) -> list[float]:
+    if distribution is None:
+        return abs_exceedance(summary.mean, summary.sd, thresholds)
+    return distribution.abs_exceedance(thresholds)
+
+
 def _intervals(mean: float, sd: float) -> list[dict[str, float]]:
-    levels = (0.5, 0.95, 0.99)
     intervals = []
-    for level in levels:
+    for level in INTERVAL_LEVELS:
         low, high = normal_ci(mean, sd, level)
         intervals.append({"level": level, "low": low, "high": high})
     return intervals
 
 
+def _summary_curve(
+    distribution: Any, summary: NormalSummary, parametric: bool = False
+) -> dict[str, Any]:
+    if distribution is None:
+        if parametric:
+            return curve_spec(summary.mean, summary.sd)
+        return make_curve(summary.mean, summary.sd)
+    return distribution.curve_spec() if parametric else distribution.curve()
+
+
+def _summary_intervals(distribution: Any, summary: NormalSummary) -> list[dict[str, float]]:
+    if distribution is None:
+        return _intervals(summary.mean, summary.sd)
+    intervals = []
+    for level in INTERVAL_LEVELS:
+        low, high = distribution.interval(level)
+        intervals.append({"level": level, "low": low, "high": high})
+    return intervals
+
+
+def _resolve_measurement_sigma(
+    params: Mapping[str, Any],
+    context: str,
+    method: str,
+    value: float,
+    sources: dict[tuple[Any, Any], Any] | None = None,
+) -> tuple[float, PrecisionTable | None]:
+    # sources memoizes the (context, method) sigma or compiled table for one params object.
+    source = None if sources is None else sources.get((context, method))
+    if source is None:
+        table = precision_table_for(params, context, method)
+        source = resolve_sigma(params, context, method) if table is None else table
+        if sources is not None:
+            sources[(context, method)] = source
+    if isinstance(source, PrecisionTable):
+        return source.sigma_at(value), source
+    return source, None
+
+
 def _detail_entry(
     entry: Mapping[str, Any],
     sigma_used: float,
     value: float,
     scale_with_na: bool,
     na_ref: float,
+    table: PrecisionTable | None = None,
 ) -> dict[str, Any]:
     loa_half = entry.get("loa_half_pair")
     sigma_override = entry.get("sigma")
@@ -66,6 +166,12 @@ def _detail_entry(
         "sigma_raw": sigma_raw,
         "scale_factor": scale_factor,
     }
+    if table is not None:
+        detail["precision_profile"] = {
+            "kind": table.kind,
+            "sigma_interpolated": sigma_used,
+            "anchors": [list(anchor) for anchor in table.anchors_used(value)],
+        }
     if loa_half not in (None, ""):
         sd_diff = float(loa_half) / 1.96
         detail["sd_diff"] = sd_diff
@@ -73,7 +179,10 @@ def _detail_entry(
     return detail
 
 
-def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
+def evaluate_payload(
+    payload: Mapping[str, Any],
+    sigma_sources: dict[tuple[Any, Any], Any] | None = None,
+) -> Evaluation:
     errors: list[str] = []
     warnings: list[str] = []
 
@@ -83,6 +192,12 @@ def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
     threshold = _parse_float(payload.get("threshold"), "Threshold", errors)
     scale_with_na = payload.get("scale_with_na", False)
     na_ref = _parse_float(payload.get("na_ref", 140), "Reference Na", errors)
+    # Reporting resolution (e.g. 1 mmol/L for integer results); absent means continuous.
+    resolution = payload.get("resolution")
+    if resolution in (None, ""):
+        resolution = None
+    else:
+        resolution = _parse_float(resolution, "Reporting resolution", errors)
 
     if y1 is not None and (y1 < 100 or y1 > 170):
         warnings.append("Na1 is outside typical physiologic ranges.")
@@ -94,23 +209,47 @@ def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
         errors.append("Threshold must be non-negative.")
     if na_ref is not None and na_ref <= 0:
         errors.append("Reference Na must be positive.")
+    if resolution is not None:
+        if not resolution > 0:
+            errors.append("Reporting resolution must be positive.")
+        elif not (math.isfinite(resolution) and resolution >= MIN_RESOLUTION):
+            errors.append(RESOLUTION_BOUNDS_MESSAGE)
 
     if errors:
-        return {"errors": errors, "warnings": warnings}
+        return Evaluation(errors=errors, warnings=warnings)
 
     context = payload.get("context")
     method1 = payload.get("method1")
     method2 = payload.get("method2")
     params = payload.get("params")
 
+    if context not in CONTEXTS:
+        return Evaluation(errors=["Invalid context selection."], warnings=warnings)
+    engine = payload.get("error_engine", "normal")
+    if engine not in ERROR_ENGINES:
+        return Evaluation(errors=["Invalid error engine selection."], warnings=warnings)
+    if resolution is not None:
+        if engine == "convolution":
+            return Evaluation(errors=[RESOLUTION_ENGINE_MESSAGE], warnings=warnings)
+        if off_resolution_grid((y1, y2), resolution):
+            warnings.append(RESOLUTION_MESSAGE)
+
     try:
-        sigma1 = resolve_sigma(params, context, method1)
-        sigma2 = resolve_sigma(params, context, method2)
-    except Exception as exc:  # noqa: BLE001
-        return {"errors": [str(exc)], "warnings": warnings}
+        sigma1, table1 = _resolve_measurement_sigma(params, context, method1, y1, sigma_sources)
+        sigma2, table2 = _resolve_measurement_sigma(params, context, method2, y2, sigma_sources)
+    except KeyError:
+        return Evaluation(errors=[MISSING_PARAMS_MESSAGE], warnings=warnings)
+    except ValueError as exc:
+        return Evaluation(errors=[str(exc)], warnings=warnings)
+    except Exception:  # noqa: BLE001
+        # Wrongly shaped params (not a mapping, or defaults that are not nested mappings).
+        return Evaluation(errors=[INVALID_PARAMS_MESSAGE], warnings=warnings)
 
-    if scale_with_na:
+    scale1 = bool(scale_with_na) and table1 is None
+    scale2 = bool(scale_with_na) and table2 is None
+    if scale1:
         sigma1 *= y1 / na_ref
+    if scale2:
         sigma2 *= y2 / na_ref
 
     sigma_delta = (sigma1**2 + sigma2**2) ** 0.5
@@ -118,50 +257,150 @@ def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
     try:
         if context == "analytic_repeatability":
             result = posterior_same_sample(y1, y2, sigma1, sigma2, ci_level)
-        elif context == "sequential_draws":
-            result = posterior_sequential_draws(y1, y2, sigma1, sigma2, ci_level)
         else:
-            return {"errors": ["Invalid context selection."], "warnings": warnings}
+            result = posterior_sequential_draws(y1, y2, sigma1, sigma2, ci_level)
     except Exception as exc:  # noqa: BLE001
-        return {"errors": [str(exc)], "warnings": warnings}
+        return Evaluation(errors=[str(exc)], warnings=warnings)
+
+    noise = None
+    if resolution is None:
+        chance_under_null = chance_probability_under_null(y2 - y1, sigma_delta)
+    else:
+        try:
+            chance_under_null = rounded_chance_under_null(y2 - y1, sigma1, sigma2, resolution)
+        except Exception as exc:  # noqa: BLE001
+            return Evaluation(errors=[str(exc)], warnings=warnings)
+    if engine == "convolution":
+        from .convolution import difference_distribution, error_model_for
+
+        try:
+            noise = difference_distribution(
+                error_model_for(params, context, method1),
+                sigma1,
+                error_model_for(params, context, method2),
+                sigma2,
+            )
+        except Exception as exc:  # noqa: BLE001
+            return Evaluation(errors=[str(exc)], warnings=warnings)
+        sigma_delta = noise.sd
+        chance_under_null = noise.prob_abs_ge(y2 - y1)
+        if context == "analytic_repeatability":
+            result = replace(result, delta_observed=noise.summary(ci_level))
+        else:
+            result = replace(
+                result, delta_true=noise.reflected(result.observed_delta).summary(ci_level)
+            )
+
+    return Evaluation(
+        errors=[],
+        warnings=warnings,
+        y1=y1,
+        y2=y2,
+        ci_level=ci_level,
+        threshold=threshold,
+        context=context,
+        method1=method1,
+        method2=method2,
+        params=params,
+        scale_with_na=scale_with_na,
+        na_ref=na_ref,
+        sigma1=sigma1,
+        sigma2=sigma2,
+        sigma_delta=sigma_delta,
+        table1=table1,
+        table2=table2,
+        scale1=scale1,
+        scale2=scale2,
+        result=result,
+        chance_under_null=chance_under_null,
+        engine=engine,
+        noise=noise,
+        resolution=resolution,
+    )
+
 
+def build_response(payload: Mapping[str, Any], evaluation: Evaluation) -> dict[str, Any]:
+    if evaluation.errors:
+        return {"errors": evaluation.errors, "warnings": evaluation.warnings}
+    try:
+        thresholds = parse_exceedance_thresholds(payload.get("exceedance_thresholds"))
+    except ValueError as exc:
+        return {"errors": [str(exc)], "warnings": evaluation.warnings}
+    curve_mode = payload.get("curve_mode", "points")
+    if curve_mode not in CURVE_MODES:
+        return {"errors": [CURVE_MODE_MESSAGE], "warnings": evaluation.warnings}
+    parametric = curve_mode == "parametric"
+
+    y1, y2 = evaluation.y1, evaluation.y2
+    sigma1, sigma2 = evaluation.sigma1, evaluation.sigma2
+    sigma_delta = evaluation.sigma_delta
+    context, method1, method2 = evaluation.context, evaluation.method1, evaluation.method2
+    params, na_ref = evaluation.params, evaluation.na_ref
+    threshold, ci_level = evaluation.threshold, evaluation.ci_level
+    warnings = evaluation.warnings
+    result = evaluation.result
     delta_observed = result.delta_observed or result.delta_true
 
-    p_chance = chance_probability_under_null(y2 - y1, sigma_delta)
+    # With the convolution engine, ΔNa quantities come from the discretized noise
+    # distribution (e2 - e1) instead of the normal closed forms.
+    noise = evaluation.noise
+    delta_true_dist = None
+    if noise is not None and context == "sequential_draws":
+        delta_true_dist = noise.reflected(result.observed_delta)
+    delta_observed_dist = noise if context == "analytic_repeatability" else delta_true_dist
+    null_summary = NormalSummary(mean=0.0, sd=sigma_delta, ci_low=0.0, ci_high=0.0)
+
+    p_chance = evaluation.chance_under_null
     bucket_key, bucket_label = qualitative_bucket(p_chance)
-    probabilities = {
-        "delta_gt_zero": _probability_gt_zero(result.delta_true.mean, result.delta_true.sd),
-        "delta_abs_gt_threshold": _probability_abs_gt_threshold(
+    if delta_true_dist is None:
+        delta_gt_zero = _probability_gt_zero(result.delta_true.mean, result.delta_true.sd)
+        delta_abs_gt_threshold = _probability_abs_gt_threshold(
             result.delta_true.mean,
             result.delta_true.sd,
             threshold,
-        ),
-        "same_sample_p": same_sample_p_value(y1, y2, sigma1, sigma2)
-        if context == "analytic_repeatability"
-        else None,
+        )
+    else:
+        delta_gt_zero = delta_true_dist.sf(0.0)
+        delta_abs_gt_threshold = delta_true_dist.cdf(-threshold) + delta_true_dist.sf(threshold)
+    if context != "analytic_repeatability":
+        same_sample_p = None
+    elif noise is not None or evaluation.resolution is not None:
+        same_sample_p = p_chance
+    else:
+        same_sample_p = same_sample_p_value(y1, y2, sigma1, sigma2)
+    probabilities = {
+        "delta_gt_zero": delta_gt_zero,
+        "delta_abs_gt_threshold": delta_abs_gt_threshold,
+        "same_sample_p": same_sample_p,
         "chance_under_null": p_chance,
         "chance_bucket_key": bucket_key,
         "chance_bucket_label": bucket_label,
     }
 
+    normal_curve = curve_spec if parametric else make_curve
     curves = {
-        "na1": make_curve(result.na1.mean, result.na1.sd),
-        "na2": make_curve(result.na2.mean, result.na2.sd),
-        "delta_true": make_curve(result.delta_true.mean, result.delta_true.sd),
-        "delta_observed": make_curve(delta_observed.mean, delta_observed.sd),
-        "delta_null": make_curve(0.0, sigma_delta),
-        "na1_obs": make_curve(y1, sigma1),
-        "na2_obs": make_curve(y2, sigma2),
+        "na1": normal_curve(result.na1.mean, result.na1.sd),
+        "na2": normal_curve(result.na2.mean, result.na2.sd),
+        "delta_true": _summary_curve(delta_true_dist, result.delta_true, parametric),
+        "delta_observed": _summary_curve(delta_observed_dist, delta_observed, parametric),
+        "delta_null": _summary_curve(noise, null_summary, parametric),
+        "na1_obs": normal_curve(y1, sigma1),
+        "na2_obs": normal_curve(y2, sigma2),
     }
     intervals = {
         "na1": _intervals(result.na1.mean, result.na1.sd),
         "na2": _intervals(result.na2.mean, result.na2.sd),
-        "delta_true": _intervals(result.delta_true.mean, result.delta_true.sd),
-        "delta_observed": _intervals(delta_observed.mean, delta_observed.sd),
-        "delta_null": _intervals(0.0, sigma_delta),
+        "delta_true": _summary_intervals(delta_true_dist, result.delta_true),
+        "delta_observed": _summary_intervals(delta_observed_dist, delta_observed),
+        "delta_null": _summary_intervals(noise, null_summary),
         "na1_obs": _intervals(y1, sigma1),
         "na2_obs": _intervals(y2, sigma2),
     }
+    exceedance = {
+        "thresholds": thresholds,
+        "delta_true": _exceedance(delta_true_dist, result.delta_true, thresholds),
+        "delta_null": _exceedance(noise, null_summary, thresholds),
+    }
     details = {
         "context": context,
         "method1": method1,
@@ -169,13 +408,25 @@ def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
         "sigma1": sigma1,
         "sigma2": sigma2,
         "sigma_delta": sigma_delta,
-        "scale_with_na": scale_with_na,
+        "scale_with_na": evaluation.scale_with_na,
         "na_ref": na_ref,
+        "error_engine": evaluation.engine,
+        "resolution": evaluation.resolution,
         "entry1": _detail_entry(
-            params["defaults"][context][method1], sigma1, y1, scale_with_na, na_ref
+            params["defaults"][context][method1],
+            sigma1,
+            y1,
+            evaluation.scale1,
+            na_ref,
+            evaluation.table1,
         ),
         "entry2": _detail_entry(
-            params["defaults"][context][method2], sigma2, y2, scale_with_na, na_ref
+            params["defaults"][context][method2],
+            sigma2,
+            y2,
+            evaluation.scale2,
+            na_ref,
+            evaluation.table2,
         ),
     }
 
@@ -186,6 +437,7 @@ def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
         "context": context,
         "ci_level": ci_level,
         "threshold": threshold,
+        "curve_mode": curve_mode,
         "observed_delta": result.observed_delta,
         "na1": result.na1.__dict__,
         "na2": result.na2.__dict__,
@@ -194,9 +446,14 @@ def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
         "probabilities": probabilities,
         "curves": curves,
         "intervals": intervals,
+        "exceedance": exceedance,
         "details": details,
     }
 
 
+def compute_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
+    return build_response(payload, evaluate_payload(payload))
+
+
 def compute_from_json(payload_json: str) -> str:
     return json.dumps(compute_payload(json.loads(payload_json)))
@@ -0,0 +1,211 @@
+import contextlib
+import json
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+MAGIC = b"SNACOL01"
+FORMAT_NAME = "sodium-uncertainty-columns"
+ALIGNMENT = 8
+COLUMN_TYPES = {"d": "<f8", "q": "<i8", "b": "i1"}
+_PREFIX = struct.Struct("<8sI")
+
+ColumnSpec = Sequence[tuple[str, str]]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _little_endian_bytes(values: array) -> bytes:
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class ColumnarWriter:
+    def __init__(
+        self,
+        path: str | Path,
+        columns: ColumnSpec,
+        meta: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.columns = [(name, typecode) for name, typecode in columns]
+        for name, typecode in self.columns:
+            if typecode not in COLUMN_TYPES:
+                raise ValueError(f"Unsupported column type {typecode!r} for {name}.")
+        self.meta = dict(meta or {})
+        self.n_rows = 0
+        self._parts = {
+            name: self.path.with_name(f".{self.path.name}.{name}.part") for name, _ in self.columns
+        }
+        self._handles = {name: part.open("wb") for name, part in self._parts.items()}
+
+    def write(self, chunk: Mapping[str, Sequence[Any]]) -> None:
+        lengths = {len(chunk[name]) for name, _typecode in self.columns}
+        if len(lengths) != 1:
+            raise ValueError("All columns in a chunk must have the same length.")
+        for name, typecode in self.columns:
+            values = chunk[name]
+            if isinstance(values, memoryview) and values.format == typecode:
+                if sys.byteorder == "little" or values.itemsize == 1:
+                    self._handles[name].write(values)
+                    continue
+            if not isinstance(values, array) or values.typecode != typecode:
+                values = array(typecode, values)
+            self._handles[name].write(_little_endian_bytes(values))
+        self.n_rows += lengths.pop()
+
+    def _close_parts(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+
+    def _remove_parts(self) -> None:
+        for part in self._parts.values():
+            part.unlink(missing_ok=True)
+
+    def abort(self) -> None:
+        self._close_parts()
+        self._remove_parts()
+
+    def close(self) -> None:
+        self._close_parts()
+        entries = []
+        offset = 0
+        for name, typecode in self.columns:
+            nbytes = self._parts[name].stat().st_size
+            entries.append({"name": name, "type": typecode, "offset": offset, "nbytes": nbytes})
+            offset = _aligned(offset + nbytes)
+        header = json.dumps(
+            {
+                "format": FORMAT_NAME,
+                "version": 1,
+                "byteorder": "little",
+                "n_rows": self.n_rows,
+                "columns": entries,
+                "meta": self.meta,
+            },
+            separators=(",", ":"),
+        ).encode()
+        data_start = _aligned(_PREFIX.size + len(header))
+        temporary = self.path.with_name(f".{self.path.name}.tmp")
+        with temporary.open("wb") as output:
+            output.write(_PREFIX.pack(MAGIC, len(header)))
+            output.write(header)
+            for entry in entries:
+                output.seek(data_start + entry["offset"])
+                with self._parts[entry["name"]].open("rb") as part:
+                    while block := part.read(1 << 20):
+                        output.write(block)
+            output.truncate(data_start + offset)
+        os.replace(temporary, self.path)
+        self._remove_parts()
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, _exc: Any, _tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_columns(
+    path: str | Path,
+    columns: ColumnSpec,
+    data: Mapping[str, Sequence[Any]],
+    meta: Mapping[str, Any] | None = None,
+) -> None:
+    with ColumnarWriter(path, columns, meta) as writer:
+        writer.write(data)
+
+
+class ColumnarFile:
+    def __init__(self, path: str | Path) -> None:
+        import mmap
+
+        self.path = Path(path)
+        self._views: list[memoryview] = []
+        self._map: Any = None
+        self._file = self.path.open("rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_size = _PREFIX.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a columnar results file.")
+            header = json.loads(self._map[_PREFIX.size : _PREFIX.size + header_size])
+        except Exception:
+            self.close()
+            raise
+        self.header = header
+        self.n_rows: int = header["n_rows"]
+        self.meta: dict[str, Any] = header.get("meta", {})
+        self._data_start = _aligned(_PREFIX.size + header_size)
+        self._entries = {entry["name"]: entry for entry in header["columns"]}
+
+    @property
+    def column_names(self) -> list[str]:
+        return list(self._entries)
+
+    def _entry(self, name: str) -> dict[str, Any]:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Unknown column {name!r}.") from None
+
+    def column(self, name: str) -> memoryview:
+        entry = self._entry(name)
+        start = self._data_start + entry["offset"]
+        raw = memoryview(self._map)[start : start + entry["nbytes"]]
+        view = raw.cast(entry["type"])
+        self._views.extend((raw, view))
+        return view
+
+    def to_numpy(self, name: str) -> Any:
+        import numpy
+
+        entry = self._entry(name)
+        return numpy.frombuffer(
+            self._map,
+            dtype=COLUMN_TYPES[entry["type"]],
+            count=self.n_rows,
+            offset=self._data_start + entry["offset"],
+        )
+
+    def row(self, index: int) -> dict[str, Any]:
+        if not -self.n_rows <= index < self.n_rows:
+            raise IndexError("Row index out of range.")
+        index %= self.n_rows
+        values = {}
+        for name, entry in self._entries.items():
+            offset = self._data_start + entry["offset"] + index * struct.calcsize(entry["type"])
+            values[name] = struct.unpack_from("<" + entry["type"], self._map, offset)[0]
+        return values
+
+    def close(self) -> None:
+        # Slices of column views and to_numpy() arrays that the caller still holds keep the
+        # mapping alive; it is then unmapped when the last of them is dropped, not here.
+        try:
+            for view in reversed(self._views):
+                with contextlib.suppress(BufferError):
+                    view.release()
+            self._views.clear()
+            if self._map is not None:
+                with contextlib.suppress(BufferError):
+                    self._map.close()
+                self._map = None
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
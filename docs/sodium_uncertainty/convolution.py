@@ -0,0 +1,322 @@
+import cmath
+import json
+import math
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from .types import NormalSummary
+
+ERROR_FAMILIES = ("normal", "t", "mixture", "empirical")
+# Shared grid for every error kernel: bins of GRID_STEP mmol/L centred on 0, covering
+# ±GRID_HALF_WIDTH. Mass beyond the grid is dropped and the kernel renormalized.
+GRID_STEP = 0.05
+GRID_HALF_WIDTH = 25.0
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+
+@dataclass(frozen=True)
+class GridDistribution:
+    start: float
+    step: float
+    masses: array
+    _cumulative: array = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        cumulative = array("d", [0.0])
+        total = 0.0
+        for mass in self.masses:
+            total += mass
+            cumulative.append(total)
+        object.__setattr__(self, "_cumulative", cumulative)
+
+    @property
+    def mean(self) -> float:
+        start, step = self.start, self.step
+        return sum(mass * (start + index * step) for index, mass in enumerate(self.masses))
+
+    @property
+    def sd(self) -> float:
+        mean, start, step = self.mean, self.start, self.step
+        variance = sum(
+            mass * (start + index * step - mean) ** 2 for index, mass in enumerate(self.masses)
+        )
+        return math.sqrt(variance)
+
+    def cdf(self, x: float) -> float:
+        position = (x - self.start) / self.step + 0.5
+        if position <= 0:
+            return 0.0
+        if position >= len(self.masses):
+            return 1.0
+        index = int(position)
+        return self._cumulative[index] + (position - index) * self.masses[index]
+
+    def sf(self, x: float) -> float:
+        return 1.0 - self.cdf(x)
+
+    def quantile(self, p: float) -> float:
+        if not 0 < p < 1:
+            raise ValueError("Probability must be between 0 and 1.")
+        cumulative = self._cumulative
+        index = min(max(bisect_left(cumulative, p) - 1, 0), len(self.masses) - 1)
+        mass = self.masses[index]
+        fraction = (p - cumulative[index]) / mass if mass > 0 else 0.5
+        return self.start + (index - 0.5 + fraction) * self.step
+
+    def interval(self, level: float) -> tuple[float, float]:
+        if not 0 < level < 1:
+            raise ValueError("CI level must be between 0 and 1.")
+        tail = (1 - level) / 2
+        return self.quantile(tail), self.quantile(1 - tail)
+
+    def summary(self, level: float) -> NormalSummary:
+        low, high = self.interval(level)
+        return NormalSummary(mean=self.mean, sd=self.sd, ci_low=low, ci_high=high)
+
+    def prob_abs_ge(self, threshold: float) -> float:
+        threshold = abs(threshold)
+        return min(1.0, self.cdf(-threshold) + self.sf(threshold))
+
+    def abs_exceedance(self, thresholds: Sequence[float]) -> list[float]:
+        return [self.cdf(-threshold) + self.sf(threshold) for threshold in thresholds]
+
+    def reflected(self, offset: float) -> "GridDistribution":
+        # Distribution of offset - X.
+        last = self.start + (len(self.masses) - 1) * self.step
+        return GridDistribution(offset - last, self.step, array("d", reversed(self.masses)))
+
+    def density_at(self, x: float) -> float:
+        position = (x - self.start) / self.step
+        if position < 0 or position > len(self.masses) - 1:
+            return 0.0
+        index = min(int(position), len(self.masses) - 2)
+        weight = position - index
+        low, high = self.masses[index], self.masses[index + 1]
+        return (low + weight * (high - low)) / self.step
+
+    def curve(self, n: int = 401, span_sd: float = 4) -> dict[str, list[float]]:
+        if n < 2:
+            raise ValueError("n must be at least 2.")
+        mean, sd = self.mean, self.sd
+        last = self.start + (len(self.masses) - 1) * self.step
+        low = max(mean - span_sd * sd, self.start)
+        high = min(mean + span_sd * sd, last)
+        step = (high - low) / (n - 1)
+        xs = [low + index * step for index in range(n)]
+        return {"x": xs, "y": [self.density_at(x) for x in xs]}
+
+    def curve_spec(self, n: int = 401, span_sd: float = 4) -> dict[str, Any]:
+        # Grid distributions have no closed form, so the parametric spec carries samples.
+        return {"family": "sampled", **self.curve(n, span_sd)}
+
+
+def validate_error_model(model: Any, label: str) -> None:
+    if not isinstance(model, Mapping):
+        raise ValueError(f"Error model for {label} must be a mapping.")
+    family = model.get("family")
+    if family not in ERROR_FAMILIES:
+        families = ", ".join(ERROR_FAMILIES)
+        raise ValueError(f"Error model for {label} must have family one of: {families}.")
+    if family == "t":
+        if not float(model.get("df", 0)) > 2:
+            raise ValueError(f"Error model df for {label} must be greater than 2.")
+    elif family == "mixture":
+        components = model.get("components")
+        if not isinstance(components, Sequence) or isinstance(components, str) or not components:
+            raise ValueError(f"Error model for {label} needs at least one mixture component.")
+        for component in components:
+            if not isinstance(component, Mapping):
+                raise ValueError(f"Mixture components for {label} must be mappings.")
+            if not float(component.get("weight", 0)) > 0:
+                raise ValueError(f"Mixture weights for {label} must be positive.")
+            if not float(component.get("scale", 1.0)) > 0:
+                raise ValueError(f"Mixture scales for {label} must be positive.")
+            float(component.get("shift", 0.0))
+    elif family == "empirical":
+        counts = model.get("counts")
+        if not isinstance(counts, Sequence) or isinstance(counts, str) or not counts:
+            raise ValueError(f"Empirical error model for {label} needs histogram counts.")
+        if any(float(count) < 0 for count in counts) or not sum(map(float, counts)) > 0:
+            raise ValueError(f"Empirical histogram counts for {label} must be non-negative.")
+        width = float(model.get("bin_width", 0))
+        if not width > 0:
+            raise ValueError(f"Empirical histogram bin_width for {label} must be positive.")
+        if "start" not in model:
+            raise ValueError(f"Empirical histogram for {label} needs a start edge.")
+        start = float(model["start"])
+        occupied = [index for index, count in enumerate(counts) if float(count) > 0]
+        if start + occupied[0] * width >= GRID_HALF_WIDTH or (
+            start + (occupied[-1] + 1) * width <= -GRID_HALF_WIDTH
+        ):
+            raise ValueError(f"Empirical histogram for {label} lies outside the error grid.")
+
+
+def error_model_for(params: Mapping[str, Any], context: str, method: str) -> Any:
+    model = params["defaults"][context][method].get("error_model")
+    if model in (None, ""):
+        return None
+    validate_error_model(model, f"{context}/{method}")
+    return model
+
+
+def _normal_cell(lower: float, upper: float, mean: float, sd: float) -> float:
+    scale = _INV_SQRT2 / sd
+    return 0.5 * (math.erfc((mean - upper) * scale) - math.erfc((mean - lower) * scale))
+
+
+def _t_density(x: float, df: float, scale: float) -> float:
+    log_norm = (
+        math.lgamma((df + 1) / 2)
+        - math.lgamma(df / 2)
+        - 0.5 * math.log(df * math.pi)
+        - math.log(scale)
+    )
+    z = x / scale
+    return math.exp(log_norm - (df + 1) / 2 * math.log1p(z * z / df))
+
+
+def _empirical_cell(lower: float, upper: float, model: Mapping[str, Any]) -> float:
+    start = float(model["start"])
+    width = float(model["bin_width"])
+    counts = [float(count) for count in model["counts"]]
+    total = sum(counts)
+    first = max(int(math.floor((lower - start) / width)), 0)
+    last = min(int(math.floor((upper - start) / width)), len(counts) - 1)
+    mass = 0.0
+    for index in range(first, last + 1):
+        bin_low = start + index * width
+        overlap = min(upper, bin_low + width) - max(lower, bin_low)
+        if overlap > 0:
+            mass += counts[index] / total * overlap / width
+    return mass
+
+
+def _cell_masses(
+    model: Mapping[str, Any], sigma: float, step: float, half_bins: int
+) -> list[float]:
+    family = model["family"]
+    edges = [(index - 0.5) * step for index in range(-half_bins, half_bins + 2)]
+    cells = zip(edges, edges[1:], strict=False)
+    if family == "normal":
+        masses = [_normal_cell(low, high, 0.0, sigma) for low, high in cells]
+    elif family == "t":
+        df = float(model["df"])
+        # Scale the t so its standard deviation equals sigma.
+        scale = sigma * math.sqrt((df - 2) / df)
+        masses = [_t_density((low + high) / 2, df, scale) * step for low, high in cells]
+    elif family == "mixture":
+        components = model["components"]
+        total_weight = sum(float(component["weight"]) for component in components)
+        masses = [0.0] * (2 * half_bins + 1)
+        for component in components:
+            weight = float(component["weight"]) / total_weight
+            sd = sigma * float(component.get("scale", 1.0))
+            shift = float(component.get("shift", 0.0))
+            for index, (low, high) in enumerate(zip(edges, edges[1:], strict=False)):
+                masses[index] += weight * _normal_cell(low, high, shift, sd)
+    else:
+        masses = [_empirical_cell(low, high, model) for low, high in cells]
+    total = sum(masses)
+    if not total > 0:
+        raise ValueError("Error model has no mass on the convolution grid.")
+    return [mass / total for mass in masses]
+
+
+def _fft_size(half_bins: int) -> int:
+    # The difference of two kernels spans 4 * half_bins + 1 bins; avoid circular wrap.
+    size = 1
+    while size < 4 * half_bins + 1:
+        size *= 2
+    return size
+
+
+@lru_cache(maxsize=8)
+def _fft_plan(size: int) -> tuple[tuple[int, ...], tuple[complex, ...]]:
+    bits = size.bit_length() - 1
+    reversal = tuple(int(format(index, f"0{bits}b")[::-1], 2) for index in range(size))
+    twiddles = tuple(cmath.exp(-2j * math.pi * index / size) for index in range(size // 2))
+    return reversal, twiddles
+
+
+def _fft(values: Sequence[complex], inverse: bool = False) -> list[complex]:
+    size = len(values)
+    reversal, twiddles = _fft_plan(size)
+    data = [values[index] for index in reversal]
+    half = 1
+    while half < size:
+        stride = size // (2 * half)
+        factors = [twiddles[k * stride] for k in range(half)]
+        if inverse:
+            factors = [factor.conjugate() for factor in factors]
+        for block in range(0, size, 2 * half):
+            for k in range(half):
+                upper = block + k
+                lower = upper + half
+                product = factors[k] * data[lower]
+                data[lower] = data[upper] - product
+                data[upper] += product
+        half *= 2
+    if inverse:
+        return [value / size for value in data]
+    return data
+
+
+def _model_key(model: Mapping[str, Any] | None) -> str:
+    if model is None:
+        return '{"family":"normal"}'
+    return json.dumps(model, sort_keys=True, separators=(",", ":"))
+
+
+@lru_cache(maxsize=256)
+def _kernel_spectrum(model_key: str, sigma: float, step: float, half_width: float) -> tuple:
+    model = json.loads(model_key)
+    half_bins = int(round(half_width / step))
+    masses = _cell_masses(model, sigma, step, half_bins)
+    size = _fft_size(half_bins)
+    # Wrapped layout: index 0 is zero error, negative errors sit at the end.
+    wrapped = [0j] * size
+    for offset, mass in zip(range(-half_bins, half_bins + 1), masses, strict=True):
+        wrapped[offset % size] = complex(mass)
+    return tuple(_fft(wrapped))
+
+
+def kernel_spectrum(
+    model: Mapping[str, Any] | None,
+    sigma: float,
+    step: float = GRID_STEP,
+    half_width: float = GRID_HALF_WIDTH,
+) -> tuple:
+    if model is not None and model.get("family") == "empirical":
+        # Empirical histograms are in absolute mmol/L; sigma does not enter the kernel.
+        sigma = 0.0
+    elif not sigma > 0:
+        raise ValueError("Sigma values must be positive.")
+    return _kernel_spectrum(_model_key(model), float(sigma), float(step), float(half_width))
+
+
+def difference_distribution(
+    model1: Mapping[str, Any] | None,
+    sigma1: float,
+    model2: Mapping[str, Any] | None,
+    sigma2: float,
+    step: float = GRID_STEP,
+    half_width: float = GRID_HALF_WIDTH,
+) -> GridDistribution:
+    # Distribution of e2 - e1: the spectrum of a reflected real kernel is the conjugate.
+    spectrum1 = kernel_spectrum(model1, sigma1, step, half_width)
+    spectrum2 = kernel_spectrum(model2, sigma2, step, half_width)
+    product = [b * a.conjugate() for a, b in zip(spectrum1, spectrum2, strict=True)]
+    wrapped = _fft(product, inverse=True)
+    size = len(wrapped)
+    span = 2 * int(round(half_width / step))
+    masses = array(
+        "d", (max(wrapped[offset % size].real, 0.0) for offset in range(-span, span + 1))
+    )
+    total = sum(masses)
+    for index in range(len(masses)):
+        masses[index] /= total
+    return GridDistribution(-span * step, step, masses)
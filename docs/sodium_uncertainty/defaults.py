@@ -3,6 +3,12 @@ from pathlib import Path
 from typing import Any
 
 from .model import loa_half_pair_to_sigma
+from .precision import (
+    INVALID_PROFILE_MESSAGE,
+    PrecisionTable,
+    compile_precision_profile,
+    validate_precision_profile,
+)
 
 
 def _default_path() -> Path:
@@ -16,6 +22,13 @@ def load_defaults(path: str | Path | None = None) -> dict[str, Any]:
     return data
 
 
+def params_hash(params: dict[str, Any]) -> str:
+    import hashlib
+
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), allow_nan=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
 def validate_defaults(data: dict[str, Any]) -> None:
     if "defaults" not in data:
         raise ValueError("Defaults JSON must include a defaults section.")
@@ -27,8 +40,18 @@ def validate_defaults(data: dict[str, Any]) -> None:
                 raise ValueError(f"Defaults for {context}/{method} must be a mapping.")
             loa_half = params.get("loa_half_pair")
             sigma = params.get("sigma")
-            if loa_half is None and sigma is None:
-                raise ValueError(f"Defaults for {context}/{method} require loa_half_pair or sigma.")
+            profile = params.get("precision_profile")
+            if loa_half is None and sigma is None and profile is None:
+                raise ValueError(
+                    f"Defaults for {context}/{method} require loa_half_pair, sigma, "
+                    "or precision_profile."
+                )
+            if profile is not None:
+                validate_precision_profile(profile, f"{context}/{method}")
+            if params.get("error_model") is not None:
+                from .convolution import validate_error_model
+
+                validate_error_model(params["error_model"], f"{context}/{method}")
             if loa_half is not None and float(loa_half) <= 0:
                 raise ValueError(f"LoA half-width for {context}/{method} must be positive.")
             if sigma is not None and float(sigma) <= 0:
@@ -48,3 +71,15 @@ def resolve_sigma(params: dict[str, Any], context: str, method: str) -> float:
         raise ValueError("LoA half-width must be provided when sigma is empty.")
     loa_half = float(loa_raw)
     return loa_half_pair_to_sigma(loa_half)
+
+
+def precision_table_for(params: dict[str, Any], context: str, method: str) -> PrecisionTable | None:
+    profile = params["defaults"][context][method].get("precision_profile")
+    if profile in (None, ""):
+        return None
+    # One fixed message, so compute_payload and the bulk validator's masks report it identically.
+    try:
+        validate_precision_profile(profile, f"{context}/{method}")
+    except ValueError as exc:
+        raise ValueError(INVALID_PROFILE_MESSAGE) from exc
+    return compile_precision_profile(profile)
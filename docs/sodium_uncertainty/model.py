@@ -1,11 +1,109 @@
 import math
-from collections.abc import Iterable
-from statistics import NormalDist
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
 
 from .types import NormalSummary, ScenarioResult
 
 Z_95 = 1.96
 
+_SQRT2 = math.sqrt(2.0)
+_INV_SQRT2 = 1.0 / _SQRT2
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+# Wichura (1988), Algorithm AS241 (PPND16) rational approximation coefficients,
+# highest order first. These match the coefficients used by statistics.NormalDist.
+_PPF_CENTRAL_NUM = (
+    2.5090809287301226727e3,
+    3.3430575583588128105e4,
+    6.7265770927008700853e4,
+    4.5921953931549871457e4,
+    1.3731693765509461125e4,
+    1.9715909503065514427e3,
+    1.3314166789178437745e2,
+    3.3871328727963666080e0,
+)
+_PPF_CENTRAL_DEN = (
+    5.2264952788528545610e3,
+    2.8729085735721942674e4,
+    3.9307895800092710610e4,
+    2.1213794301586595867e4,
+    5.3941960214247511077e3,
+    6.8718700749205790830e2,
+    4.2313330701600911252e1,
+    1.0,
+)
+_PPF_INTERMEDIATE_NUM = (
+    7.7454501427834140764e-4,
+    2.2723844989269184583e-2,
+    2.4178072517745061177e-1,
+    1.2704582524523683826e0,
+    3.6478483247632046050e0,
+    5.7694972214606914055e0,
+    4.6303378461565452959e0,
+    1.4234371107496835773e0,
+)
+_PPF_INTERMEDIATE_DEN = (
+    1.0507500716444168432e-9,
+    5.4759380849953449460e-4,
+    1.5198666563616457197e-2,
+    1.4810397642748007459e-1,
+    6.8976733498510000455e-1,
+    1.6763848301838038494e0,
+    2.0531916266377588219e0,
+    1.0,
+)
+_PPF_TAIL_NUM = (
+    2.0103343992922881327e-7,
+    2.7115555687434875782e-5,
+    1.2426609473880784386e-3,
+    2.6532189526576123093e-2,
+    2.9656057182850489123e-1,
+    1.7848265399172913358e0,
+    5.4637849111641143699e0,
+    6.6579046435011037772e0,
+)
+_PPF_TAIL_DEN = (
+    2.0442631033899397856e-15,
+    1.4215117583164458887e-7,
+    1.8463183175100546818e-5,
+    7.8686913114561325910e-4,
+    1.4875361290850614853e-2,
+    1.3692988092273580531e-1,
+    5.9983220655588793769e-1,
+    1.0,
+)
+
+
+def _horner(coefficients: Sequence[float], r: float) -> float:
+    total = 0.0
+    for coefficient in coefficients:
+        total = total * r + coefficient
+    return total
+
+
+def standard_normal_ppf(p: float) -> float:
+    if not 0 < p < 1:
+        raise ValueError("Probability must be between 0 and 1.")
+    q = p - 0.5
+    if abs(q) <= 0.425:
+        r = 0.180625 - q * q
+        return q * _horner(_PPF_CENTRAL_NUM, r) / _horner(_PPF_CENTRAL_DEN, r)
+    r = math.sqrt(-math.log(p if q <= 0.0 else 1.0 - p))
+    if r <= 5.0:
+        r -= 1.6
+        x = _horner(_PPF_INTERMEDIATE_NUM, r) / _horner(_PPF_INTERMEDIATE_DEN, r)
+    else:
+        r -= 5.0
+        x = _horner(_PPF_TAIL_NUM, r) / _horner(_PPF_TAIL_DEN, r)
+    return -x if q < 0.0 else x
+
+
+@lru_cache(maxsize=64)
+def two_sided_z(level: float) -> float:
+    if not 0 < level < 1:
+        raise ValueError("CI level must be between 0 and 1.")
+    return standard_normal_ppf(1 - (1 - level) / 2)
+
 
 def loa_half_pair_to_sigma(loa_half: float) -> float:
     if loa_half <= 0:
@@ -26,7 +124,7 @@ def normal_ci(mean: float, sd: float, level: float) -> tuple[float, float]:
         raise ValueError("CI level must be between 0 and 1.")
     if sd == 0:
         return mean, mean
-    z = NormalDist().inv_cdf(1 - (1 - level) / 2)
+    z = two_sided_z(level)
     return mean - z * sd, mean + z * sd
 
 
@@ -86,7 +184,14 @@ def posterior_sequential_draws(
 def normal_pdf(x: float, mean: float, sd: float) -> float:
     if sd <= 0:
         raise ValueError("Standard deviation must be positive.")
-    return NormalDist(mu=mean, sigma=sd).pdf(x)
+    z = (x - mean) / sd
+    return _INV_SQRT_2PI / sd * math.exp(-0.5 * z * z)
+
+
+@lru_cache(maxsize=8)
+def _standard_curve_density(n: int, span_sd: float) -> tuple[float, ...]:
+    step = (2 * span_sd) / (n - 1)
+    return tuple(_INV_SQRT_2PI * math.exp(-0.5 * (-span_sd + i * step) ** 2) for i in range(n))
 
 
 def make_curve(
@@ -102,14 +207,47 @@ def make_curve(
     start = mean - span_sd * sd
     step = (2 * span_sd * sd) / (n - 1)
     xs = [start + i * step for i in range(n)]
-    ys = [normal_pdf(x, mean, sd) for x in xs]
+    inv_sd = 1.0 / sd
+    ys = [density * inv_sd for density in _standard_curve_density(n, float(span_sd))]
     return {"x": xs, "y": ys}
 
 
+def curve_spec(mean: float, sd: float, span_sd: float = 4) -> dict[str, float | str]:
+    # The parameters make_curve samples from; "degenerate" marks its sd <= 0 spike.
+    family = "normal" if sd > 0 else "degenerate"
+    return {"family": family, "mean": mean, "sd": sd, "span_sd": span_sd}
+
+
 def normal_cdf(x: float, mean: float, sd: float) -> float:
     if sd <= 0:
         raise ValueError("Standard deviation must be positive.")
-    return NormalDist(mu=mean, sigma=sd).cdf(x)
+    return 0.5 * math.erfc((mean - x) / sd * _INV_SQRT2)
+
+
+def normal_sf(x: float, mean: float, sd: float) -> float:
+    if sd <= 0:
+        raise ValueError("Standard deviation must be positive.")
+    return 0.5 * math.erfc((x - mean) / sd * _INV_SQRT2)
+
+
+def two_sided_tail(delta: float, sd: float) -> float:
+    if sd <= 0:
+        raise ValueError("Standard deviation must be positive.")
+    return math.erfc(abs(delta) / sd * _INV_SQRT2)
+
+
+def abs_exceedance(mean: float, sd: float, thresholds: Iterable[float]) -> list[float]:
+    # P(|X| > t) for X ~ N(mean, sd) at every t, with the scale hoisted out of the loop.
+    if sd < 0:
+        raise ValueError("Standard deviation must be non-negative.")
+    if sd == 0:
+        return [1.0 if abs(mean) > threshold else 0.0 for threshold in thresholds]
+    scale = _INV_SQRT2 / sd
+    erfc = math.erfc
+    return [
+        0.5 * (erfc((threshold - mean) * scale) + erfc((threshold + mean) * scale))
+        for threshold in thresholds
+    ]
 
 
 def same_sample_p_value(y1: float, y2: float, sigma1: float, sigma2: float) -> float:
@@ -119,8 +257,7 @@ def same_sample_p_value(y1: float, y2: float, sigma1: float, sigma2: float) -> f
     sd = math.sqrt(sigma1**2 + sigma2**2)
     if sd == 0:
         return 1.0 if delta == 0 else 0.0
-    p_value = 2 * (1 - normal_cdf(abs(delta), 0.0, sd))
-    return max(0.0, min(1.0, p_value))
+    return min(1.0, two_sided_tail(delta, sd))
 
 
 def chance_probability_under_null(delta_obs: float, sigma_delta: float) -> float:
@@ -128,8 +265,69 @@ def chance_probability_under_null(delta_obs: float, sigma_delta: float) -> float
         raise ValueError("Sigma delta must be non-negative.")
     if sigma_delta == 0:
         return 1.0 if delta_obs == 0 else 0.0
-    p_value = 2 * (1 - normal_cdf(abs(delta_obs), 0.0, sigma_delta))
-    return max(0.0, min(1.0, p_value))
+    return min(1.0, two_sided_tail(delta_obs, sigma_delta))
+
+
+# Longest rounded null table kept per (sigma1, sigma2, resolution); fine resolutions past it
+# are evaluated one step at a time.
+MAX_NULL_STEPS = 4096
+
+
+def _normal_tail_integral(t: float, sd: float) -> float:
+    # ∫_t^∞ P(N(0, sd) > s) ds, in closed form.
+    z = t / sd
+    return sd * (_INV_SQRT_2PI * math.exp(-0.5 * z * z) - z * 0.5 * math.erfc(z * _INV_SQRT2))
+
+
+def _rounded_tail(steps: int, sd: float, resolution: float) -> float:
+    # P(|reported ΔNa| >= steps) under no change when both results are rounded to
+    # `resolution`. With the true value's position inside a step uniform, the reported
+    # difference is round((v + e2 - e1) / resolution) for v ~ U(-h/2, h/2), which gives
+    # P(D >= m) = (1/h) ∫_{(m-1)h}^{mh} P(e2 - e1 > s) ds exactly.
+    if steps == 0:
+        return 1.0
+    upper = _normal_tail_integral(steps * resolution, sd)
+    lower = _normal_tail_integral((steps - 1) * resolution, sd)
+    return max(0.0, min(1.0, 2.0 * (lower - upper) / resolution))
+
+
+@lru_cache(maxsize=256)
+def rounded_null_tails(sigma1: float, sigma2: float, resolution: float) -> tuple[float, ...]:
+    # tails[m] for m up to where the tail underflows, 40 sd, or MAX_NULL_STEPS entries;
+    # rounded_chance_under_null evaluates steps past the table directly.
+    if sigma1 <= 0 or sigma2 <= 0:
+        raise ValueError("Sigma values must be positive.")
+    if not (math.isfinite(resolution) and resolution > 0):
+        raise ValueError("Reporting resolution must be positive and finite.")
+    sd = math.sqrt(sigma1**2 + sigma2**2)
+    tails = [1.0]
+    previous = _normal_tail_integral(0.0, sd)
+    step = 1
+    while step <= MAX_NULL_STEPS and step * resolution <= 40.0 * sd:
+        current = _normal_tail_integral(step * resolution, sd)
+        tail = min(1.0, 2.0 * (previous - current) / resolution)
+        if tail <= 0.0:
+            break
+        tails.append(tail)
+        previous = current
+        step += 1
+    return tuple(tails)
+
+
+def rounded_chance_under_null(
+    delta_obs: float, sigma1: float, sigma2: float, resolution: float
+) -> float:
+    tails = rounded_null_tails(sigma1, sigma2, resolution)
+    ratio = abs(delta_obs) / resolution
+    if math.isinf(ratio):
+        return 0.0
+    steps = round(ratio)
+    if steps < len(tails):
+        return tails[steps]
+    if len(tails) <= MAX_NULL_STEPS:
+        # The table stopped early because the tail had already underflowed.
+        return 0.0
+    return _rounded_tail(steps, math.sqrt(sigma1**2 + sigma2**2), resolution)
 
 
 QUALITATIVE_BUCKETS: list[tuple[float, str, str]] = [
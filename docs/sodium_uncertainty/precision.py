@@ -0,0 +1,111 @@
+import math
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+PROFILE_KINDS = ("sigma", "cv")
+DEFAULT_STEP = 0.05
+MAX_TABLE_SIZE = 1_000_000
+# What a malformed profile reports at compute time; validate_precision_profile says which part.
+INVALID_PROFILE_MESSAGE = "Precision profile for the selected context or method is invalid."
+
+
+@dataclass(frozen=True)
+class PrecisionTable:
+    kind: str
+    anchors: tuple[tuple[float, float], ...]
+    start: float
+    step: float
+    sigmas: array
+
+    def index_for(self, value: float) -> int:
+        offset = (value - self.start) / self.step
+        if offset <= 0:
+            return 0
+        last = len(self.sigmas) - 1
+        if offset >= last:
+            return last
+        return int(offset + 0.5)
+
+    def sigma_at(self, value: float) -> float:
+        if math.isnan(value):
+            return math.nan
+        return self.sigmas[self.index_for(value)]
+
+    def sigma_column(self, values: Iterable[float]) -> list[float]:
+        sigmas = self.sigmas
+        index_for = self.index_for
+        return [math.nan if math.isnan(value) else sigmas[index_for(value)] for value in values]
+
+    def anchors_used(self, value: float) -> list[tuple[float, float]]:
+        levels = [level for level, _value in self.anchors]
+        position = bisect_right(levels, value)
+        if position == 0:
+            return [self.anchors[0]]
+        if position == len(levels):
+            return [self.anchors[-1]]
+        return [self.anchors[position - 1], self.anchors[position]]
+
+
+def validate_precision_profile(profile: Any, label: str) -> None:
+    if not isinstance(profile, Mapping):
+        raise ValueError(f"Precision profile for {label} must be a mapping.")
+    if profile.get("kind") not in PROFILE_KINDS:
+        raise ValueError(f"Precision profile for {label} must have kind 'sigma' or 'cv'.")
+    points = profile.get("points")
+    if not isinstance(points, Sequence) or isinstance(points, str) or not points:
+        raise ValueError(f"Precision profile for {label} needs at least one anchor point.")
+    previous = -math.inf
+    for point in points:
+        if not isinstance(point, Sequence) or isinstance(point, str) or len(point) != 2:
+            raise ValueError(f"Precision profile points for {label} must be [Na, value] pairs.")
+        try:
+            level, value = float(point[0]), float(point[1])
+        except (TypeError, ValueError):
+            raise ValueError(f"Precision profile points for {label} must be numeric.") from None
+        if not level > previous:
+            raise ValueError(f"Precision profile anchors for {label} must be strictly increasing.")
+        if level <= 0 or not value > 0 or math.isinf(value):
+            raise ValueError(f"Precision profile values for {label} must be positive.")
+        previous = level
+    try:
+        step = float(profile.get("step", DEFAULT_STEP))
+    except (TypeError, ValueError):
+        raise ValueError(f"Precision profile step for {label} must be numeric.") from None
+    if not step > 0:
+        raise ValueError(f"Precision profile step for {label} must be positive.")
+    if (previous - float(points[0][0])) / step >= MAX_TABLE_SIZE:
+        raise ValueError(f"Precision profile for {label} is too fine for its range.")
+
+
+def _interpolate(levels: Sequence[float], values: Sequence[float], x: float) -> float:
+    position = bisect_right(levels, x)
+    if position == 0:
+        return values[0]
+    if position == len(levels):
+        return values[-1]
+    low, high = levels[position - 1], levels[position]
+    weight = (x - low) / (high - low)
+    return values[position - 1] + weight * (values[position] - values[position - 1])
+
+
+@lru_cache(maxsize=256)
+def _compile(kind: str, anchors: tuple[tuple[float, float], ...], step: float) -> PrecisionTable:
+    levels = [level for level, _value in anchors]
+    values = [value for _level, value in anchors]
+    start = levels[0]
+    size = int(round((levels[-1] - start) / step)) + 1
+    sigmas = array("d", bytes(8 * size))
+    for index in range(size):
+        x = min(start + index * step, levels[-1])
+        value = _interpolate(levels, values, x)
+        sigmas[index] = value * x if kind == "cv" else value
+    return PrecisionTable(kind=kind, anchors=anchors, start=start, step=step, sigmas=sigmas)
+
+
+def compile_precision_profile(profile: Mapping[str, Any]) -> PrecisionTable:
+    anchors = tuple((float(level), float(value)) for level, value in profile["points"])
+    return _compile(profile["kind"], anchors, float(profile.get("step", DEFAULT_STEP)))
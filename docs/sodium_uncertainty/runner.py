@@ -0,0 +1,242 @@
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import shutil
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from .batch import BUCKET_KEYS, DEFAULT_CHUNK_SIZE, ERROR_BUCKET, RESULT_COLUMNS, score_unique
+from .columnar import ColumnarFile, ColumnarWriter, write_columns
+from .defaults import load_defaults, params_hash
+from .query import IndexBuilder, index_paths
+
+CHECKPOINT_NAME = "checkpoint.json"
+CHECKPOINT_VERSION = 3
+# Checkpoint chunks also carry each row's method pair and context as codes into the label
+# lists kept in checkpoint.json, so an index can be built after a resume.
+LABEL_COLUMNS = (("method1", "q"), ("method2", "q"), ("context", "q"))
+ROW_COLUMNS = ("y1", "y2", "method1", "method2", "context", "scale_with_na")
+_TRUE_STRINGS = {"1", "true", "t", "yes", "y"}
+# Columns appended to each input row by score_csv_text; row_id is dropped because rows keep
+# their input order.
+SCORED_CSV_COLUMNS = tuple(name for name, _typecode in RESULT_COLUMNS if name != "row_id")
+
+
+def row_payload(row: Mapping[str, str], base: Mapping[str, Any]) -> dict[str, Any]:
+    payload = dict(base)
+    for column in ROW_COLUMNS:
+        value = row.get(column)
+        if value is None:
+            continue
+        if column == "scale_with_na":
+            payload[column] = value.strip().lower() in _TRUE_STRINGS
+        else:
+            payload[column] = value
+    return payload
+
+
+def _row_values(row: Mapping[str, str], base: Mapping[str, Any]) -> tuple[Any, ...]:
+    # The ROW_COLUMNS values row_payload would set, as a hashable key for score_unique.
+    values = []
+    for column in ROW_COLUMNS:
+        value = row.get(column)
+        if value is None:
+            values.append(base.get(column))
+        elif column == "scale_with_na":
+            values.append(value.strip().lower() in _TRUE_STRINGS)
+        else:
+            values.append(value)
+    return tuple(values)
+
+
+def score_csv_text(
+    text: str,
+    header: Sequence[str],
+    base: Mapping[str, Any],
+) -> tuple[str, dict[str, int]]:
+    # Scores a block of whole CSV records (no header line) and returns them as CSV with
+    # SCORED_CSV_COLUMNS appended, plus bucket counts for progress summaries.
+    rows = [row for row in csv.reader(io.StringIO(text)) if row]
+    keys = (_row_values(dict(zip(header, row, strict=False)), base) for row in rows)
+    results = score_unique(keys, ROW_COLUMNS, base)
+    counts = dict.fromkeys((*BUCKET_KEYS, "error"), 0)
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    columns = [results[name] for name in SCORED_CSV_COLUMNS]
+    for row, *values, code in zip(rows, *columns, strict=True):
+        bucket = BUCKET_KEYS[code] if code != ERROR_BUCKET else "error"
+        counts[bucket] += 1
+        writer.writerow([*row, *("" if math.isnan(value) else value for value in values), bucket])
+    return output.getvalue(), counts
+
+
+def _lines(handle: IO[bytes]) -> Iterator[str]:
+    while line := handle.readline():
+        yield line.decode("utf-8")
+
+
+def _write_json_atomic(path: Path, data: Mapping[str, Any]) -> None:
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(json.dumps(data, indent=2) + "\n")
+    os.replace(temporary, path)
+
+
+def _chunk_path(checkpoint_dir: Path, index: int) -> Path:
+    return checkpoint_dir / f"chunk-{index:06d}.snacol"
+
+
+def _load_checkpoint(checkpoint_dir: Path, expected: Mapping[str, Any]) -> dict[str, Any] | None:
+    path = checkpoint_dir / CHECKPOINT_NAME
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text())
+    if state.get("version") != expected["version"]:
+        raise ValueError("Checkpoint version does not match this run; refusing to resume.")
+    if state["params_hash"] != expected["params_hash"]:
+        raise ValueError("Parameters changed since the checkpoint was written; refusing to resume.")
+    for key in ("input", "input_size", "chunk_size", "base_hash"):
+        if state[key] != expected[key]:
+            raise ValueError(f"Checkpoint {key} does not match this run; refusing to resume.")
+    return state
+
+
+def run_batch(
+    input_path: str | Path,
+    output_path: str | Path,
+    params: dict[str, Any] | None = None,
+    base: Mapping[str, Any] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_dir: str | Path | None = None,
+    max_chunks: int | None = None,
+    index: bool = False,
+) -> dict[str, Any]:
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    params = load_defaults() if params is None else params
+    base_payload = {"ci_level": 0.95, "threshold": 2, "na_ref": 140, **(base or {})}
+    checkpoint_dir = (
+        Path(checkpoint_dir)
+        if checkpoint_dir
+        else output_path.with_name(f"{output_path.name}.checkpoint")
+    )
+    identity = {
+        "version": CHECKPOINT_VERSION,
+        "input": str(input_path.resolve()),
+        "input_size": input_path.stat().st_size,
+        "chunk_size": chunk_size,
+        "params_hash": params_hash(params),
+        "base_hash": params_hash(base_payload),
+    }
+    state = _load_checkpoint(checkpoint_dir, identity)
+    if state is None:
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        state = {**identity, "chunks_done": 0, "rows_done": 0, "offset": None, "complete": False}
+        state["labels"] = {"method": [], "context": []}
+    label_codes = {
+        kind: {label: code for code, label in enumerate(labels)}
+        for kind, labels in state["labels"].items()
+    }
+
+    def code_for(kind: str, label: str) -> int:
+        codes = label_codes[kind]
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(codes)
+            state["labels"][kind].append(label)
+        return code
+
+    base_payload["params"] = params
+    chunks_this_run = 0
+    with input_path.open("rb") as handle:
+        header = next(csv.reader([handle.readline().decode("utf-8")]), [])
+        if state["offset"] is not None:
+            handle.seek(state["offset"])
+        reader = csv.DictReader(_lines(handle), fieldnames=header)
+        while not state["complete"]:
+            if max_chunks is not None and chunks_this_run >= max_chunks:
+                return state
+            rows = []
+            for row in reader:
+                rows.append(_row_values(row, base_payload))
+                if len(rows) == chunk_size:
+                    break
+            if rows:
+                results = score_unique(
+                    rows, ROW_COLUMNS, base_payload, first_row_id=state["rows_done"]
+                )
+                results["method1"] = [code_for("method", str(row[2])) for row in rows]
+                results["method2"] = [code_for("method", str(row[3])) for row in rows]
+                results["context"] = [code_for("context", str(row[4])) for row in rows]
+                write_columns(
+                    _chunk_path(checkpoint_dir, state["chunks_done"]),
+                    (*RESULT_COLUMNS, *LABEL_COLUMNS),
+                    results,
+                )
+                state["chunks_done"] += 1
+                state["rows_done"] += len(rows)
+                chunks_this_run += 1
+            state["offset"] = handle.tell()
+            state["complete"] = len(rows) < chunk_size
+            _write_json_atomic(checkpoint_dir / CHECKPOINT_NAME, state)
+
+    meta = {"bucket_keys": list(BUCKET_KEYS), "params_hash": state["params_hash"]}
+    builder = IndexBuilder() if index else None
+    methods, contexts = state["labels"]["method"], state["labels"]["context"]
+    with ColumnarWriter(output_path, RESULT_COLUMNS, meta) as writer:
+        for chunk_index in range(state["chunks_done"]):
+            with ColumnarFile(_chunk_path(checkpoint_dir, chunk_index)) as chunk:
+                columns = {name: chunk.column(name) for name, _typecode in RESULT_COLUMNS}
+                writer.write(columns)
+                if builder is not None:
+                    builder.add(
+                        columns,
+                        [methods[code] for code in chunk.column("method1")],
+                        [methods[code] for code in chunk.column("method2")],
+                        [contexts[code] for code in chunk.column("context")],
+                    )
+    # A rewritten results file must never sit next to an index built for an older one.
+    for path in index_paths(output_path):
+        path.unlink(missing_ok=True)
+    if builder is not None:
+        builder.write(output_path)
+    shutil.rmtree(checkpoint_dir)
+    return state
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Score a CSV of sodium pairs with checkpoints.")
+    parser.add_argument("input", type=Path, help="CSV with y1,y2,method1,method2,context columns")
+    parser.add_argument("--output", type=Path, required=True, help="Columnar results file")
+    parser.add_argument("--defaults", type=Path, help="Variability defaults JSON")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--checkpoint-dir", type=Path)
+    parser.add_argument("--ci-level", type=float, default=0.95)
+    parser.add_argument("--threshold", type=float, default=2.0)
+    parser.add_argument("--na-ref", type=float, default=140.0)
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Also write sorted and bitmap indexes for sodium_uncertainty.query",
+    )
+    args = parser.parse_args(argv)
+
+    state = run_batch(
+        args.input,
+        args.output,
+        params=load_defaults(args.defaults),
+        base={"ci_level": args.ci_level, "threshold": args.threshold, "na_ref": args.na_ref},
+        chunk_size=args.chunk_size,
+        checkpoint_dir=args.checkpoint_dir,
+        index=args.index,
+    )
+    print(f"Scored {state['rows_done']} rows in {state['chunks_done']} chunks -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
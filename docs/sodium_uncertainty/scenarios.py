@@ -0,0 +1,115 @@
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from .calculator import build_response, evaluate_payload
+
+MAX_SCENARIOS = 12
+BASE_LABEL = "Base"
+# Inputs a scenario may vary; params, curve mode and exceedance thresholds are shared by the set.
+SCENARIO_FIELDS = (
+    "y1",
+    "y2",
+    "method1",
+    "method2",
+    "context",
+    "ci_level",
+    "threshold",
+    "scale_with_na",
+    "na_ref",
+    "resolution",
+    "error_engine",
+)
+COMPARISON_COLUMNS = (
+    "label",
+    "context",
+    "method1",
+    "method2",
+    "sigma_delta",
+    "observed_delta",
+    "delta_true_mean",
+    "delta_true_ci_low",
+    "delta_true_ci_high",
+    "chance_under_null",
+    "chance_bucket_key",
+    "delta_abs_gt_threshold",
+    "error",
+)
+SCENARIOS_MESSAGE = "Scenarios must be a list of objects."
+
+
+def _variations(payload: Mapping[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    scenarios = payload.get("scenarios", [])
+    if not isinstance(scenarios, list) or not all(isinstance(item, Mapping) for item in scenarios):
+        raise ValueError(SCENARIOS_MESSAGE)
+    if len(scenarios) > MAX_SCENARIOS:
+        raise ValueError(f"At most {MAX_SCENARIOS} scenarios are allowed.")
+    variations = [(BASE_LABEL, {})]
+    for number, scenario in enumerate(scenarios, start=1):
+        overrides = {key: value for key, value in scenario.items() if key != "label"}
+        unknown = sorted(set(overrides) - set(SCENARIO_FIELDS))
+        if unknown:
+            raise ValueError(
+                f"Scenario {number} cannot vary {', '.join(unknown)}; "
+                f"only {', '.join(SCENARIO_FIELDS)} may differ."
+            )
+        variations.append((str(scenario.get("label") or f"Scenario {number}"), overrides))
+    return variations
+
+
+def _comparison_row(label: str, response: Mapping[str, Any]) -> list[Any]:
+    if response["errors"]:
+        return [label, *[None] * (len(COMPARISON_COLUMNS) - 2), response["errors"][0]]
+    details = response["details"]
+    delta_true = response["delta_true"]
+    probabilities = response["probabilities"]
+    return [
+        label,
+        details["context"],
+        details["method1"],
+        details["method2"],
+        details["sigma_delta"],
+        response["observed_delta"],
+        delta_true["mean"],
+        delta_true["ci_low"],
+        delta_true["ci_high"],
+        probabilities["chance_under_null"],
+        probabilities["chance_bucket_key"],
+        probabilities["delta_abs_gt_threshold"],
+        None,
+    ]
+
+
+def compute_scenarios(payload: Mapping[str, Any]) -> dict[str, Any]:
+    # The base payload is the first scenario; each listed scenario overrides some of its
+    # SCENARIO_FIELDS. Sigma sources (including compiled precision profiles) are resolved once
+    # per (context, method) for the whole set, and scenarios that end up with identical inputs
+    # share one evaluation and response.
+    try:
+        variations = _variations(payload)
+    except ValueError as exc:
+        return {"errors": [str(exc)], "warnings": [], "comparison": None, "scenarios": []}
+    base = {key: value for key, value in payload.items() if key != "scenarios"}
+    sigma_sources: dict[tuple[Any, Any], Any] = {}
+    responses: dict[str, dict[str, Any]] = {}
+    scenarios = []
+    rows = []
+    for label, overrides in variations:
+        merged = {**base, **overrides}
+        key = json.dumps([merged.get(field) for field in SCENARIO_FIELDS], default=repr)
+        response = responses.get(key)
+        if response is None:
+            evaluation = evaluate_payload(merged, sigma_sources)
+            response = responses[key] = build_response(merged, evaluation)
+        scenarios.append({"label": label, "overrides": overrides, "result": response})
+        rows.append(_comparison_row(label, response))
+    return {
+        "errors": [],
+        "warnings": [],
+        "comparison": {"columns": list(COMPARISON_COLUMNS), "rows": rows},
+        "scenarios": scenarios,
+    }
+
+
+def compute_scenarios_from_json(payload_json: str) -> str:
+    return json.dumps(compute_scenarios(json.loads(payload_json)))
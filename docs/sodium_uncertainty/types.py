@@ -1,4 +1,6 @@
+from array import array
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass(frozen=True)
@@ -16,3 +18,42 @@ class ScenarioResult:
     delta_true: NormalSummary
     observed_delta: float
     delta_observed: NormalSummary | None = None
+
+
+@dataclass(frozen=True)
+class BulkValidation:
+    error_mask: array
+    warning_mask: array
+    error_counts: dict[str, int]
+    warning_counts: dict[str, int]
+    n_rows: int
+    error_rows: int
+    warning_rows: int
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    errors: list[str]
+    warnings: list[str]
+    y1: float | None = None
+    y2: float | None = None
+    ci_level: float | None = None
+    threshold: float | None = None
+    context: Any = None
+    method1: Any = None
+    method2: Any = None
+    params: Any = None
+    scale_with_na: Any = False
+    na_ref: float | None = None
+    sigma1: float | None = None
+    sigma2: float | None = None
+    sigma_delta: float | None = None
+    table1: Any = None
+    table2: Any = None
+    scale1: bool = False
+    scale2: bool = False
+    result: ScenarioResult | None = None
+    chance_under_null: float | None = None
+    engine: str = "normal"
+    noise: Any = None
+    resolution: float | None = None
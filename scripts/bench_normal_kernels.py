@@ -0,0 +1,87 @@
+"""Microbenchmark the scalar normal kernels against statistics.NormalDist."""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+from statistics import NormalDist
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sodium_uncertainty.model import (  # noqa: E402
+    make_curve,
+    normal_cdf,
+    normal_ci,
+    normal_pdf,
+    normal_sf,
+)
+
+XS = [125.0 + i * 0.05 for i in range(401)]
+MEAN = 133.0
+SD = 2.09
+REPEATS = 5
+NUMBER = 50
+
+
+def _reference_make_curve(mean: float, sd: float, n: int = 401, span_sd: float = 4) -> None:
+    start = mean - span_sd * sd
+    step = (2 * span_sd * sd) / (n - 1)
+    xs = [start + i * step for i in range(n)]
+    [NormalDist(mu=mean, sigma=sd).pdf(x) for x in xs]
+
+
+def _reference_ci(mean: float, sd: float, level: float) -> None:
+    z = NormalDist().inv_cdf(1 - (1 - level) / 2)
+    (mean - z * sd, mean + z * sd)
+
+
+CASES = [
+    (
+        "cdf x401",
+        lambda: [NormalDist(mu=MEAN, sigma=SD).cdf(x) for x in XS],
+        lambda: [normal_cdf(x, MEAN, SD) for x in XS],
+    ),
+    (
+        "upper tail x401",
+        lambda: [1 - NormalDist(mu=MEAN, sigma=SD).cdf(x) for x in XS],
+        lambda: [normal_sf(x, MEAN, SD) for x in XS],
+    ),
+    (
+        "pdf x401",
+        lambda: [NormalDist(mu=MEAN, sigma=SD).pdf(x) for x in XS],
+        lambda: [normal_pdf(x, MEAN, SD) for x in XS],
+    ),
+    (
+        "ci x3 levels",
+        lambda: [_reference_ci(MEAN, SD, level) for level in (0.5, 0.95, 0.99)],
+        lambda: [normal_ci(MEAN, SD, level) for level in (0.5, 0.95, 0.99)],
+    ),
+    (
+        "make_curve",
+        lambda: _reference_make_curve(MEAN, SD),
+        lambda: make_curve(MEAN, SD),
+    ),
+]
+
+
+def _best(func) -> float:
+    return min(timeit.repeat(func, repeat=REPEATS, number=NUMBER)) / NUMBER
+
+
+def main() -> None:
+    print(f"{'case':<18}{'NormalDist (us)':>18}{'kernel (us)':>14}{'speedup':>10}")
+    for name, reference, kernel in CASES:
+        reference_time = _best(reference)
+        kernel_time = _best(kernel)
+        print(
+            f"{name:<18}{reference_time * 1e6:>18.1f}{kernel_time * 1e6:>14.1f}"
+            f"{reference_time / kernel_time:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
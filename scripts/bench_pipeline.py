@@ -0,0 +1,44 @@
+"""Benchmark the pairing and batch scoring paths on a seeded synthetic cohort."""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sodium_uncertainty.defaults import load_defaults  # noqa: E402
+from sodium_uncertainty.pairing import match_pairs, score_pairs  # noqa: E402
+from sodium_uncertainty.synthetic import DEFAULT_METHOD_MIX, generate_shard  # noqa: E402
+
+ROWS = 20_000
+SEED = 2024
+
+
+def _timed(label: str, rows: int, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12}{rows:>10}{elapsed * 1e3:>12.1f}{rows / elapsed:>14.0f}")
+    return result
+
+
+def main() -> None:
+    params = load_defaults()
+    methods = list(DEFAULT_METHOD_MIX)
+    print(f"{'stage':<12}{'rows':>10}{'ms':>12}{'rows/s':>14}")
+    columns = _timed("generate", ROWS, lambda: generate_shard(0, ROWS, seed=SEED, params=params))
+    results = [
+        (patient, hours, value, methods[code])
+        for patient, hours, value, code in zip(*columns.values(), strict=True)
+    ]
+    pairs = _timed("pair", ROWS, lambda: match_pairs(results, max_hours=24))
+    _timed("score", len(pairs), lambda: score_pairs(pairs, params))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark indexed queries against full scans of a scored synthetic cohort."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from sodium_uncertainty.batch import BUCKET_CODES  # noqa: E402
+from sodium_uncertainty.columnar import ColumnarFile  # noqa: E402
+from sodium_uncertainty.query import ResultIndex  # noqa: E402
+from sodium_uncertainty.runner import run_batch  # noqa: E402
+from sodium_uncertainty.synthetic import DEFAULT_METHOD_MIX, generate_cohort  # noqa: E402
+
+ROWS = 500_000
+SEED = 2024
+ISTAT = "istat_direct_ISE"
+
+
+def _timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12}{len(result):>10}{elapsed * 1e3:>12.2f}")
+    return result, elapsed
+
+
+def _scan(index: ResultIndex, pair_methods: list[tuple[str, str]]) -> list[int]:
+    # What a caller without the index does: read every row and test it.
+    delta = index.results.column("observed_delta")
+    bucket = index.results.column("bucket")
+    very_unlikely = BUCKET_CODES["very_unlikely"]
+    return [
+        row
+        for row in range(index.n_rows)
+        if bucket[row] == very_unlikely and abs(delta[row]) >= 8 and ISTAT in pair_methods[row]
+    ]
+
+
+def main() -> None:
+    methods = list(DEFAULT_METHOD_MIX)
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "pairs.csv"
+        output = Path(directory) / "results.snacol"
+        generate_cohort(source, ROWS, seed=SEED, kind="pairs")
+        pairs_file = Path(directory) / "pairs.snacol"
+        generate_cohort(pairs_file, ROWS, seed=SEED, kind="pairs")
+        start = time.perf_counter()
+        run_batch(source, output, index=True)
+        print(f"scored and indexed {ROWS} rows in {time.perf_counter() - start:.1f}s")
+
+        with ColumnarFile(pairs_file) as pairs:
+            pair_methods = [
+                (methods[first], methods[second])
+                for first, second in zip(
+                    pairs.column("method1"), pairs.column("method2"), strict=True
+                )
+            ]
+        with ResultIndex(output) as index:
+            print(f"{'path':<12}{'matches':>10}{'ms':>12}")
+            scanned, scan = _timed("full scan", lambda: _scan(index, pair_methods))
+            indexed, query = _timed(
+                "indexed",
+                lambda: index.query(bucket="very_unlikely", min_abs_delta=8, method=ISTAT),
+            )
+            assert indexed.tolist() == scanned
+            _timed("+ load", lambda: index.rows(indexed)["row_id"])
+            print(f"speedup     {scan / query:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import re
 import shutil
 from pathlib import Path
 
@@ -10,6 +13,26 @@ SRC_PACKAGE = ROOT / "src" / "sodium_uncertainty"
 DOCS_PACKAGE = ROOT / "docs" / "sodium_uncertainty"
 SRC_DEFAULTS = ROOT / "data" / "variability_defaults.json"
 DOCS_DEFAULTS = ROOT / "docs" / "variability_defaults.json"
+DOCS_INDEX = ROOT / "docs" / "index.html"
+PRECACHE_MANIFEST = ROOT / "docs" / "precache-manifest.js"
+APP_ASSETS = (
+    "index.html",
+    "styles.css",
+    "app.py",
+    "variability_defaults.json",
+    "plot-render.js",
+    "plot-worker.js",
+    "bulk-worker.js",
+)
+PYODIDE_RUNTIME_FILES = (
+    "pyodide.js",
+    "pyodide.asm.js",
+    "pyodide.asm.wasm",
+    "python_stdlib.zip",
+    "pyodide-lock.json",
+)
+PYODIDE_SCRIPT = re.compile(r'<script src="(https://[^"]+/)pyodide\.js"></script>')
+HASH_LENGTH = 16
 
 
 def ignore_generated(_directory: str, names: list[str]) -> set[str]:
@@ -26,6 +49,38 @@ def patch_browser_default_path() -> None:
     defaults_path.write_text(text)
 
 
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def build_precache_manifest() -> dict[str, object]:
+    match = PYODIDE_SCRIPT.search(DOCS_INDEX.read_text())
+    if match is None:
+        raise SystemExit(f"Missing Pyodide script tag in {DOCS_INDEX.relative_to(ROOT)}")
+    pyodide_base = match.group(1)
+    docs = DOCS_INDEX.parent
+    paths = [
+        *APP_ASSETS,
+        *(f"sodium_uncertainty/{path.name}" for path in DOCS_PACKAGE.glob("*.py")),
+    ]
+    assets = {path: content_hash((docs / path).read_bytes()) for path in sorted(paths)}
+    runtime = [pyodide_base + name for name in PYODIDE_RUNTIME_FILES]
+    return {
+        "version": content_hash(json.dumps(assets, sort_keys=True).encode()),
+        "assets": assets,
+        "runtime_version": content_hash(pyodide_base.encode()),
+        "runtime": runtime,
+    }
+
+
+def write_precache_manifest() -> None:
+    manifest = json.dumps(build_precache_manifest(), indent=2, sort_keys=True)
+    PRECACHE_MANIFEST.write_text(
+        "// Generated by scripts/stage_docs_python.py; do not edit.\n"
+        f"self.PRECACHE_MANIFEST = {manifest};\n"
+    )
+
+
 def main() -> None:
     if not SRC_PACKAGE.exists():
         raise SystemExit(f"Missing source package: {SRC_PACKAGE}")
@@ -37,8 +92,10 @@ def main() -> None:
     shutil.copytree(SRC_PACKAGE, DOCS_PACKAGE, ignore=ignore_generated)
     patch_browser_default_path()
     shutil.copy2(SRC_DEFAULTS, DOCS_DEFAULTS)
+    write_precache_manifest()
     print(f"Staged {SRC_PACKAGE.relative_to(ROOT)} -> {DOCS_PACKAGE.relative_to(ROOT)}")
     print(f"Staged {SRC_DEFAULTS.relative_to(ROOT)} -> {DOCS_DEFAULTS.relative_to(ROOT)}")
+    print(f"Wrote {PRECACHE_MANIFEST.relative_to(ROOT)}")
 
 
 if __name__ == "__main__":
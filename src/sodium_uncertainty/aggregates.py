@@ -0,0 +1,380 @@
+import math
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .batch import BUCKET_KEYS, DEFAULT_CHUNK_SIZE, ERROR_BUCKET, chunked, score_payloads
+
+GroupKey = tuple[str, str, str]
+SUMMARY_VERSION = 1
+OBSERVED_DELTA_RANGE = (-30.0, 30.0, 120)
+CHANCE_RANGE = (0.0, 1.0, 100)
+SKETCH_ACCURACY = 0.005
+SKETCH_MAX_BINS = 2048
+
+
+def _trim(counts: Sequence[int]) -> tuple[int, list[int]]:
+    occupied = [index for index, count in enumerate(counts) if count]
+    if not occupied:
+        return 0, []
+    return occupied[0], list(counts[occupied[0] : occupied[-1] + 1])
+
+
+@dataclass
+class Histogram:
+    low: float
+    high: float
+    bins: int
+    counts: array | None = field(default=None, repr=False)
+    underflow: int = 0
+    overflow: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.high > self.low or self.bins < 1:
+            raise ValueError("Histogram needs high > low and at least one bin.")
+        if self.counts is None:
+            self.counts = array("q", bytes(8 * self.bins))
+        elif len(self.counts) != self.bins:
+            raise ValueError("Histogram counts must have one entry per bin.")
+
+    @property
+    def width(self) -> float:
+        return (self.high - self.low) / self.bins
+
+    @property
+    def n(self) -> int:
+        return sum(self.counts) + self.underflow + self.overflow
+
+    @property
+    def edges(self) -> list[float]:
+        return [self.low + index * self.width for index in range(self.bins + 1)]
+
+    def add_many(self, values: Iterable[float]) -> None:
+        # NaN is skipped; ±inf lands in underflow/overflow before any int() conversion.
+        low, high, bins, counts = self.low, self.high, self.bins, self.counts
+        scale = bins / (high - low)
+        for value in values:
+            if value != value:
+                continue
+            if value < low:
+                self.underflow += 1
+            elif value < high:
+                counts[min(int((value - low) * scale), bins - 1)] += 1
+            elif value == high:
+                counts[bins - 1] += 1
+            else:
+                self.overflow += 1
+
+    def add(self, value: float) -> None:
+        self.add_many((value,))
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError("Histogram bins must match to merge.")
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            counts[index] += count
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        offset, counts = _trim(self.counts)
+        return {
+            "low": self.low,
+            "high": self.high,
+            "bins": self.bins,
+            "offset": offset,
+            "counts": counts,
+            "underflow": self.underflow,
+            "overflow": self.overflow,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Histogram":
+        histogram = cls(float(data["low"]), float(data["high"]), int(data["bins"]))
+        for index, count in enumerate(data["counts"], start=int(data["offset"])):
+            histogram.counts[index] = int(count)
+        histogram.underflow = int(data["underflow"])
+        histogram.overflow = int(data["overflow"])
+        return histogram
+
+
+@dataclass
+class QuantileSketch:
+    # Log-bucketed sketch for non-negative values (DDSketch): any quantile is returned
+    # within `accuracy` relative error, and merging adds bucket counts, so it is exact
+    # and associative as long as neither side has collapsed its lowest buckets.
+    accuracy: float = SKETCH_ACCURACY
+    max_bins: int = SKETCH_MAX_BINS
+    buckets: dict[int, int] = field(default_factory=dict, repr=False)
+    zero_count: int = 0
+    n: int = 0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def __post_init__(self) -> None:
+        if not 0 < self.accuracy < 1:
+            raise ValueError("Sketch accuracy must be between 0 and 1.")
+        if self.max_bins < 1:
+            raise ValueError("Sketch needs at least one bin.")
+        self._gamma = (1 + self.accuracy) / (1 - self.accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def add_many(self, values: Iterable[float]) -> None:
+        buckets, log, log_gamma, ceil = self.buckets, math.log, self._log_gamma, math.ceil
+        for value in values:
+            if not value >= 0:
+                continue
+            self.n += 1
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+            if value == 0:
+                self.zero_count += 1
+                continue
+            index = ceil(log(value) / log_gamma)
+            buckets[index] = buckets.get(index, 0) + 1
+        if len(buckets) > self.max_bins:
+            self._collapse()
+
+    def add(self, value: float) -> None:
+        self.add_many((value,))
+
+    def _collapse(self) -> None:
+        indexes = sorted(self.buckets)
+        excess = indexes[: len(indexes) - self.max_bins + 1]
+        target = indexes[len(excess)]
+        self.buckets[target] += sum(self.buckets.pop(index) for index in excess)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if self.accuracy != other.accuracy:
+            raise ValueError("Sketch accuracy must match to merge.")
+        buckets = self.buckets
+        for index, count in other.buckets.items():
+            buckets[index] = buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(buckets) > self.max_bins:
+            self._collapse()
+        return self
+
+    def quantile(self, q: float) -> float:
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1.")
+        if self.n == 0:
+            return math.nan
+        rank = q * (self.n - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        indexes = sorted(self.buckets)
+        offset = indexes[0] if indexes else 0
+        counts = [0] * (indexes[-1] - offset + 1) if indexes else []
+        for index in indexes:
+            counts[index - offset] = self.buckets[index]
+        return {
+            "accuracy": self.accuracy,
+            "max_bins": self.max_bins,
+            "offset": offset,
+            "counts": counts,
+            "zero_count": self.zero_count,
+            "n": self.n,
+            "min": self.min if self.n else None,
+            "max": self.max if self.n else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "QuantileSketch":
+        sketch = cls(float(data["accuracy"]), int(data["max_bins"]))
+        for index, count in enumerate(data["counts"], start=int(data["offset"])):
+            if count:
+                sketch.buckets[index] = int(count)
+        sketch.zero_count = int(data["zero_count"])
+        sketch.n = int(data["n"])
+        if sketch.n:
+            sketch.min = float(data["min"])
+            sketch.max = float(data["max"])
+        return sketch
+
+
+@dataclass
+class GroupSummary:
+    bucket_counts: array = field(default_factory=lambda: array("q", bytes(8 * len(BUCKET_KEYS))))
+    errors: int = 0
+    observed_delta: Histogram = field(default_factory=lambda: Histogram(*OBSERVED_DELTA_RANGE))
+    chance_under_null: Histogram = field(default_factory=lambda: Histogram(*CHANCE_RANGE))
+    delta_true_sd: QuantileSketch = field(default_factory=QuantileSketch)
+
+    @property
+    def n(self) -> int:
+        return sum(self.bucket_counts) + self.errors
+
+    def merge(self, other: "GroupSummary") -> "GroupSummary":
+        for code, count in enumerate(other.bucket_counts):
+            self.bucket_counts[code] += count
+        self.errors += other.errors
+        self.observed_delta.merge(other.observed_delta)
+        self.chance_under_null.merge(other.chance_under_null)
+        self.delta_true_sd.merge(other.delta_true_sd)
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "buckets": dict(zip(BUCKET_KEYS, self.bucket_counts, strict=True)),
+            "errors": self.errors,
+            "observed_delta": self.observed_delta.to_dict(),
+            "chance_under_null": self.chance_under_null.to_dict(),
+            "delta_true_sd": self.delta_true_sd.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "GroupSummary":
+        return cls(
+            bucket_counts=array("q", (int(data["buckets"].get(key, 0)) for key in BUCKET_KEYS)),
+            errors=int(data["errors"]),
+            observed_delta=Histogram.from_dict(data["observed_delta"]),
+            chance_under_null=Histogram.from_dict(data["chance_under_null"]),
+            delta_true_sd=QuantileSketch.from_dict(data["delta_true_sd"]),
+        )
+
+
+@dataclass
+class CohortSummary:
+    groups: dict[GroupKey, GroupSummary] = field(default_factory=dict)
+
+    @property
+    def n(self) -> int:
+        return sum(group.n for group in self.groups.values())
+
+    def group(self, key: GroupKey) -> GroupSummary:
+        summary = self.groups.get(key)
+        if summary is None:
+            summary = self.groups[key] = GroupSummary()
+        return summary
+
+    def add_chunk(
+        self,
+        payloads: Sequence[Mapping[str, Any]],
+        results: Mapping[str, Sequence[Any]],
+    ) -> "CohortSummary":
+        # Rows are grouped first so each reducer consumes whole column slices.
+        rows_by_key: dict[GroupKey, list[int]] = {}
+        for index, payload in enumerate(payloads):
+            key = (
+                str(payload.get("context")),
+                str(payload.get("method1")),
+                str(payload.get("method2")),
+            )
+            rows_by_key.setdefault(key, []).append(index)
+        observed = results["observed_delta"]
+        chance = results["chance_under_null"]
+        sd = results["delta_true_sd"]
+        bucket = results["bucket"]
+        for key, rows in rows_by_key.items():
+            summary = self.group(key)
+            scored = []
+            for index in rows:
+                code = bucket[index]
+                if code == ERROR_BUCKET:
+                    summary.errors += 1
+                else:
+                    summary.bucket_counts[code] += 1
+                    scored.append(index)
+            summary.observed_delta.add_many([observed[index] for index in scored])
+            summary.chance_under_null.add_many([chance[index] for index in scored])
+            summary.delta_true_sd.add_many([sd[index] for index in scored])
+        return self
+
+    def merge(self, other: "CohortSummary") -> "CohortSummary":
+        for key, summary in other.groups.items():
+            self.group(key).merge(summary)
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": SUMMARY_VERSION,
+            "bucket_keys": list(BUCKET_KEYS),
+            "groups": [
+                {"context": context, "method1": method1, "method2": method2, **summary.to_dict()}
+                for (context, method1, method2), summary in sorted(self.groups.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CohortSummary":
+        if data.get("version") != SUMMARY_VERSION:
+            raise ValueError("Unsupported cohort summary version.")
+        if list(data.get("bucket_keys", [])) != list(BUCKET_KEYS):
+            raise ValueError("Cohort summary bucket keys do not match this version.")
+        summary = cls()
+        for entry in data["groups"]:
+            key = (entry["context"], entry["method1"], entry["method2"])
+            summary.groups[key] = GroupSummary.from_dict(entry)
+        return summary
+
+
+def merge_summaries(*parts: CohortSummary) -> CohortSummary:
+    merged = CohortSummary()
+    for part in parts:
+        merged.merge(part)
+    return merged
+
+
+def summarize_payloads(
+    payloads: Iterable[Mapping[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    summary: CohortSummary | None = None,
+) -> CohortSummary:
+    summary = CohortSummary() if summary is None else summary
+    for chunk in chunked(payloads, chunk_size):
+        summary.add_chunk(chunk, score_payloads(chunk))
+    return summary
+
+
+def summarize_file(
+    path: str | Path,
+    params: dict[str, Any],
+    base: Mapping[str, Any] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CohortSummary:
+    import csv
+
+    from .runner import row_payload
+
+    base_payload = {"ci_level": 0.95, "threshold": 2, "na_ref": 140, **(base or {})}
+    base_payload["params"] = params
+    with Path(path).open(newline="") as handle:
+        payloads = (row_payload(row, base_payload) for row in csv.DictReader(handle))
+        return summarize_payloads(payloads, chunk_size)
+
+
+def summarize_files(
+    paths: Iterable[str | Path],
+    params: dict[str, Any],
+    base: Mapping[str, Any] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+) -> CohortSummary:
+    paths = [Path(path) for path in paths]
+    if workers <= 1 or len(paths) <= 1:
+        return merge_summaries(*(summarize_file(path, params, base, chunk_size) for path in paths))
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    task = partial(summarize_file, params=params, base=base, chunk_size=chunk_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return merge_summaries(*executor.map(task, paths))
@@ -0,0 +1,226 @@
+import argparse
+import csv
+import json
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .defaults import validate_defaults
+from .model import Z_95, sigma_to_loa_half_pair
+
+PairKey = tuple[str, str]
+PAIR_COLUMNS = ("context", "method", "y1", "y2")
+SKIPPED_ZERO_SPREAD = "replicate spread rounds to a zero LoA half-width"
+
+
+@dataclass
+class ReplicateMoments:
+    n: int = 0
+    mean_diff: float = 0.0
+    m2_diff: float = 0.0
+    sum_sq_diff: float = 0.0
+    sum_sq_level: float = 0.0
+    min_level: float = math.inf
+    max_level: float = -math.inf
+
+    def add(self, y1: float, y2: float) -> None:
+        diff = y2 - y1
+        level = (y1 + y2) / 2
+        self.n += 1
+        delta = diff - self.mean_diff
+        self.mean_diff += delta / self.n
+        self.m2_diff += delta * (diff - self.mean_diff)
+        self.sum_sq_diff += diff * diff
+        self.sum_sq_level += level * level
+        if level < self.min_level:
+            self.min_level = level
+        if level > self.max_level:
+            self.max_level = level
+
+    def merge(self, other: "ReplicateMoments") -> "ReplicateMoments":
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        n = self.n + other.n
+        delta = other.mean_diff - self.mean_diff
+        self.mean_diff += delta * other.n / n
+        self.m2_diff += other.m2_diff + delta * delta * self.n * other.n / n
+        self.n = n
+        self.sum_sq_diff += other.sum_sq_diff
+        self.sum_sq_level += other.sum_sq_level
+        self.min_level = min(self.min_level, other.min_level)
+        self.max_level = max(self.max_level, other.max_level)
+        return self
+
+    @property
+    def sd_diff(self) -> float:
+        if self.n < 2:
+            raise ValueError("At least two replicate pairs are required.")
+        return math.sqrt(self.m2_diff / (self.n - 1))
+
+    @property
+    def bias(self) -> float:
+        return self.mean_diff
+
+    @property
+    def loa_half_pair(self) -> float:
+        return Z_95 * self.sd_diff
+
+    @property
+    def cv(self) -> float:
+        if self.sum_sq_level <= 0:
+            raise ValueError("Replicate levels must be positive to fit a CV.")
+        # Under constant CV, Var(y2 - y1) = 2 * (cv * level)^2.
+        return math.sqrt(self.sum_sq_diff / (2 * self.sum_sq_level))
+
+
+def merge_moments(
+    *parts: Mapping[PairKey, ReplicateMoments],
+) -> dict[PairKey, ReplicateMoments]:
+    merged: dict[PairKey, ReplicateMoments] = {}
+    for part in parts:
+        for key, moments in part.items():
+            merged.setdefault(key, ReplicateMoments()).merge(moments)
+    return merged
+
+
+def accumulate_pairs(
+    rows: Iterable[Sequence[Any]],
+    moments: dict[PairKey, ReplicateMoments] | None = None,
+) -> dict[PairKey, ReplicateMoments]:
+    moments = {} if moments is None else moments
+    for context, method, y1, y2 in rows:
+        try:
+            value1 = float(y1)
+            value2 = float(y2)
+        except (TypeError, ValueError):
+            continue
+        if not (math.isfinite(value1) and math.isfinite(value2)):
+            continue
+        key = (context, method)
+        accumulator = moments.get(key)
+        if accumulator is None:
+            accumulator = moments[key] = ReplicateMoments()
+        accumulator.add(value1, value2)
+    return moments
+
+
+def _read_pairs(path: Path) -> Iterable[tuple[str, str, str, str]]:
+    with path.open(newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            indexes = [header.index(column) for column in PAIR_COLUMNS]
+        except ValueError as exc:
+            raise ValueError(f"{path} must have columns {', '.join(PAIR_COLUMNS)}.") from exc
+        for row in reader:
+            if row:
+                yield tuple(row[index] for index in indexes)
+
+
+def accumulate_file(path: str | Path) -> dict[PairKey, ReplicateMoments]:
+    return accumulate_pairs(_read_pairs(Path(path)))
+
+
+def accumulate_files(
+    paths: Iterable[str | Path],
+    workers: int = 1,
+) -> dict[PairKey, ReplicateMoments]:
+    paths = [Path(path) for path in paths]
+    if workers <= 1 or len(paths) <= 1:
+        return merge_moments(*(accumulate_file(path) for path in paths))
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return merge_moments(*executor.map(accumulate_file, paths))
+
+
+def build_defaults(
+    moments: Mapping[PairKey, ReplicateMoments],
+    fit_cv: bool = False,
+    na_ref: float = 140.0,
+    min_pairs: int = 2,
+) -> dict[str, Any]:
+    if na_ref <= 0:
+        raise ValueError("Reference Na must be positive.")
+    defaults: dict[str, dict[str, Any]] = {}
+    skipped: dict[str, dict[str, Any]] = {}
+    for (context, method), accumulator in sorted(moments.items()):
+        if accumulator.n < max(min_pairs, 2):
+            continue
+        estimate: dict[str, Any] = {
+            "n_pairs": accumulator.n,
+            "bias": accumulator.bias,
+            "sd_diff": accumulator.sd_diff,
+            "level_min": accumulator.min_level,
+            "level_max": accumulator.max_level,
+        }
+        if fit_cv:
+            estimate["cv"] = accumulator.cv
+            estimate["na_ref"] = na_ref
+            sigma = accumulator.cv * na_ref
+            loa_half = sigma_to_loa_half_pair(sigma) if sigma > 0 else 0.0
+        else:
+            loa_half = accumulator.loa_half_pair
+        loa_half = round(loa_half, 3)
+        if not loa_half > 0:
+            # Identical replicates (or a spread below the 0.001 rounding) give no usable σ; the
+            # combination is reported instead of failing validation for every other method.
+            estimate["skipped"] = SKIPPED_ZERO_SPREAD
+            skipped.setdefault(context, {})[method] = estimate
+            continue
+        defaults.setdefault(context, {})[method] = {
+            "loa_half_pair": loa_half,
+            "estimate": estimate,
+        }
+    data = {"version": 1, "units": "mmol/L", "defaults": defaults}
+    if skipped:
+        data["skipped"] = skipped
+    validate_defaults(data)
+    return data
+
+
+def write_defaults(data: dict[str, Any], path: str | Path) -> None:
+    validate_defaults(data)
+    Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Estimate variability defaults from replicate-pair CSV files.",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="CSV files with context,method,y1,y2")
+    parser.add_argument("--output", type=Path, required=True, help="Defaults JSON to write")
+    parser.add_argument("--workers", type=int, default=1, help="Files processed in parallel")
+    parser.add_argument("--fit-cv", action="store_true", help="Fit a constant-CV sigma")
+    parser.add_argument("--na-ref", type=float, default=140.0, help="Reference Na for CV fits")
+    parser.add_argument("--min-pairs", type=int, default=2, help="Skip sparser combinations")
+    args = parser.parse_args(argv)
+
+    moments = accumulate_files(args.paths, workers=args.workers)
+    data = build_defaults(
+        moments,
+        fit_cv=args.fit_cv,
+        na_ref=args.na_ref,
+        min_pairs=args.min_pairs,
+    )
+    write_defaults(data, args.output)
+    for context, methods in data["defaults"].items():
+        for method, entry in methods.items():
+            print(
+                f"{context}/{method}: n={entry['estimate']['n_pairs']} "
+                f"loa_half_pair={entry['loa_half_pair']}"
+            )
+    for context, methods in data.get("skipped", {}).items():
+        for method, estimate in methods.items():
+            print(f"{context}/{method}: n={estimate['n_pairs']} skipped ({estimate['skipped']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import json
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .batch import DEFAULT_CHUNK_SIZE, chunked, score_payloads
+from .calculator import build_response, compute_from_json, evaluate_payload
+from .defaults import load_defaults
+
+DEFAULT_TOP = 5
+SAMPLE_PAYLOAD = {
+    "y1": 130,
+    "y2": 133,
+    "method1": "central_lab_indirect_ISE",
+    "method2": "istat_direct_ISE",
+    "context": "sequential_draws",
+    "ci_level": 0.95,
+    "threshold": 2,
+    "scale_with_na": False,
+    "na_ref": 140,
+}
+
+Stage = tuple[str, Callable[[Any], Any]]
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    location: str
+    size: int
+    count: int
+
+
+@dataclass(frozen=True)
+class StageAllocations:
+    stage: str
+    # Bytes above the traced total at stage start: the high-water mark, and what the stage
+    # left allocated (its output plus anything cached). peak - net is a lower bound on the
+    # short-lived garbage it created.
+    peak: int
+    net: int
+    top: tuple[AllocationSite, ...]
+
+
+def _sites(before: Any, after: Any, top: int) -> tuple[AllocationSite, ...]:
+    import tracemalloc
+
+    ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    before = before.filter_traces(ignore)
+    after = after.filter_traces(ignore)
+    sites = []
+    for stat in after.compare_to(before, "lineno"):
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append(
+            AllocationSite(f"{frame.filename}:{frame.lineno}", stat.size_diff, stat.count_diff)
+        )
+        if len(sites) == top:
+            break
+    return tuple(sites)
+
+
+def profile_stages(
+    stages: Sequence[Stage],
+    value: Any,
+    top: int = DEFAULT_TOP,
+) -> tuple[Any, list[StageAllocations]]:
+    # Runs value through each stage in turn under tracemalloc. Tracing is started and stopped
+    # here unless the caller already has it running.
+    import tracemalloc
+
+    owns_tracing = not tracemalloc.is_tracing()
+    if owns_tracing:
+        tracemalloc.start()
+    profile = []
+    try:
+        for name, stage in stages:
+            before = tracemalloc.take_snapshot() if top else None
+            tracemalloc.reset_peak()
+            start, _peak = tracemalloc.get_traced_memory()
+            # The input stays referenced until the stage is measured, so net is the output
+            # the stage built rather than output minus whatever it let go of.
+            result = stage(value)
+            current, peak = tracemalloc.get_traced_memory()
+            sites = _sites(before, tracemalloc.take_snapshot(), top) if top else ()
+            del before
+            profile.append(StageAllocations(name, peak - start, current - start, sites))
+            value = result
+    finally:
+        if owns_tracing:
+            tracemalloc.stop()
+    return value, profile
+
+
+def request_stages(payload: Mapping[str, Any] | str) -> tuple[Any, list[Stage]]:
+    # compute_from_json split at its natural boundaries; a mapping payload skips parse and
+    # serialize, like compute_payload.
+    stages: list[Stage] = []
+    if isinstance(payload, str):
+        stages.append(("parse", json.loads))
+    stages.append(("evaluate", lambda parsed: (parsed, evaluate_payload(parsed))))
+    stages.append(("respond", lambda pair: build_response(*pair)))
+    if isinstance(payload, str):
+        stages.append(("serialize", json.dumps))
+    return payload, stages
+
+
+def profile_request(
+    payload: Mapping[str, Any] | str,
+    top: int = DEFAULT_TOP,
+) -> tuple[Any, list[StageAllocations]]:
+    value, stages = request_stages(payload)
+    return profile_stages(stages, value, top)
+
+
+def profile_batch(
+    payloads: Iterable[Mapping[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    top: int = DEFAULT_TOP,
+) -> list[StageAllocations]:
+    profile = []
+    for index, chunk in enumerate(chunked(payloads, chunk_size)):
+        stage = (f"chunk {index} ({len(chunk)} rows)", score_payloads)
+        _results, stats = profile_stages([stage], chunk, top)
+        profile.extend(stats)
+    return profile
+
+
+def format_profile(profile: Sequence[StageAllocations]) -> str:
+    lines = [f"{'stage':<24}{'peak KiB':>12}{'net KiB':>12}"]
+    for stats in profile:
+        lines.append(f"{stats.stage:<24}{stats.peak / 1024:>12.1f}{stats.net / 1024:>12.1f}")
+        for site in stats.top:
+            lines.append(
+                f"    {site.size / 1024:>8.1f} KiB {site.count:>6} blocks  {site.location}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Report tracemalloc peak and net allocations per calculator stage.",
+    )
+    parser.add_argument("payload", nargs="?", type=Path, help="Payload JSON (default: a sample)")
+    parser.add_argument("--defaults", type=Path, help="Defaults JSON when the payload has none")
+    parser.add_argument("--batch", type=int, metavar="ROWS", help="Profile batch chunks instead")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Allocation sites per stage")
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="Skip the untraced warm-up call, so lazy imports and caches are counted",
+    )
+    args = parser.parse_args(argv)
+
+    payload = json.loads(args.payload.read_text()) if args.payload else dict(SAMPLE_PAYLOAD)
+    payload.setdefault("params", load_defaults(args.defaults))
+    if args.batch:
+        payloads = [payload] * args.batch
+        if not args.cold:
+            score_payloads(payloads[:1])
+        print(format_profile(profile_batch(payloads, args.chunk_size, args.top)))
+        return
+    payload_json = json.dumps(payload)
+    if not args.cold:
+        compute_from_json(payload_json)
+    _response, profile = profile_request(payload_json, args.top)
+    print(format_profile(profile))
+
+
+if __name__ == "__main__":
+    main()
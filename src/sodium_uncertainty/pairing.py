@@ -0,0 +1,259 @@
+import argparse
+import csv
+import math
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .batch import DEFAULT_CHUNK_SIZE, score_columns
+
+PAIRING_MODES = ("consecutive", "window")
+RESULT_COLUMNS = ("patient_id", "time", "value", "method")
+PAIR_CSV_COLUMNS = (
+    "patient_id",
+    "context",
+    "y1",
+    "y2",
+    "method1",
+    "method2",
+    "elapsed_hours",
+    "delta_per_hour",
+)
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+UNSORTED_MESSAGE = "Results must be sorted by patient and time."
+
+# (patient_id, time in hours, sodium, method)
+Result = tuple[str, float, float, str]
+
+
+def parse_time(value: Any) -> float:
+    # Numbers are hours on any fixed origin; strings may also be ISO 8601 timestamps.
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    if not isinstance(value, str):
+        raise ValueError(f"Cannot parse time {value!r}.")
+    stamp = datetime.fromisoformat(value.strip())
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=UTC)
+    return (stamp - _EPOCH).total_seconds() / 3600.0
+
+
+def parse_results(rows: Iterable[Sequence[Any]]) -> Iterator[Result]:
+    for patient, time, value, method in rows:
+        try:
+            hours = parse_time(time)
+            sodium = float(value)
+        except (TypeError, ValueError):
+            continue
+        if math.isfinite(hours) and math.isfinite(sodium):
+            yield str(patient), hours, sodium, str(method)
+
+
+@dataclass
+class PairColumns:
+    patient_id: list[str] = field(default_factory=list)
+    method1: list[str] = field(default_factory=list)
+    method2: list[str] = field(default_factory=list)
+    t1: array = field(default_factory=lambda: array("d"))
+    t2: array = field(default_factory=lambda: array("d"))
+    y1: array = field(default_factory=lambda: array("d"))
+    y2: array = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.y1)
+
+    @property
+    def elapsed_hours(self) -> array:
+        return array("d", (end - start for start, end in zip(self.t1, self.t2, strict=True)))
+
+    @property
+    def delta_per_hour(self) -> array:
+        rates = array("d")
+        for start, end, y1, y2 in zip(self.t1, self.t2, self.y1, self.y2, strict=True):
+            rates.append((y2 - y1) / (end - start) if end > start else math.nan)
+        return rates
+
+    def columns(self) -> dict[str, Any]:
+        return {"y1": self.y1, "y2": self.y2, "method1": self.method1, "method2": self.method2}
+
+
+def _check_window(mode: str, min_hours: float, max_hours: float) -> None:
+    if mode not in PAIRING_MODES:
+        raise ValueError(f"Pairing mode must be one of: {', '.join(PAIRING_MODES)}.")
+    if min_hours < 0 or max_hours < min_hours:
+        raise ValueError("Pairing window needs 0 <= min_hours <= max_hours.")
+
+
+def _patient_groups(results: Iterable[Result], presorted: bool) -> Iterator[list[Result]]:
+    ordered = results if presorted else sorted(results, key=lambda result: result[:2])
+    # Presorted input is trusted only as far as it can be checked in one pass: times must not
+    # go backwards within a patient and a patient must not reappear after its group closed.
+    closed: set[Any] = set()
+    group: list[Result] = []
+    for result in ordered:
+        if group and result[0] != group[0][0]:
+            closed.add(group[0][0])
+            yield group
+            group = []
+        elif group and result[1] < group[-1][1]:
+            raise ValueError(UNSORTED_MESSAGE)
+        if not group and result[0] in closed:
+            raise ValueError(UNSORTED_MESSAGE)
+        group.append(result)
+    if group:
+        yield group
+
+
+def _pair_indexes(
+    times: Sequence[float], mode: str, min_hours: float, max_hours: float
+) -> Iterator[tuple[int, int]]:
+    n = len(times)
+    if mode == "consecutive":
+        for index in range(n - 1):
+            if min_hours <= times[index + 1] - times[index] <= max_hours:
+                yield index, index + 1
+        return
+    # Both window edges only move forward as the first draw advances.
+    low = high = 0
+    for index in range(n):
+        start = times[index]
+        low = max(low, index + 1)
+        while low < n and times[low] - start < min_hours:
+            low += 1
+        high = max(high, low)
+        while high < n and times[high] - start <= max_hours:
+            high += 1
+        for other in range(low, high):
+            yield index, other
+
+
+def iter_pair_chunks(
+    results: Iterable[Result],
+    mode: str = "consecutive",
+    min_hours: float = 0.0,
+    max_hours: float = 24.0,
+    method1: str | None = None,
+    method2: str | None = None,
+    presorted: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[PairColumns]:
+    _check_window(mode, min_hours, max_hours)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    pairs = PairColumns()
+    for group in _patient_groups(results, presorted):
+        times = [result[1] for result in group]
+        for first, second in _pair_indexes(times, mode, min_hours, max_hours):
+            patient, t1, y1, m1 = group[first]
+            _patient, t2, y2, m2 = group[second]
+            if (method1 is not None and m1 != method1) or (method2 is not None and m2 != method2):
+                continue
+            pairs.patient_id.append(patient)
+            pairs.method1.append(m1)
+            pairs.method2.append(m2)
+            pairs.t1.append(t1)
+            pairs.t2.append(t2)
+            pairs.y1.append(y1)
+            pairs.y2.append(y2)
+            if len(pairs) == chunk_size:
+                yield pairs
+                pairs = PairColumns()
+    if len(pairs):
+        yield pairs
+
+
+def match_pairs(results: Iterable[Result], **options: Any) -> PairColumns:
+    matched = PairColumns()
+    for chunk in iter_pair_chunks(results, **options):
+        for name in ("patient_id", "method1", "method2", "t1", "t2", "y1", "y2"):
+            getattr(matched, name).extend(getattr(chunk, name))
+    return matched
+
+
+def score_pairs(
+    pairs: PairColumns,
+    params: dict[str, Any],
+    base: dict[str, Any] | None = None,
+    first_row_id: int = 0,
+) -> dict[str, array]:
+    base_payload = {
+        "ci_level": 0.95,
+        "threshold": 2,
+        "na_ref": 140,
+        **(base or {}),
+        "context": "sequential_draws",
+        "params": params,
+    }
+    return score_columns(pairs.columns(), base_payload, first_row_id=first_row_id)
+
+
+def _read_results(path: Path) -> Iterator[tuple[str, str, str, str]]:
+    with path.open(newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            indexes = [header.index(column) for column in RESULT_COLUMNS]
+        except ValueError as exc:
+            raise ValueError(f"{path} must have columns {', '.join(RESULT_COLUMNS)}.") from exc
+        for row in reader:
+            if row:
+                yield tuple(row[index] for index in indexes)
+
+
+def write_pairs(chunks: Iterable[PairColumns], path: str | Path) -> int:
+    written = 0
+    with Path(path).open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(PAIR_CSV_COLUMNS)
+        for chunk in chunks:
+            rows = zip(
+                chunk.patient_id,
+                chunk.y1,
+                chunk.y2,
+                chunk.method1,
+                chunk.method2,
+                chunk.elapsed_hours,
+                chunk.delta_per_hour,
+                strict=True,
+            )
+            for patient, y1, y2, m1, m2, elapsed, rate in rows:
+                writer.writerow((patient, "sequential_draws", y1, y2, m1, m2, elapsed, rate))
+            written += len(chunk)
+    return written
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Build sequential-draw pairs from per-patient sodium results.",
+    )
+    parser.add_argument("input", type=Path, help="CSV with patient_id,time,value,method")
+    parser.add_argument("output", type=Path, help="Pairs CSV, ready for the batch runner")
+    parser.add_argument("--mode", choices=PAIRING_MODES, default="consecutive")
+    parser.add_argument("--min-hours", type=float, default=0.0, help="Shortest gap to pair")
+    parser.add_argument("--max-hours", type=float, default=24.0, help="Longest gap to pair")
+    parser.add_argument("--method1", help="Only pair first draws from this method")
+    parser.add_argument("--method2", help="Only pair second draws from this method")
+    parser.add_argument("--presorted", action="store_true", help="Input is sorted by patient, time")
+    args = parser.parse_args(argv)
+
+    chunks = iter_pair_chunks(
+        parse_results(_read_results(args.input)),
+        mode=args.mode,
+        min_hours=args.min_hours,
+        max_hours=args.max_hours,
+        method1=args.method1,
+        method2=args.method2,
+        presorted=args.presorted,
+    )
+    print(f"Wrote {write_pairs(chunks, args.output)} pairs to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import json
+import math
+from array import array
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from .batch import BUCKET_CODES, ERROR_BUCKET, RESULT_COLUMNS
+from .calculator import (
+    CONTEXTS,
+    ERROR_ENGINES,
+    MIN_RESOLUTION,
+    RESOLUTION_BOUNDS_MESSAGE,
+    RESOLUTION_ENGINE_MESSAGE,
+)
+from .defaults import precision_table_for, resolve_sigma, validate_defaults
+from .model import (
+    QUALITATIVE_BUCKETS,
+    chance_probability_under_null,
+    qualitative_bucket,
+    rounded_chance_under_null,
+    two_sided_z,
+)
+
+PANEL_COLUMNS: tuple[tuple[str, str], ...] = (*RESULT_COLUMNS, ("warning_mask", "b"))
+VALUE1_OUT_OF_RANGE = 1 << 0
+VALUE2_OUT_OF_RANGE = 1 << 1
+
+
+@dataclass(frozen=True)
+class Analyte:
+    key: str
+    label: str
+    units: str
+    low: float
+    high: float
+    reference: float
+    params: Mapping[str, Any]
+    provenance: str = ""
+
+
+def _registry_path() -> Path:
+    return Path(__file__).resolve().parents[2] / "data" / "analyte_registry.json"
+
+
+def _analyte(key: str, entry: Mapping[str, Any], root: Path) -> Analyte:
+    defaults = entry.get("defaults")
+    if isinstance(defaults, str):
+        params = json.loads((root / defaults).read_text())
+    elif isinstance(defaults, Mapping):
+        params = {"version": 1, "units": entry.get("units"), "defaults": defaults}
+    else:
+        raise ValueError(f"Analyte {key} needs defaults or a defaults file.")
+    validate_defaults(params)
+    try:
+        low, high = (float(bound) for bound in entry["physiologic_range"])
+        reference = float(entry["reference"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"Analyte {key} needs a physiologic_range pair and a reference.") from exc
+    if not low < high or not reference > 0:
+        raise ValueError(f"Analyte {key} needs low < high and a positive reference.")
+    return Analyte(
+        key=key,
+        label=str(entry.get("label", key)),
+        units=str(entry.get("units", "")),
+        low=low,
+        high=high,
+        reference=reference,
+        params=params,
+        provenance=str(entry.get("provenance", "")),
+    )
+
+
+def load_analytes(path: str | Path | None = None) -> dict[str, Analyte]:
+    target = Path(path) if path else _registry_path()
+    data = json.loads(target.read_text())
+    analytes = data.get("analytes")
+    if not isinstance(analytes, Mapping) or not analytes:
+        raise ValueError("Analyte registry must include an analytes mapping.")
+    return {key: _analyte(key, entry, target.parent) for key, entry in analytes.items()}
+
+
+@lru_cache(maxsize=1)
+def default_analytes() -> dict[str, Analyte]:
+    return load_analytes()
+
+
+def _sigma_source(analyte: Analyte, context: str, method: Any) -> Any:
+    # A float sigma, a PrecisionTable evaluated per value, or None when unavailable.
+    try:
+        table = precision_table_for(analyte.params, context, method)
+        if table is not None:
+            return table
+        return resolve_sigma(analyte.params, context, method)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _parse(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _column(columns: Mapping[str, Any], name: str, n_rows: int) -> Sequence[Any]:
+    value = columns.get(name)
+    if isinstance(value, str | bytes) or not isinstance(value, Sequence | array):
+        return [value] * n_rows
+    return value
+
+
+def _append_error(out: Mapping[str, array]) -> None:
+    for name, typecode in PANEL_COLUMNS:
+        if typecode == "d":
+            out[name].append(math.nan)
+    out["bucket"].append(ERROR_BUCKET)
+
+
+def _panel_resolution(resolution: float | Mapping[str, Any] | None, key: str) -> float | None:
+    value = resolution.get(key) if isinstance(resolution, Mapping) else resolution
+    if value is None:
+        return None
+    value = float(value)
+    if not value > 0:
+        raise ValueError("Reporting resolution must be positive.")
+    if not (math.isfinite(value) and value >= MIN_RESOLUTION):
+        raise ValueError(RESOLUTION_BOUNDS_MESSAGE)
+    return value
+
+
+def _difference_noise(
+    analyte: Analyte, context: str, method1: Any, method2: Any, sigma1: float, sigma2: float
+) -> Any:
+    from .convolution import difference_distribution, error_model_for
+
+    return difference_distribution(
+        error_model_for(analyte.params, context, method1),
+        sigma1,
+        error_model_for(analyte.params, context, method2),
+        sigma2,
+    )
+
+
+def score_panel(
+    columns: Mapping[str, Any],
+    analytes: Sequence[str] | None = None,
+    context: str = "sequential_draws",
+    ci_level: float = 0.95,
+    scale_with_level: bool = False,
+    registry: Mapping[str, Analyte] | None = None,
+    resolution: float | Mapping[str, Any] | None = None,
+    error_engine: str = "normal",
+) -> dict[str, dict[str, array]]:
+    # columns holds method1/method2 once per draw pair plus `<analyte>_1`/`<analyte>_2`
+    # values. Methods are coded and the CI z computed once for the whole panel, σ sources once
+    # per analyte and method, and σΔ and convolved noise once per method pair when σ is
+    # constant. The rest is a plain per-row loop that reproduces
+    # calculator.evaluate_payload, using the model's chance and bucket functions.
+    # scale_with_level is constant-CV scaling against each analyte's reference level.
+    # resolution is one reporting step for every analyte or a mapping of analyte to step.
+    registry = default_analytes() if registry is None else registry
+    analytes = [key for key in registry if f"{key}_1" in columns] if analytes is None else analytes
+    if context not in CONTEXTS:
+        raise ValueError("Invalid context selection.")
+    z = two_sided_z(ci_level)
+    if error_engine not in ERROR_ENGINES:
+        raise ValueError("Invalid error engine selection.")
+    convolution = error_engine == "convolution"
+    lengths = {
+        len(value)
+        for value in columns.values()
+        if isinstance(value, Sequence | array) and not isinstance(value, str | bytes)
+    }
+    if len(lengths) > 1:
+        raise ValueError("All column inputs must have the same length.")
+    n_rows = lengths.pop() if lengths else 1
+
+    method_codes: dict[Any, int] = {}
+    method_names: list[Any] = []
+
+    def code_for(method: Any) -> int:
+        code = method_codes.get(method)
+        if code is None:
+            code = method_codes[method] = len(method_names)
+            method_names.append(method)
+        return code
+
+    codes1 = [code_for(method) for method in _column(columns, "method1", n_rows)]
+    codes2 = [code_for(method) for method in _column(columns, "method2", n_rows)]
+    sequential = context == "sequential_draws"
+    bucket_codes = {key: BUCKET_CODES[key] for _threshold, key, _label in QUALITATIVE_BUCKETS}
+
+    results: dict[str, dict[str, array]] = {}
+    for key in analytes:
+        try:
+            analyte = registry[key]
+        except KeyError:
+            raise ValueError(f"Unknown analyte {key}.") from None
+        step = _panel_resolution(resolution, key)
+        if step is not None and convolution:
+            raise ValueError(RESOLUTION_ENGINE_MESSAGE)
+        sources = [_sigma_source(analyte, context, method) for method in method_names]
+        values1 = [_parse(value) for value in _column(columns, f"{key}_1", n_rows)]
+        values2 = [_parse(value) for value in _column(columns, f"{key}_2", n_rows)]
+        out = {name: array(typecode) for name, typecode in PANEL_COLUMNS}
+        row_id = out["row_id"].append
+        observed = out["observed_delta"].append
+        mean_out = out["delta_true_mean"].append
+        sd_out = out["delta_true_sd"].append
+        low_out = out["delta_true_ci_low"].append
+        high_out = out["delta_true_ci_high"].append
+        chance_out = out["chance_under_null"].append
+        bucket_out = out["bucket"].append
+        warning_out = out["warning_mask"].append
+        low, high, reference = analyte.low, analyte.high, analyte.reference
+        terms: dict[tuple[int, int], tuple[float, Any]] = {}
+
+        rows = zip(values1, values2, codes1, codes2, strict=True)
+        for index, (y1, y2, code1, code2) in enumerate(rows):
+            row_id(index)
+            warning = 0
+            if not low <= y1 <= high and y1 == y1:
+                warning |= VALUE1_OUT_OF_RANGE
+            if not low <= y2 <= high and y2 == y2:
+                warning |= VALUE2_OUT_OF_RANGE
+            warning_out(warning)
+            source1, source2 = sources[code1], sources[code2]
+            if y1 != y1 or y2 != y2 or source1 is None or source2 is None:
+                _append_error(out)
+                continue
+            if isinstance(source1, float):
+                sigma1 = source1 * y1 / reference if scale_with_level else source1
+            else:
+                sigma1 = source1.sigma_at(y1)
+            if isinstance(source2, float):
+                sigma2 = source2 * y2 / reference if scale_with_level else source2
+            else:
+                sigma2 = source2.sigma_at(y2)
+            if not (sigma1 > 0 and sigma2 > 0):
+                _append_error(out)
+                continue
+            # σΔ and the convolved noise depend only on the method pair and the two σs. With
+            # constant σs they are computed once per pair; profiled or scaled σs vary per row.
+            constant = not scale_with_level and isinstance(source1, float)
+            constant = constant and isinstance(source2, float)
+            term = terms.get((code1, code2)) if constant else None
+            if term is None:
+                try:
+                    noise = (
+                        _difference_noise(
+                            analyte,
+                            context,
+                            method_names[code1],
+                            method_names[code2],
+                            sigma1,
+                            sigma2,
+                        )
+                        if convolution
+                        else None
+                    )
+                except Exception:  # noqa: BLE001
+                    noise = False
+                term = (math.sqrt(sigma1 * sigma1 + sigma2 * sigma2), noise)
+                if constant:
+                    terms[(code1, code2)] = term
+            sigma_delta, noise = term
+            if noise is False:
+                _append_error(out)
+                continue
+            delta = y2 - y1
+            if noise is not None:
+                chance = noise.prob_abs_ge(delta)
+            elif step is None:
+                chance = chance_probability_under_null(delta, sigma_delta)
+            else:
+                chance = rounded_chance_under_null(delta, sigma1, sigma2, step)
+            observed(delta)
+            if not sequential:
+                # posterior_same_sample: the true difference is exactly zero.
+                for append in (mean_out, sd_out, low_out, high_out):
+                    append(0.0)
+            elif noise is not None:
+                summary = noise.reflected(delta).summary(ci_level)
+                mean_out(summary.mean)
+                sd_out(summary.sd)
+                low_out(summary.ci_low)
+                high_out(summary.ci_high)
+            else:
+                # posterior_sequential_draws with the panel-wide z hoisted out of the loop.
+                mean_out(delta)
+                sd_out(sigma_delta)
+                low_out(delta - z * sigma_delta)
+                high_out(delta + z * sigma_delta)
+            chance_out(chance)
+            bucket_out(bucket_codes[qualitative_bucket(chance)[0]])
+        results[key] = out
+    return results
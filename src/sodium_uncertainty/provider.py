@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .calculator import compute_payload
+from .defaults import _default_path, params_hash, validate_defaults
+
+DEFAULT_POLL_INTERVAL = 2.0
+VERSION_LENGTH = 12
+
+
+class FrozenDict(dict):
+    # A dict that refuses mutation; still a dict, so json.dumps and isinstance checks work.
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("Parameter snapshots are read-only.")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self) -> tuple[type, tuple[dict[str, Any]]]:
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class ParameterSnapshot:
+    params: FrozenDict
+    version: str
+    generation: int
+    source: str
+    loaded_at: float
+
+
+def _file_identity(path: Path) -> tuple[int, int, int]:
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class ParameterProvider:
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        if poll_interval <= 0:
+            raise ValueError("Poll interval must be positive.")
+        self.path = Path(path) if path else _default_path()
+        self.poll_interval = poll_interval
+        self.last_error: str | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._identity = _file_identity(self.path)
+        self._snapshot = self._load(generation=1)
+
+    def _load(self, generation: int) -> ParameterSnapshot:
+        data = json.loads(self.path.read_text())
+        validate_defaults(data)
+        return ParameterSnapshot(
+            params=freeze(data),
+            version=params_hash(data)[:VERSION_LENGTH],
+            generation=generation,
+            source=str(self.path),
+            loaded_at=time.time(),
+        )
+
+    @property
+    def snapshot(self) -> ParameterSnapshot:
+        # A single attribute read: callers keep the snapshot they got even if a reload
+        # swaps in a newer one while they compute.
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        with self._lock:
+            try:
+                identity = _file_identity(self.path)
+            except OSError as exc:
+                self.last_error = str(exc)
+                return False
+            if identity == self._identity:
+                return False
+            self._identity = identity
+            current = self._snapshot
+            try:
+                candidate = self._load(generation=current.generation + 1)
+            except Exception as exc:  # noqa: BLE001
+                # Keep serving the last good snapshot; the file is retried once it changes again.
+                self.last_error = str(exc)
+                return False
+            self.last_error = None
+            if candidate.version == current.version:
+                return False
+            self._snapshot = candidate
+            return True
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
+
+    def start(self) -> "ParameterProvider":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._poll, name="sodium-parameter-poller", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ParameterProvider":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def compute_payload(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+        snapshot = self._snapshot
+        result = compute_payload({**payload, "params": snapshot.params})
+        result["params_version"] = snapshot.version
+        return result
+
+    def compute_from_json(self, payload_json: str) -> str:
+        return json.dumps(self.compute_payload(json.loads(payload_json)))
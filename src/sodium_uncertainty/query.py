@@ -0,0 +1,353 @@
+import argparse
+import csv
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from .batch import BUCKET_KEYS, ERROR_BUCKET, RESULT_COLUMNS
+from .columnar import ColumnarFile, write_columns
+
+ORDER_SUFFIX = ".order"
+BITMAP_SUFFIX = ".bitmaps"
+ORDER_COLUMNS = (
+    ("delta_order", "q"),
+    ("delta_sorted", "d"),
+    ("chance_order", "q"),
+    ("chance_sorted", "d"),
+)
+ERROR_KEY = "error"
+# The bitmap file's meta lists, per bitmap, the runs of non-empty blocks of BLOCK_ROWS rows,
+# so an equality query only reads blocks where every filter has a set bit.
+BLOCK_BYTES = 512
+BLOCK_ROWS = BLOCK_BYTES * 8
+
+
+def index_paths(results_path: str | Path) -> tuple[Path, Path]:
+    path = Path(results_path)
+    return path.with_name(path.name + ORDER_SUFFIX), path.with_name(path.name + BITMAP_SUFFIX)
+
+
+def _bucket_label(code: int) -> str:
+    return ERROR_KEY if code == ERROR_BUCKET else BUCKET_KEYS[code]
+
+
+def _runs(ids: Sequence[int]) -> list[list[int]]:
+    # Sorted ids as [start, stop) runs; a bitmap spread over the whole file is a single run.
+    runs: list[list[int]] = []
+    for value in ids:
+        if runs and runs[-1][1] == value:
+            runs[-1][1] = value + 1
+        else:
+            runs.append([value, value + 1])
+    return runs
+
+
+class IndexBuilder:
+    # Collects the indexed columns of a results file chunk by chunk, then writes a sorted
+    # permutation file and a bitmap file next to it. Each draw's method gets its own bitmap
+    # kind, so method names never need to be split back out of a combined label.
+    def __init__(self) -> None:
+        self.delta = array("d")
+        self.chance = array("d")
+        self.bitmaps: dict[str, list[int]] = {}
+        self.n_rows = 0
+
+    def _mark(self, name: str, row: int) -> None:
+        rows = self.bitmaps.get(name)
+        if rows is None:
+            rows = self.bitmaps[name] = []
+        rows.append(row)
+
+    def add(
+        self,
+        results: Mapping[str, Sequence[Any]],
+        methods1: Sequence[Any],
+        methods2: Sequence[Any],
+        contexts: Sequence[Any],
+    ) -> None:
+        start = self.n_rows
+        self.delta.extend(results["observed_delta"])
+        self.chance.extend(results["chance_under_null"])
+        rows = zip(results["bucket"], methods1, methods2, contexts, strict=True)
+        for row, (bucket, method1, method2, context) in enumerate(rows, start=start):
+            self._mark(f"bucket:{_bucket_label(bucket)}", row)
+            self._mark(f"method1:{method1}", row)
+            self._mark(f"method2:{method2}", row)
+            self._mark(f"context:{context}", row)
+        self.n_rows += len(contexts)
+
+    def _order(self, values: array) -> tuple[array, array]:
+        # Error rows are NaN in both columns and stay out of the sorted permutations.
+        valid = [row for row, value in enumerate(values) if not math.isnan(value)]
+        valid.sort(key=values.__getitem__)
+        return array("q", valid), array("d", map(values.__getitem__, valid))
+
+    def write(self, results_path: str | Path) -> None:
+        order_path, bitmap_path = index_paths(results_path)
+        delta_order, delta_sorted = self._order(self.delta)
+        chance_order, chance_sorted = self._order(self.chance)
+        columns = {
+            "delta_order": delta_order,
+            "delta_sorted": delta_sorted,
+            "chance_order": chance_order,
+            "chance_sorted": chance_sorted,
+        }
+        write_columns(order_path, ORDER_COLUMNS, columns, {"n_rows": self.n_rows})
+        nbytes = (self.n_rows + 7) // 8
+        bitmaps = {}
+        blocks = {}
+        for name, rows in sorted(self.bitmaps.items()):
+            bits = bytearray(nbytes)
+            for row in rows:
+                bits[row >> 3] |= 1 << (row & 7)
+            bitmaps[name] = memoryview(bits).cast("b")
+            blocks[name] = _runs(sorted({row // BLOCK_ROWS for row in rows}))
+        write_columns(
+            bitmap_path,
+            [(name, "b") for name in bitmaps],
+            bitmaps,
+            {"n_rows": self.n_rows, "block_rows": BLOCK_ROWS, "blocks": blocks},
+        )
+
+
+class ResultIndex:
+    def __init__(self, results_path: str | Path) -> None:
+        order_path, bitmap_path = index_paths(results_path)
+        self.results = ColumnarFile(results_path)
+        try:
+            self._order = ColumnarFile(order_path)
+            self._bitmaps = ColumnarFile(bitmap_path)
+        except Exception:
+            self.close()
+            raise
+        self.n_rows = self.results.n_rows
+        stale = self._bitmaps.meta.get("block_rows") != BLOCK_ROWS
+        if stale or self._order.meta.get("n_rows") != self.n_rows:
+            self.close()
+            raise ValueError(f"Index for {results_path} does not match its results; rebuild it.")
+        self._names = set(self._bitmaps.column_names)
+        self._blocks: dict[str, list[list[int]]] = self._bitmaps.meta["blocks"]
+        self._views: dict[str, memoryview] = {}
+
+    def labels(self, kind: str) -> list[str]:
+        prefix = f"{kind}:"
+        return [
+            name[len(prefix) :] for name in self._bitmaps.column_names if name.startswith(prefix)
+        ]
+
+    def _view(self, name: str) -> memoryview:
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = self._bitmaps.column(name)
+        return view
+
+    def _bitmap_names(self, kind: str, labels: Iterable[str]) -> list[str]:
+        names = (f"{kind}:{label}" for label in labels)
+        return [name for name in names if name in self._names]
+
+    def _block_masks(self, groups: list[list[str]]) -> dict[int, int]:
+        # Per block, the rows set in at least one bitmap of every group. Only blocks that are
+        # non-empty for every group are read, so the cost follows the occupied blocks rather
+        # than the file size.
+        blocks = None
+        for group in groups:
+            occupied = {
+                block
+                for name in group
+                for start, stop in self._blocks[name]
+                for block in range(start, stop)
+            }
+            blocks = occupied if blocks is None else blocks & occupied
+        masks = {}
+        for block in sorted(blocks):
+            start = block * BLOCK_BYTES
+            word = -1
+            for group in groups:
+                bits = 0
+                for name in group:
+                    bits |= int.from_bytes(self._view(name)[start : start + BLOCK_BYTES], "little")
+                word &= bits
+                if not word:
+                    break
+            if word:
+                masks[block] = word
+        return masks
+
+    def _block_rows(self, groups: list[list[str]]) -> array:
+        rows = array("q")
+        append = rows.append
+        for block, word in self._block_masks(groups).items():
+            base = block * BLOCK_ROWS
+            while word:
+                low = word & -word
+                append(base + low.bit_length() - 1)
+                word ^= low
+        return rows
+
+    def _slices(self, name: str, low: float | None, high: float | None) -> list[memoryview]:
+        order = self._order.column(f"{name}_order")
+        values = self._order.column(f"{name}_sorted")
+        start = 0 if low is None else bisect_left(values, low)
+        stop = len(values) if high is None else bisect_right(values, high)
+        return [order[start:stop]] if start < stop else []
+
+    def query(
+        self,
+        bucket: str | Sequence[str] | None = None,
+        context: str | None = None,
+        method1: str | None = None,
+        method2: str | None = None,
+        method: str | None = None,
+        min_delta: float | None = None,
+        max_delta: float | None = None,
+        min_abs_delta: float | None = None,
+        min_chance: float | None = None,
+        max_chance: float | None = None,
+    ) -> array:
+        # Equality filters are groups of bitmaps: a row must be in some bitmap of every group.
+        # Range filters read row ids straight out of the sorted permutations. Only the narrowest
+        # range is enumerated and the rest (and the groups) are checked per candidate; without a
+        # range, only blocks occupied in every group are read. Either way the cost follows the
+        # candidates rather than the file size.
+        groups = []
+        if bucket is not None:
+            buckets = [bucket] if isinstance(bucket, str) else list(bucket)
+            groups.append(self._bitmap_names("bucket", buckets))
+        if context is not None:
+            groups.append(self._bitmap_names("context", [context]))
+        if method1 is not None:
+            groups.append(self._bitmap_names("method1", [method1]))
+        if method2 is not None:
+            groups.append(self._bitmap_names("method2", [method2]))
+        if method is not None:
+            groups.append(
+                self._bitmap_names("method1", [method]) + self._bitmap_names("method2", [method])
+            )
+        if not all(groups):
+            return array("q")
+
+        delta = self.results.column("observed_delta")
+        chance = self.results.column("chance_under_null")
+        ranges: list[tuple[list[memoryview], Callable[[int], bool]]] = []
+        if min_delta is not None or max_delta is not None:
+            delta_low = -math.inf if min_delta is None else min_delta
+            delta_high = math.inf if max_delta is None else max_delta
+            ranges.append(
+                (
+                    self._slices("delta", min_delta, max_delta),
+                    lambda row: delta_low <= delta[row] <= delta_high,
+                )
+            )
+        if min_abs_delta is not None:
+            limit = abs(min_abs_delta)
+            # At zero both tails would include ΔNa == 0, so every valid row is one slice.
+            if limit == 0:
+                slices = self._slices("delta", None, None)
+            else:
+                slices = self._slices("delta", None, -limit) + self._slices("delta", limit, None)
+            ranges.append((slices, lambda row: abs(delta[row]) >= limit))
+        if min_chance is not None or max_chance is not None:
+            chance_low = -math.inf if min_chance is None else min_chance
+            chance_high = math.inf if max_chance is None else max_chance
+            ranges.append(
+                (
+                    self._slices("chance", min_chance, max_chance),
+                    lambda row: chance_low <= chance[row] <= chance_high,
+                )
+            )
+
+        if not ranges:
+            if not groups:
+                return array("q", range(self.n_rows))
+            return self._block_rows(groups)
+
+        ranges.sort(key=lambda item: sum(len(part) for part in item[0]))
+        slices = ranges[0][0]
+        checks = [check for _slices, check in ranges[1:]]
+        masks = None
+        if groups:
+            masks = {
+                block: word.to_bytes(BLOCK_BYTES, "little")
+                for block, word in self._block_masks(groups).items()
+            }
+        empty = bytes(BLOCK_BYTES)
+        matches = []
+        for part in slices:
+            for row in part:
+                if masks is not None:
+                    bits = masks.get(row // BLOCK_ROWS, empty)
+                    offset = row % BLOCK_ROWS
+                    if not bits[offset >> 3] >> (offset & 7) & 1:
+                        continue
+                if all(check(row) for check in checks):
+                    matches.append(row)
+        matches.sort()
+        return array("q", matches)
+
+    def rows(self, row_ids: Sequence[int]) -> dict[str, array]:
+        # Loads only the requested rows, column by column, from the memory-mapped results.
+        loaded = {}
+        for name, typecode in RESULT_COLUMNS:
+            column = self.results.column(name)
+            loaded[name] = array(typecode, map(column.__getitem__, row_ids))
+        return loaded
+
+    def close(self) -> None:
+        self._views = {}
+        for handle in ("_bitmaps", "_order", "results"):
+            if hasattr(self, handle):
+                getattr(self, handle).close()
+
+    def __enter__(self) -> "ResultIndex":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Query an indexed columnar results file.")
+    parser.add_argument("results", type=Path, help="Results file written with --index")
+    parser.add_argument("--bucket", action="append", help="Bucket key (repeat for any of)")
+    parser.add_argument("--context")
+    parser.add_argument("--method1")
+    parser.add_argument("--method2")
+    parser.add_argument("--method", help="Either draw used this method")
+    parser.add_argument("--min-delta", type=float)
+    parser.add_argument("--max-delta", type=float)
+    parser.add_argument("--min-abs-delta", type=float)
+    parser.add_argument("--min-chance", type=float)
+    parser.add_argument("--max-chance", type=float)
+    parser.add_argument("--count", action="store_true", help="Print only the match count")
+    args = parser.parse_args(argv)
+
+    with ResultIndex(args.results) as index:
+        row_ids = index.query(
+            bucket=args.bucket,
+            context=args.context,
+            method1=args.method1,
+            method2=args.method2,
+            method=args.method,
+            min_delta=args.min_delta,
+            max_delta=args.max_delta,
+            min_abs_delta=args.min_abs_delta,
+            min_chance=args.min_chance,
+            max_chance=args.max_chance,
+        )
+        if args.count:
+            print(len(row_ids))
+            return
+        rows = index.rows(row_ids)
+        names = [name for name, _typecode in RESULT_COLUMNS]
+        writer = csv.writer(sys.stdout)
+        writer.writerow(names)
+        for *values, bucket in zip(*(rows[name] for name in names), strict=True):
+            writer.writerow([*values, _bucket_label(bucket)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import json
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from .defaults import resolve_sigma, validate_defaults
+
+INDEX_NAME = "index.json"
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def profile_key(site: str, analyzer: str) -> str:
+    for label, value in (("Site", site), ("Analyzer", analyzer)):
+        if not isinstance(value, str) or not _NAME_PATTERN.match(value):
+            raise ValueError(f"{label} must use letters, digits, '.', '_' or '-'.")
+    return f"{site}/{analyzer}"
+
+
+def validate_profile(profile: Mapping[str, Any]) -> None:
+    key = profile_key(profile.get("site"), profile.get("analyzer"))
+    contexts = profile.get("defaults")
+    if not isinstance(contexts, dict) or not contexts:
+        raise ValueError(f"Profile {key} must include a defaults mapping.")
+    validate_defaults({"defaults": {context: {key: entry} for context, entry in contexts.items()}})
+
+
+def write_registry(
+    root: str | Path,
+    profiles: Iterable[Mapping[str, Any]],
+    units: str = "mmol/L",
+) -> dict[str, Any]:
+    root = Path(root)
+    entries: dict[str, dict[str, Any]] = {}
+    for profile in profiles:
+        validate_profile(profile)
+        key = profile_key(profile["site"], profile["analyzer"])
+        if key in entries:
+            raise ValueError(f"Duplicate profile {key}.")
+        relative = Path("profiles") / profile["site"] / f"{profile['analyzer']}.json"
+        target = root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(dict(profile), indent=2) + "\n")
+        entries[key] = {"path": relative.as_posix(), "contexts": sorted(profile["defaults"])}
+    index = {"version": 1, "units": units, "profiles": entries}
+    root.mkdir(parents=True, exist_ok=True)
+    (root / INDEX_NAME).write_text(json.dumps(index, indent=2) + "\n")
+    return index
+
+
+class ProfileRegistry:
+    def __init__(self, root: str | Path, max_profiles: int = 64) -> None:
+        if max_profiles < 1:
+            raise ValueError("max_profiles must be at least 1.")
+        self.root = Path(root)
+        index = json.loads((self.root / INDEX_NAME).read_text())
+        if not isinstance(index.get("profiles"), dict):
+            raise ValueError("Registry index must include a profiles mapping.")
+        self.units = index.get("units", "mmol/L")
+        self.max_profiles = max_profiles
+        self._index: dict[str, dict[str, Any]] = index["profiles"]
+        self._contexts: dict[str, set[str]] = {}
+        for key, entry in self._index.items():
+            for context in entry.get("contexts", ()):
+                self._contexts.setdefault(context, set()).add(key)
+        self._profiles: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._sigmas: dict[tuple[str, str], float] = {}
+        self.loads = 0
+        self.hits = 0
+        self.params = {"version": 1, "units": self.units, "defaults": _DefaultsView(self)}
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self) -> list[str]:
+        return list(self._index)
+
+    @property
+    def loaded(self) -> list[str]:
+        return list(self._profiles)
+
+    def profile(self, key: str) -> dict[str, Any]:
+        cached = self._profiles.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._profiles.move_to_end(key)
+            return cached
+        entry = self._index[key]
+        profile = json.loads((self.root / entry["path"]).read_text())
+        validate_profile(profile)
+        if profile_key(profile["site"], profile["analyzer"]) != key:
+            raise ValueError(f"Profile file for {key} describes a different analyzer.")
+        self.loads += 1
+        self._profiles[key] = profile
+        if len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        return profile
+
+    def resolve_sigma(self, context: str, key: str) -> float:
+        cache_key = (context, key)
+        sigma = self._sigmas.get(cache_key)
+        if sigma is None:
+            sigma = self._sigmas[cache_key] = resolve_sigma(self.params, context, key)
+        return sigma
+
+    def resolve_sigmas(self, contexts: Sequence[str] | str, keys: Sequence[str]) -> list[float]:
+        if isinstance(contexts, str):
+            contexts = [contexts] * len(keys)
+        if len(contexts) != len(keys):
+            raise ValueError("contexts and keys must have the same length.")
+        sigmas = self._sigmas
+        resolved = []
+        append = resolved.append
+        for context, key in zip(contexts, keys, strict=True):
+            sigma = sigmas.get((context, key))
+            if sigma is None:
+                sigma = self.resolve_sigma(context, key)
+            append(sigma)
+        return resolved
+
+
+class _ContextView(Mapping):
+    def __init__(self, registry: ProfileRegistry, context: str) -> None:
+        self._registry = registry
+        self._context = context
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._registry._contexts.get(self._context, ())
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        if key not in self:
+            raise KeyError(key)
+        return self._registry.profile(key)["defaults"][self._context]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._registry._contexts.get(self._context, ())))
+
+    def __len__(self) -> int:
+        return len(self._registry._contexts.get(self._context, ()))
+
+
+class _DefaultsView(Mapping):
+    def __init__(self, registry: ProfileRegistry) -> None:
+        self._registry = registry
+
+    def __getitem__(self, context: str) -> _ContextView:
+        if context not in self._registry._contexts:
+            raise KeyError(context)
+        return _ContextView(self._registry, context)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._registry._contexts))
+
+    def __len__(self) -> int:
+        return len(self._registry._contexts)
@@ -0,0 +1,270 @@
+import argparse
+import csv
+import json
+import random
+from array import array
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from .columnar import ColumnarWriter
+from .defaults import load_defaults, precision_table_for, resolve_sigma
+
+KINDS = ("results", "pairs")
+FORMATS = ("csv", "ndjson", "binary")
+FORMAT_SUFFIXES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".snacol": "binary"}
+DEFAULT_METHOD_MIX = {"central_lab_indirect_ISE": 0.7, "istat_direct_ISE": 0.3}
+CONTEXT = "sequential_draws"
+# Rows per shard are fixed, so the output depends only on (seed, rows, settings), never on
+# how many workers produced it.
+SHARD_ROWS = 100_000
+PATIENT_STRIDE = 10_000_000
+HORIZON_HOURS = 24 * 365.0
+MEAN_GAP_HOURS = 6.0
+MEAN_EXTRA_DRAWS = 3.0
+COLUMNS = {
+    "results": (("patient_id", "q"), ("time", "d"), ("value", "q"), ("method", "b")),
+    "pairs": (
+        ("patient_id", "q"),
+        ("y1", "q"),
+        ("y2", "q"),
+        ("method1", "b"),
+        ("method2", "b"),
+        ("elapsed_hours", "d"),
+    ),
+}
+
+
+def _sigma_functions(
+    params: Mapping[str, Any], methods: Sequence[str]
+) -> list[Callable[[float], float]]:
+    functions = []
+    for method in methods:
+        if method not in params["defaults"].get(CONTEXT, {}):
+            raise ValueError(f"Method {method} has no {CONTEXT} defaults.")
+        table = precision_table_for(params, CONTEXT, method)
+        if table is not None:
+            functions.append(table.sigma_at)
+        else:
+            sigma = resolve_sigma(params, CONTEXT, method)
+            functions.append(lambda _value, sigma=sigma: sigma)
+    return functions
+
+
+def _cumulative_weights(method_mix: Mapping[str, float]) -> list[float]:
+    weights = [float(weight) for weight in method_mix.values()]
+    if not weights or any(weight < 0 for weight in weights) or not sum(weights) > 0:
+        raise ValueError("Method mix weights must be non-negative with a positive total.")
+    total = sum(weights)
+    cumulative = []
+    running = 0.0
+    for weight in weights:
+        running += weight / total
+        cumulative.append(running)
+    cumulative[-1] = 1.0
+    return cumulative
+
+
+def _patient_draws(
+    rng: random.Random,
+    cumulative: Sequence[float],
+    sigmas: Sequence[Callable[[float], float]],
+) -> Iterator[tuple[float, int, int]]:
+    # One patient's stream: a baseline state, an optional correction towards 140 mmol/L,
+    # method-specific measurement error and integer reporting.
+    state = rng.random()
+    if state < 0.2:
+        start, rate = rng.uniform(110.0, 132.0), rng.uniform(0.1, 0.5)
+    elif state < 0.28:
+        start, rate = rng.uniform(148.0, 165.0), -rng.uniform(0.1, 0.4)
+    else:
+        start, rate = rng.gauss(140.0, 2.5), 0.0
+    first = round(rng.uniform(0.0, HORIZON_HOURS), 2)
+    time = first
+    for _draw in range(2 + int(rng.expovariate(1.0 / MEAN_EXTRA_DRAWS))):
+        true = start + rate * (time - first)
+        if (rate > 0 and true > 140.0) or (rate < 0 and true < 140.0):
+            true = 140.0
+        true += rng.gauss(0.0, 0.3)
+        pick = rng.random()
+        code = 0
+        while cumulative[code] < pick:
+            code += 1
+        yield time, round(true + rng.gauss(0.0, sigmas[code](true))), code
+        time = round(time + rng.expovariate(1.0 / MEAN_GAP_HOURS), 2)
+
+
+def generate_shard(
+    shard: int,
+    rows: int,
+    seed: int = 0,
+    kind: str = "results",
+    params: Mapping[str, Any] | None = None,
+    method_mix: Mapping[str, float] | None = None,
+) -> dict[str, array]:
+    if kind not in KINDS:
+        raise ValueError(f"Kind must be one of: {', '.join(KINDS)}.")
+    params = load_defaults() if params is None else params
+    method_mix = DEFAULT_METHOD_MIX if method_mix is None else method_mix
+    sigmas = _sigma_functions(params, list(method_mix))
+    cumulative = _cumulative_weights(method_mix)
+    # String seeds hash deterministically (random.seed version 2), unlike tuples.
+    rng = random.Random(f"{seed}:{shard}")
+    columns = {name: array(typecode) for name, typecode in COLUMNS[kind]}
+    appends = [columns[name].append for name, _typecode in COLUMNS[kind]]
+    produced = 0
+    patient = shard * PATIENT_STRIDE
+    while produced < rows:
+        previous = None
+        for draw in _patient_draws(rng, cumulative, sigmas):
+            if kind == "results":
+                values = (patient, draw[0], draw[1], draw[2])
+            elif previous is None:
+                previous = draw
+                continue
+            else:
+                elapsed = round(draw[0] - previous[0], 2)
+                values = (patient, previous[1], draw[1], previous[2], draw[2], elapsed)
+                previous = draw
+            for append, value in zip(appends, values, strict=True):
+                append(value)
+            produced += 1
+            if produced == rows:
+                break
+        patient += 1
+    return columns
+
+
+def _shard_sizes(rows: int, shard_rows: int) -> list[int]:
+    full, remainder = divmod(rows, shard_rows)
+    return [shard_rows] * full + ([remainder] if remainder else [])
+
+
+def _text_rows(kind: str, columns: Mapping[str, array], methods: Sequence[str]) -> Iterator[tuple]:
+    if kind == "results":
+        for patient, time, value, code in zip(*columns.values(), strict=True):
+            yield patient, time, value, methods[code]
+    else:
+        for patient, y1, y2, code1, code2, elapsed in zip(*columns.values(), strict=True):
+            yield patient, CONTEXT, y1, y2, methods[code1], methods[code2], elapsed
+
+
+def _text_header(kind: str) -> tuple[str, ...]:
+    if kind == "results":
+        return ("patient_id", "time", "value", "method")
+    return ("patient_id", "context", "y1", "y2", "method1", "method2", "elapsed_hours")
+
+
+def _write_text(
+    handle: IO[str],
+    fmt: str,
+    kind: str,
+    columns: Mapping[str, array],
+    methods: Sequence[str],
+) -> None:
+    rows = _text_rows(kind, columns, methods)
+    if fmt == "csv":
+        csv.writer(handle).writerows(rows)
+        return
+    header = _text_header(kind)
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    handle.writelines(encode(dict(zip(header, row, strict=True))) + "\n" for row in rows)
+
+
+def _iter_shards(
+    sizes: Sequence[int],
+    workers: int,
+    options: Mapping[str, Any],
+) -> Iterator[dict[str, array]]:
+    if workers <= 1 or len(sizes) <= 1:
+        for shard, size in enumerate(sizes):
+            yield generate_shard(shard, size, **options)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Keep a bounded number of shards in flight and yield them in shard order.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        next_shard = 0
+        while next_shard < len(sizes) or pending:
+            while next_shard < len(sizes) and len(pending) < 2 * workers:
+                pending.append(
+                    executor.submit(generate_shard, next_shard, sizes[next_shard], **options)
+                )
+                next_shard += 1
+            yield pending.pop(0).result()
+
+
+def generate_cohort(
+    path: str | Path,
+    rows: int,
+    seed: int = 0,
+    kind: str = "results",
+    fmt: str | None = None,
+    params: dict[str, Any] | None = None,
+    method_mix: Mapping[str, float] | None = None,
+    workers: int = 1,
+    shard_rows: int = SHARD_ROWS,
+) -> int:
+    path = Path(path)
+    fmt = fmt or FORMAT_SUFFIXES.get(path.suffix)
+    if fmt not in FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(FORMATS)}.")
+    if kind not in KINDS:
+        raise ValueError(f"Kind must be one of: {', '.join(KINDS)}.")
+    if rows < 0 or shard_rows < 1:
+        raise ValueError("Rows must be non-negative and shards at least one row.")
+    params = load_defaults() if params is None else params
+    method_mix = dict(DEFAULT_METHOD_MIX if method_mix is None else method_mix)
+    methods = list(method_mix)
+    options = {"seed": seed, "kind": kind, "params": params, "method_mix": method_mix}
+    shards = _iter_shards(_shard_sizes(rows, shard_rows), workers, options)
+
+    if fmt == "binary":
+        meta = {"kind": kind, "context": CONTEXT, "methods": methods, "seed": seed}
+        with ColumnarWriter(path, COLUMNS[kind], meta) as writer:
+            for columns in shards:
+                writer.write(columns)
+        return writer.n_rows
+    with path.open("w", newline="") as handle:
+        if fmt == "csv":
+            csv.writer(handle).writerow(_text_header(kind))
+        for columns in shards:
+            _write_text(handle, fmt, kind, columns, methods)
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Write a seeded synthetic sodium cohort for benchmarks and tests.",
+    )
+    parser.add_argument("output", type=Path, help="Output .csv, .ndjson or .snacol file")
+    parser.add_argument("--rows", type=int, required=True, help="Rows to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--kind",
+        choices=KINDS,
+        default="results",
+        help="Per-draw lab results (pairing input) or consecutive pairs (runner input)",
+    )
+    parser.add_argument("--format", choices=FORMATS, help="Defaults to the output suffix")
+    parser.add_argument("--params", type=Path, help="Defaults JSON supplying the sigmas")
+    parser.add_argument("--workers", type=int, default=1, help="Generator processes")
+    parser.add_argument("--shard-rows", type=int, default=SHARD_ROWS, help="Rows per shard")
+    args = parser.parse_args(argv)
+
+    written = generate_cohort(
+        args.output,
+        args.rows,
+        seed=args.seed,
+        kind=args.kind,
+        fmt=args.format,
+        params=load_defaults(args.params) if args.params else None,
+        workers=args.workers,
+        shard_rows=args.shard_rows,
+    )
+    print(f"Wrote {written} {args.kind} rows to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
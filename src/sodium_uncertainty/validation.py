@@ -0,0 +1,342 @@
+import math
+from array import array
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from .calculator import (
+    CONTEXTS,
+    CURVE_MODE_MESSAGE,
+    CURVE_MODES,
+    ERROR_ENGINES,
+    EXCEEDANCE_COUNT_MESSAGE,
+    EXCEEDANCE_MESSAGE,
+    INVALID_PARAMS_MESSAGE,
+    MIN_RESOLUTION,
+    MISSING_PARAMS_MESSAGE,
+    RESOLUTION_BOUNDS_MESSAGE,
+    RESOLUTION_ENGINE_MESSAGE,
+    RESOLUTION_MESSAGE,
+    off_resolution_grid,
+    parse_exceedance_thresholds,
+)
+from .defaults import precision_table_for, resolve_sigma
+from .precision import INVALID_PROFILE_MESSAGE, PrecisionTable
+from .types import BulkValidation
+
+# Bits are ordered so that expanding a mask lists messages in the same order
+# compute_payload appends them to its errors/warnings lists.
+ERROR_FLAGS: tuple[tuple[int, str, str], ...] = (
+    (1 << 0, "na1_not_number", "Na1 must be a number."),
+    (1 << 1, "na2_not_number", "Na2 must be a number."),
+    (1 << 2, "ci_level_not_number", "CI level must be a number."),
+    (1 << 3, "threshold_not_number", "Threshold must be a number."),
+    (1 << 4, "na_ref_not_number", "Reference Na must be a number."),
+    (1 << 5, "resolution_not_number", "Reporting resolution must be a number."),
+    (1 << 6, "ci_level_out_of_range", "CI level must be between 0 and 1."),
+    (1 << 7, "threshold_negative", "Threshold must be non-negative."),
+    (1 << 8, "na_ref_not_positive", "Reference Na must be positive."),
+    (1 << 9, "resolution_not_positive", "Reporting resolution must be positive."),
+    (1 << 10, "resolution_out_of_bounds", RESOLUTION_BOUNDS_MESSAGE),
+    (1 << 11, "invalid_context", "Invalid context selection."),
+    (1 << 12, "missing_params", MISSING_PARAMS_MESSAGE),
+    (1 << 13, "sigma_not_positive", "Sigma must be positive."),
+    (1 << 14, "loa_missing", "LoA half-width must be provided when sigma is empty."),
+    (1 << 15, "loa_not_positive", "LoA half-width must be positive."),
+    (1 << 16, "params_invalid", INVALID_PARAMS_MESSAGE),
+    (1 << 17, "precision_profile_invalid", INVALID_PROFILE_MESSAGE),
+    (1 << 18, "scaled_sigma_not_positive", "Sigma values must be positive."),
+    (1 << 19, "invalid_error_engine", "Invalid error engine selection."),
+    (1 << 20, "resolution_engine", RESOLUTION_ENGINE_MESSAGE),
+    (1 << 21, "exceedance_invalid", EXCEEDANCE_MESSAGE),
+    (1 << 22, "exceedance_too_many", EXCEEDANCE_COUNT_MESSAGE),
+    (1 << 23, "invalid_curve_mode", CURVE_MODE_MESSAGE),
+)
+WARNING_FLAGS: tuple[tuple[int, str, str], ...] = (
+    (1 << 0, "na1_out_of_range", "Na1 is outside typical physiologic ranges."),
+    (1 << 1, "na2_out_of_range", "Na2 is outside typical physiologic ranges."),
+    (1 << 2, "off_resolution_grid", RESOLUTION_MESSAGE),
+)
+
+(
+    NA1_NOT_NUMBER,
+    NA2_NOT_NUMBER,
+    CI_LEVEL_NOT_NUMBER,
+    THRESHOLD_NOT_NUMBER,
+    NA_REF_NOT_NUMBER,
+    RESOLUTION_NOT_NUMBER,
+    CI_LEVEL_OUT_OF_RANGE,
+    THRESHOLD_NEGATIVE,
+    NA_REF_NOT_POSITIVE,
+    RESOLUTION_NOT_POSITIVE,
+    RESOLUTION_OUT_OF_BOUNDS,
+    INVALID_CONTEXT,
+    MISSING_PARAMS,
+    SIGMA_NOT_POSITIVE,
+    LOA_MISSING,
+    LOA_NOT_POSITIVE,
+    PARAMS_INVALID,
+    PRECISION_PROFILE_INVALID,
+    SCALED_SIGMA_NOT_POSITIVE,
+    INVALID_ERROR_ENGINE,
+    RESOLUTION_ENGINE,
+    EXCEEDANCE_INVALID,
+    EXCEEDANCE_TOO_MANY,
+    INVALID_CURVE_MODE,
+) = (bit for bit, _name, _message in ERROR_FLAGS)
+NA1_OUT_OF_RANGE, NA2_OUT_OF_RANGE, OFF_RESOLUTION_GRID = (
+    bit for bit, _name, _message in WARNING_FLAGS
+)
+
+_SIGMA_ERROR_BITS = {
+    message: bit
+    for bit, _name, message in ERROR_FLAGS
+    if bit in (SIGMA_NOT_POSITIVE, LOA_MISSING, LOA_NOT_POSITIVE, PRECISION_PROFILE_INVALID)
+}
+_MISSING = object()
+
+
+def error_messages(mask: int) -> list[str]:
+    return [message for bit, _name, message in ERROR_FLAGS if mask & bit]
+
+
+def warning_messages(mask: int) -> list[str]:
+    return [message for bit, _name, message in WARNING_FLAGS if mask & bit]
+
+
+def _is_column(value: Any) -> bool:
+    return isinstance(value, Sequence | array) and not isinstance(value, str | bytes)
+
+
+def _column(columns: Mapping[str, Any], key: str, n_rows: int, default: Any = None) -> Sequence:
+    value = columns.get(key, default)
+    if _is_column(value):
+        return value
+    return [value] * n_rows
+
+
+def _parse_value(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_column(values: Sequence) -> list[float | None]:
+    cache: dict[Any, float | None] = {}
+    parsed: list[float | None] = []
+    append = parsed.append
+    for value in values:
+        try:
+            result = cache.get(value, _MISSING)
+        except TypeError:
+            append(_parse_value(value))
+            continue
+        if result is _MISSING:
+            result = cache[value] = _parse_value(value)
+        append(result)
+    return parsed
+
+
+def _sigma_or_error(
+    params: Any, context: Any, method: Any
+) -> tuple[float, PrecisionTable | None, int]:
+    try:
+        table = precision_table_for(params, context, method)
+        if table is not None:
+            return 0.0, table, 0
+        return resolve_sigma(params, context, method), None, 0
+    except KeyError:
+        return 0.0, None, MISSING_PARAMS
+    except ValueError as exc:
+        return 0.0, None, _SIGMA_ERROR_BITS.get(str(exc), PARAMS_INVALID)
+    except Exception:  # noqa: BLE001
+        return 0.0, None, PARAMS_INVALID
+
+
+def _error_models_or_error(params: Any, context: Any, method1: Any, method2: Any) -> int:
+    from .convolution import error_model_for
+
+    # compute_payload reports the specific error-model message; the mask records it
+    # as invalid parameters.
+    try:
+        error_model_for(params, context, method1)
+        error_model_for(params, context, method2)
+    except Exception:  # noqa: BLE001
+        return PARAMS_INVALID
+    return 0
+
+
+def _exceedance_error(value: Any) -> int:
+    try:
+        parse_exceedance_thresholds(value)
+    except ValueError as exc:
+        return EXCEEDANCE_TOO_MANY if str(exc) == EXCEEDANCE_COUNT_MESSAGE else EXCEEDANCE_INVALID
+    return 0
+
+
+def _exceedance_column(columns: Mapping[str, Any], n_rows: int) -> Sequence:
+    # A threshold vector is itself a list, so exceedance_thresholds counts as per-row only when
+    # it has one entry per row and some entry is a vector; otherwise all rows share it.
+    value = columns.get("exceedance_thresholds")
+    if _is_column(value) and len(value) == n_rows and any(_is_column(item) for item in value):
+        return value
+    return [value] * n_rows
+
+
+def _count_flags(
+    masks: array, flags: tuple[tuple[int, str, str], ...]
+) -> tuple[dict[str, int], int]:
+    by_mask = Counter(masks)
+    counts = {name: 0 for _bit, name, _message in flags}
+    flagged_rows = 0
+    for mask, count in by_mask.items():
+        if not mask:
+            continue
+        flagged_rows += count
+        for bit, name, _message in flags:
+            if mask & bit:
+                counts[name] += count
+    return counts, flagged_rows
+
+
+def validate_columns(columns: Mapping[str, Any]) -> BulkValidation:
+    lengths = {
+        len(value)
+        for key, value in columns.items()
+        if _is_column(value) and key != "exceedance_thresholds"
+    }
+    if len(lengths) > 1:
+        raise ValueError("All column inputs must have the same length.")
+    n_rows = lengths.pop() if lengths else 1
+
+    y1_values = _parse_column(_column(columns, "y1", n_rows))
+    y2_values = _parse_column(_column(columns, "y2", n_rows))
+    ci_values = _parse_column(_column(columns, "ci_level", n_rows))
+    threshold_values = _parse_column(_column(columns, "threshold", n_rows))
+    na_ref_values = _parse_column(_column(columns, "na_ref", n_rows, 140))
+    resolution_values = _column(columns, "resolution", n_rows)
+    scale_values = _column(columns, "scale_with_na", n_rows, False)
+    context_values = _column(columns, "context", n_rows)
+    method1_values = _column(columns, "method1", n_rows)
+    method2_values = _column(columns, "method2", n_rows)
+    engine_values = _column(columns, "error_engine", n_rows, "normal")
+    curve_values = _column(columns, "curve_mode", n_rows, "points")
+    exceedance_values = _exceedance_column(columns, n_rows)
+    params = columns.get("params")
+
+    sigma_cache: dict[tuple[Any, Any], tuple[float, PrecisionTable | None, int]] = {}
+
+    def sigma_for(context: Any, method: Any) -> tuple[float, PrecisionTable | None, int]:
+        try:
+            key = (context, method)
+            cached = sigma_cache.get(key)
+        except TypeError:
+            return _sigma_or_error(params, context, method)
+        if cached is None:
+            cached = sigma_cache[key] = _sigma_or_error(params, context, method)
+        return cached
+
+    error_mask = array("I", bytes(4 * n_rows))
+    warning_mask = array("B", bytes(n_rows))
+    rows = zip(
+        y1_values,
+        y2_values,
+        ci_values,
+        threshold_values,
+        na_ref_values,
+        scale_values,
+        context_values,
+        method1_values,
+        method2_values,
+        engine_values,
+        resolution_values,
+        curve_values,
+        exceedance_values,
+        strict=True,
+    )
+    model_cache: dict[tuple[Any, Any, Any], int] = {}
+    exceedance_cache: dict[int, int] = {}
+    for index, row in enumerate(rows):
+        y1, y2, ci_level, threshold, na_ref, scale, context, m1, m2, engine = row[:10]
+        resolution, curve_mode, exceedance = row[10:]
+        errors = 0
+        warnings = 0
+        if y1 is None:
+            errors |= NA1_NOT_NUMBER
+        elif y1 < 100 or y1 > 170:
+            warnings |= NA1_OUT_OF_RANGE
+        if y2 is None:
+            errors |= NA2_NOT_NUMBER
+        elif y2 < 100 or y2 > 170:
+            warnings |= NA2_OUT_OF_RANGE
+        if ci_level is None:
+            errors |= CI_LEVEL_NOT_NUMBER
+        elif not 0 < ci_level < 1:
+            errors |= CI_LEVEL_OUT_OF_RANGE
+        if threshold is None:
+            errors |= THRESHOLD_NOT_NUMBER
+        elif threshold < 0:
+            errors |= THRESHOLD_NEGATIVE
+        if na_ref is None:
+            errors |= NA_REF_NOT_NUMBER
+        elif na_ref <= 0:
+            errors |= NA_REF_NOT_POSITIVE
+        if resolution in (None, ""):
+            resolution = None
+        else:
+            resolution = _parse_value(resolution)
+            if resolution is None:
+                errors |= RESOLUTION_NOT_NUMBER
+            elif not resolution > 0:
+                errors |= RESOLUTION_NOT_POSITIVE
+            elif not (math.isfinite(resolution) and resolution >= MIN_RESOLUTION):
+                errors |= RESOLUTION_OUT_OF_BOUNDS
+
+        if not errors:
+            if context not in CONTEXTS:
+                errors = INVALID_CONTEXT
+            elif engine not in ERROR_ENGINES:
+                errors = INVALID_ERROR_ENGINE
+            elif resolution is not None and engine == "convolution":
+                errors = RESOLUTION_ENGINE
+            else:
+                if resolution is not None and off_resolution_grid((y1, y2), resolution):
+                    warnings |= OFF_RESOLUTION_GRID
+                sigma1, table1, errors = sigma_for(context, m1)
+                if not errors:
+                    sigma2, table2, errors = sigma_for(context, m2)
+                if not errors and scale:
+                    # Precision-profile sigmas are positive and never CV-scaled.
+                    if (table1 is None and sigma1 * (y1 / na_ref) <= 0) or (
+                        table2 is None and sigma2 * (y2 / na_ref) <= 0
+                    ):
+                        errors = SCALED_SIGMA_NOT_POSITIVE
+                if not errors and engine == "convolution":
+                    key = (context, m1, m2)
+                    if key not in model_cache:
+                        model_cache[key] = _error_models_or_error(params, context, m1, m2)
+                    errors = model_cache[key]
+                # compute_payload checks these only once evaluation has succeeded.
+                if not errors:
+                    key = id(exceedance)
+                    if key not in exceedance_cache:
+                        exceedance_cache[key] = _exceedance_error(exceedance)
+                    errors = exceedance_cache[key]
+                if not errors and curve_mode not in CURVE_MODES:
+                    errors = INVALID_CURVE_MODE
+
+        error_mask[index] = errors
+        warning_mask[index] = warnings
+
+    error_counts, error_rows = _count_flags(error_mask, ERROR_FLAGS)
+    warning_counts, warning_rows = _count_flags(warning_mask, WARNING_FLAGS)
+    return BulkValidation(
+        error_mask=error_mask,
+        warning_mask=warning_mask,
+        error_counts=error_counts,
+        warning_counts=warning_counts,
+        n_rows=n_rows,
+        error_rows=error_rows,
+        warning_rows=warning_rows,
+    )
@@ -0,0 +1,117 @@
+import json
+import math
+
+import pytest
+
+from sodium_uncertainty.aggregates import (
+    CohortSummary,
+    Histogram,
+    QuantileSketch,
+    merge_summaries,
+    summarize_file,
+    summarize_files,
+    summarize_payloads,
+)
+from sodium_uncertainty.batch import BUCKET_KEYS, iter_payloads, score_payloads
+from sodium_uncertainty.defaults import load_defaults
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _payloads(n: int) -> list[dict]:
+    base = {
+        "context": "sequential_draws",
+        "ci_level": 0.95,
+        "threshold": 2,
+        "params": load_defaults(),
+    }
+    rows = [
+        {
+            "y1": 120 + index % 25,
+            "y2": 118 + (index * 7) % 31,
+            "method1": CENTRAL,
+            "method2": ISTAT if index % 3 else CENTRAL,
+        }
+        for index in range(n)
+    ]
+    rows.append({"y1": "bad", "y2": 130, "method1": CENTRAL, "method2": ISTAT})
+    return list(iter_payloads(rows, base))
+
+
+def test_summary_matches_exact_counts() -> None:
+    payloads = _payloads(300)
+    results = score_payloads(payloads)
+    summary = summarize_payloads(payloads, chunk_size=64)
+
+    assert summary.n == len(payloads)
+    group = summary.groups[("sequential_draws", CENTRAL, ISTAT)]
+    assert group.errors == 1
+    expected = [0] * len(BUCKET_KEYS)
+    for payload, code in zip(payloads, results["bucket"], strict=True):
+        if payload["method2"] == ISTAT and code >= 0:
+            expected[code] += 1
+    assert list(group.bucket_counts) == expected
+    assert group.observed_delta.n == sum(expected)
+    assert group.chance_under_null.underflow == 0
+
+
+def test_merge_is_associative_and_serializes() -> None:
+    payloads = _payloads(240)
+    parts = [
+        summarize_payloads(payloads[start:stop])
+        for start, stop in ((0, 80), (80, 160), (160, None))
+    ]
+    whole = summarize_payloads(payloads)
+
+    left = merge_summaries(merge_summaries(parts[0], parts[1]), parts[2])
+    right = merge_summaries(parts[0], merge_summaries(parts[1], parts[2]))
+    assert left.to_dict() == right.to_dict() == whole.to_dict()
+
+    encoded = json.dumps(whole.to_dict(), separators=(",", ":"))
+    assert len(encoded) < 8_000
+    assert CohortSummary.from_dict(json.loads(encoded)).to_dict() == whole.to_dict()
+
+
+def test_histogram_and_sketch_bounds() -> None:
+    histogram = Histogram(0.0, 1.0, 10)
+    histogram.add_many([-0.1, 0.0, 0.55, 1.0, 1.5, math.nan, math.inf, -math.inf])
+    assert (histogram.underflow, histogram.overflow, histogram.counts[5], histogram.n) == (
+        2,
+        2,
+        1,
+        7,
+    )
+    with pytest.raises(ValueError, match="must match"):
+        histogram.merge(Histogram(0.0, 2.0, 10))
+
+    values = [0.5 + index / 1000 for index in range(10_000)]
+    sketch = QuantileSketch(accuracy=0.01)
+    sketch.add_many(values)
+    for q in (0.01, 0.5, 0.99):
+        exact = sorted(values)[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert len(sketch.buckets) < 200
+
+    capped = QuantileSketch(max_bins=16)
+    capped.add_many(values)
+    assert len(capped.buckets) <= 16
+    assert capped.quantile(1.0) == pytest.approx(max(values), rel=0.01)
+
+
+def test_summarize_files_in_parallel(tmp_path) -> None:
+    paths = []
+    for part in range(2):
+        path = tmp_path / f"part{part}.csv"
+        lines = ["y1,y2,method1,method2"]
+        lines += [f"{128 + part},{130 + index % 5},{CENTRAL},{ISTAT}" for index in range(20)]
+        path.write_text("\n".join(lines) + "\n")
+        paths.append(path)
+    params = load_defaults()
+    base = {"context": "sequential_draws"}
+
+    serial = merge_summaries(*(summarize_file(path, params, base) for path in paths))
+    parallel = summarize_files(paths, params, base, workers=2)
+
+    assert parallel.to_dict() == serial.to_dict()
+    assert parallel.n == 40
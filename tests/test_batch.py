@@ -0,0 +1,128 @@
+import math
+from pathlib import Path
+
+import pytest
+
+from sodium_uncertainty.batch import (
+    BUCKET_KEYS,
+    ERROR_BUCKET,
+    chunked,
+    exceedance_matrix,
+    iter_payloads,
+    score_columns,
+    score_payloads,
+    score_to_file,
+    score_unique,
+)
+from sodium_uncertainty.calculator import compute_payload
+from sodium_uncertainty.columnar import ColumnarFile
+from sodium_uncertainty.defaults import load_defaults
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _base() -> dict:
+    return {"ci_level": 0.95, "threshold": 2, "na_ref": 140, "params": load_defaults()}
+
+
+def _rows(n: int) -> list[dict]:
+    contexts = ("sequential_draws", "analytic_repeatability")
+    return [
+        {
+            "y1": 125 + index % 20,
+            "y2": 125 + (index * 7) % 23,
+            "method1": CENTRAL if index % 3 else ISTAT,
+            "method2": ISTAT if index % 2 else CENTRAL,
+            "context": contexts[index % 2],
+            "scale_with_na": index % 5 == 0,
+        }
+        for index in range(n)
+    ]
+
+
+def test_score_payloads_matches_compute_payload() -> None:
+    payloads = list(iter_payloads(_rows(60), _base()))
+    results = score_payloads(payloads, first_row_id=100)
+
+    assert list(results["row_id"]) == list(range(100, 160))
+    for index, payload in enumerate(payloads):
+        expected = compute_payload(payload)
+        assert results["observed_delta"][index] == expected["observed_delta"]
+        assert results["delta_true_mean"][index] == expected["delta_true"]["mean"]
+        assert results["delta_true_sd"][index] == expected["delta_true"]["sd"]
+        assert results["delta_true_ci_low"][index] == expected["delta_true"]["ci_low"]
+        assert results["delta_true_ci_high"][index] == expected["delta_true"]["ci_high"]
+        assert results["chance_under_null"][index] == expected["probabilities"]["chance_under_null"]
+        bucket = BUCKET_KEYS[results["bucket"][index]]
+        assert bucket == expected["probabilities"]["chance_bucket_key"]
+
+
+def test_error_rows_are_nan_with_error_bucket() -> None:
+    results = score_payloads(iter_payloads([{"y1": "x", "y2": 130}], _base()))
+
+    assert results["bucket"][0] == ERROR_BUCKET
+    assert math.isnan(results["delta_true_mean"][0])
+
+
+def test_score_to_file_writes_all_chunks(tmp_path: Path) -> None:
+    path = tmp_path / "scores.snacol"
+    rows = _rows(1234)
+
+    n_rows = score_to_file(iter_payloads(rows, _base()), path, chunk_size=100, meta={"run": "t"})
+
+    assert n_rows == 1234
+    expected = score_payloads(iter_payloads(rows, _base()))
+    with ColumnarFile(path) as results:
+        assert results.meta == {"bucket_keys": list(BUCKET_KEYS), "run": "t"}
+        assert list(results.column("row_id")) == list(range(1234))
+        assert (
+            results.column("chance_under_null").tolist() == expected["chance_under_null"].tolist()
+        )
+
+
+def test_chunked_rejects_empty_chunks() -> None:
+    assert [len(chunk) for chunk in chunked(range(7), 3)] == [3, 3, 1]
+    with pytest.raises(ValueError):
+        list(chunked(range(3), 0))
+
+
+def test_exceedance_matrix_matches_compute_payload() -> None:
+    payloads = list(iter_payloads(_rows(6) + [{"y1": "bad"}], _base()))
+    thresholds = [0, 4, 8]
+    matrix = exceedance_matrix(score_payloads(payloads), thresholds)
+
+    assert len(matrix) == len(payloads) * len(thresholds)
+    for index, payload in enumerate(payloads[:-1]):
+        expected = compute_payload({**payload, "exceedance_thresholds": thresholds})
+        row = matrix[index * 3 : index * 3 + 3]
+        assert list(row) == pytest.approx(expected["exceedance"]["delta_true"])
+    assert all(math.isnan(value) for value in matrix[-3:])
+
+
+def _same_results(left: dict, right: dict) -> bool:
+    return all(
+        len(left[name]) == len(right[name])
+        and all(
+            (math.isnan(a) and math.isnan(b)) or a == b
+            for a, b in zip(left[name], right[name], strict=True)
+        )
+        for name in left
+    )
+
+
+def test_dedup_scoring_scatters_to_row_order() -> None:
+    rows = [dict(row) for row in _rows(60) * 5]
+    rows[17]["y2"] = "bad"
+    fields = ("y1", "y2", "method1", "method2", "context", "scale_with_na")
+    expected = score_payloads(iter_payloads(rows, _base()), first_row_id=5)
+
+    keys = [tuple(row[field] for field in fields) for row in rows]
+    assert len(set(keys)) == 61
+    assert _same_results(score_unique(keys, fields, _base(), first_row_id=5), expected)
+    columns = {field: [row[field] for row in rows] for field in fields}
+    assert _same_results(score_columns(columns, _base(), first_row_id=5), expected)
+
+    # Unhashable cells cannot be grouped and fall back to row-by-row scoring.
+    columns["y1"] = [[value] for value in columns["y1"]]
+    assert all(bucket == ERROR_BUCKET for bucket in score_columns(columns, _base())["bucket"])
@@ -0,0 +1,77 @@
+import json
+import math
+
+import pytest
+
+from sodium_uncertainty.cache import ResponseCache, canonical_key
+from sodium_uncertainty.calculator import compute_from_json, compute_payload
+from sodium_uncertainty.defaults import load_defaults
+
+
+def _payload(**overrides) -> dict:
+    payload = {
+        "y1": 128,
+        "y2": 133,
+        "context": "sequential_draws",
+        "method1": "central_lab_indirect_ISE",
+        "method2": "istat_direct_ISE",
+        "ci_level": 0.95,
+        "threshold": 2,
+        "params": load_defaults(),
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_cached_responses_match_uncached() -> None:
+    cache = ResponseCache(cache_json=True)
+    payload = _payload()
+    payload_json = json.dumps(payload)
+
+    assert cache.compute_payload(payload) == compute_payload(payload)
+    assert cache.compute_from_json(payload_json) == compute_from_json(payload_json)
+    assert cache.compute_from_json(payload_json) == compute_from_json(payload_json)
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_numeric_normalization_shares_entries() -> None:
+    cache = ResponseCache()
+    first = cache.compute_payload(_payload(y1="128", threshold="2"))
+    second = cache.compute_payload(_payload(y1=128.0, threshold=2))
+
+    assert first is second
+    assert len(cache) == 1
+    assert canonical_key(_payload(scale_with_na=True)) != canonical_key(_payload(scale_with_na=1))
+
+
+def test_changed_defaults_miss() -> None:
+    cache = ResponseCache()
+    cache.compute_payload(_payload())
+    params = load_defaults()
+    params["defaults"]["sequential_draws"]["istat_direct_ISE"]["sigma"] = 3.0
+
+    result = cache.compute_payload(_payload(params=params))
+
+    assert cache.stats()["misses"] == 2
+    assert result == compute_payload(_payload(params=params))
+
+
+def test_lru_eviction_and_bypass() -> None:
+    cache = ResponseCache(max_entries=2)
+    for y2 in (130, 131, 130, 132):
+        cache.compute_payload(_payload(y2=y2))
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 3, 1)
+    cache.compute_payload(_payload(y2=131))
+    assert cache.stats()["misses"] == 4
+
+    bypassed = _payload(y1=math.nan)
+    assert cache.compute_payload(bypassed).keys() == compute_payload(bypassed).keys()
+    assert cache.stats()["bypassed"] == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    with pytest.raises(ValueError, match="at least 1"):
+        ResponseCache(max_entries=0)
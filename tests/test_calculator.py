@@ -3,9 +3,18 @@ import math
 
 import pytest
 
-from sodium_uncertainty.calculator import compute_from_json, compute_payload
+from sodium_uncertainty.calculator import (
+    RESOLUTION_BOUNDS_MESSAGE,
+    RESOLUTION_MESSAGE,
+    compute_from_json,
+    compute_payload,
+)
 from sodium_uncertainty.defaults import load_defaults, resolve_sigma
-from sodium_uncertainty.model import chance_probability_under_null, loa_half_pair_to_sigma
+from sodium_uncertainty.model import (
+    chance_probability_under_null,
+    loa_half_pair_to_sigma,
+    rounded_chance_under_null,
+)
 
 CENTRAL = "central_lab_indirect_ISE"
 ISTAT = "istat_direct_ISE"
@@ -106,3 +115,123 @@ def test_cv_scaling_reports_scaled_sigmas_and_factors() -> None:
     assert result["details"]["sigma1"] == pytest.approx(raw_sigma1 * (126 / 140))
     assert result["details"]["sigma2"] == pytest.approx(raw_sigma2)
     assert result["details"]["entry1"]["sigma_raw"] == pytest.approx(raw_sigma1)
+
+
+def test_unknown_context_and_method_return_readable_errors() -> None:
+    payload = _payload("sequential_draws")
+    payload["method2"] = "unknown_analyzer"
+    assert compute_payload(payload)["errors"] == [
+        "Variability parameters are missing for the selected context or method."
+    ]
+
+    payload = _payload("not_a_context")
+    assert compute_payload(payload)["errors"] == ["Invalid context selection."]
+
+
+def test_precision_profile_sigma_replaces_cv_scaling_and_is_reported() -> None:
+    payload = _payload("sequential_draws")
+    payload.update({"y1": 125, "y2": 140, "method2": ISTAT, "scale_with_na": True})
+    payload["params"]["defaults"]["sequential_draws"][CENTRAL] = {
+        "precision_profile": {"kind": "sigma", "points": [[110, 3.0], [140, 2.0]]}
+    }
+
+    result = compute_payload(payload)
+    entry1 = result["details"]["entry1"]
+
+    assert result["errors"] == []
+    assert result["details"]["sigma1"] == pytest.approx(2.5)
+    assert entry1["scale_factor"] == pytest.approx(1.0)
+    assert entry1["precision_profile"] == {
+        "kind": "sigma",
+        "sigma_interpolated": pytest.approx(2.5),
+        "anchors": [[110.0, 3.0], [140.0, 2.0]],
+    }
+    assert "precision_profile" not in result["details"]["entry2"]
+    assert result["details"]["entry2"]["scale_factor"] == pytest.approx(1.0)
+
+
+def test_exceedance_curve_matches_single_threshold_calls() -> None:
+    payload = _payload()
+    payload["exceedance_thresholds"] = [0, 2, 6, 8, 10]
+    result = compute_payload(payload)
+
+    exceedance = result["exceedance"]
+    assert exceedance["thresholds"] == [0.0, 2.0, 6.0, 8.0, 10.0]
+    for threshold, probability in zip(
+        exceedance["thresholds"], exceedance["delta_true"], strict=True
+    ):
+        single = compute_payload({**_payload(), "threshold": threshold})
+        assert probability == pytest.approx(single["probabilities"]["delta_abs_gt_threshold"])
+    assert exceedance["delta_null"][0] == pytest.approx(1.0)
+    assert exceedance["delta_null"] == sorted(exceedance["delta_null"], reverse=True)
+
+    default = compute_payload(_payload())["exceedance"]
+    assert default["thresholds"][0] == 0.0
+    assert default["thresholds"][-1] == 15.0
+
+
+def test_invalid_exceedance_thresholds_are_reported() -> None:
+    for value in ("2,4", [1, -1], ["x"], list(range(1001))):
+        result = compute_payload({**_payload(), "exceedance_thresholds": value})
+        assert result["errors"]
+        assert "exceedance thresholds" in result["errors"][0].lower()
+
+
+@pytest.mark.parametrize("context", ["sequential_draws", "analytic_repeatability"])
+def test_parametric_curves_describe_the_sampled_curves(context: str) -> None:
+    points = compute_payload(_payload(context))
+    result = compute_payload({**_payload(context), "curve_mode": "parametric"})
+
+    assert result["curve_mode"] == "parametric"
+    assert len(json.dumps(result["curves"])) < len(json.dumps(points["curves"])) / 50
+    for name, spec in result["curves"].items():
+        curve = points["curves"][name]
+        if spec["family"] == "degenerate":
+            assert spec["sd"] <= 0
+            assert curve["y"] == [0.0, 1.0, 0.0]
+            continue
+        assert spec["family"] == "normal"
+        assert curve["x"][0] == pytest.approx(spec["mean"] - spec["span_sd"] * spec["sd"])
+        assert max(curve["y"]) == pytest.approx(1 / (spec["sd"] * math.sqrt(2 * math.pi)))
+    assert {key: value for key, value in result.items() if key not in ("curves", "curve_mode")} == {
+        key: value for key, value in points.items() if key not in ("curves", "curve_mode")
+    }
+
+    invalid = compute_payload({**_payload(), "curve_mode": "svg"})
+    assert invalid["errors"] == ["Curve mode must be one of: points, parametric."]
+
+
+@pytest.mark.parametrize("context", ["sequential_draws", "analytic_repeatability"])
+def test_reporting_resolution_uses_discrete_null(context: str) -> None:
+    continuous = compute_payload(_payload(context))
+    result = compute_payload({**_payload(context), "resolution": 1})
+    sigma1, sigma2 = result["details"]["sigma1"], result["details"]["sigma2"]
+
+    chance = result["probabilities"]["chance_under_null"]
+    assert chance == rounded_chance_under_null(3.0, sigma1, sigma2, 1.0)
+    assert chance > continuous["probabilities"]["chance_under_null"]
+    assert result["details"]["resolution"] == 1.0
+    assert result["warnings"] == []
+    if context == "analytic_repeatability":
+        assert result["probabilities"]["same_sample_p"] == chance
+    assert result["delta_true"] == continuous["delta_true"]
+
+    fractional = compute_payload({**_payload(context), "y1": 130.4, "resolution": 1})
+    assert RESOLUTION_MESSAGE in fractional["warnings"]
+    assert compute_payload({**_payload(context), "resolution": 0})["errors"] == [
+        "Reporting resolution must be positive."
+    ]
+    convolution = compute_payload(
+        {**_payload(context), "resolution": 1, "error_engine": "convolution"}
+    )
+    assert "normal error engine" in convolution["errors"][0]
+
+
+@pytest.mark.parametrize("resolution", ["inf", 1e-5, 1e-12])
+def test_reporting_resolution_must_be_finite_and_not_too_fine(resolution) -> None:
+    result = compute_payload({**_payload(), "resolution": resolution})
+
+    assert result["errors"] == [RESOLUTION_BOUNDS_MESSAGE]
+    assert compute_payload({**_payload(), "resolution": "nan"})["errors"] == [
+        "Reporting resolution must be positive."
+    ]
@@ -0,0 +1,95 @@
+from array import array
+from pathlib import Path
+
+import pytest
+
+from sodium_uncertainty.columnar import ColumnarFile, ColumnarWriter, write_columns
+
+COLUMNS = (("row_id", "q"), ("value", "d"), ("code", "b"))
+
+
+def _write(path: Path, n_rows: int, chunk_size: int = 7) -> None:
+    with ColumnarWriter(path, COLUMNS, meta={"source": "synthetic"}) as writer:
+        for start in range(0, n_rows, chunk_size):
+            stop = min(start + chunk_size, n_rows)
+            writer.write(
+                {
+                    "row_id": array("q", range(start, stop)),
+                    "value": [index / 4 for index in range(start, stop)],
+                    "code": [index % 3 - 1 for index in range(start, stop)],
+                }
+            )
+
+
+def test_round_trip_exposes_zero_copy_column_views(tmp_path: Path) -> None:
+    path = tmp_path / "results.snacol"
+    _write(path, 53)
+
+    with ColumnarFile(path) as results:
+        assert results.n_rows == 53
+        assert results.column_names == ["row_id", "value", "code"]
+        assert results.meta == {"source": "synthetic"}
+        values = results.column("value")
+        assert isinstance(values, memoryview)
+        assert values.readonly
+        assert values.format == "d"
+        assert values[52] == 13.0
+        assert list(results.column("code"))[:4] == [-1, 0, 1, -1]
+        assert results.row(-1) == {"row_id": 52, "value": 13.0, "code": 0}
+        with pytest.raises(KeyError):
+            results.column("missing")
+
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["results.snacol"]
+
+
+def test_column_data_is_aligned_for_casting(tmp_path: Path) -> None:
+    path = tmp_path / "odd.snacol"
+    write_columns(path, (("code", "b"), ("value", "d")), {"code": [1, 2, 3], "value": [0.5] * 3})
+
+    with ColumnarFile(path) as results:
+        assert results.column("value").tolist() == [0.5, 0.5, 0.5]
+        assert [entry["offset"] % 8 for entry in results.header["columns"]] == [0, 0]
+
+
+def test_numpy_view_shares_the_mapping(tmp_path: Path) -> None:
+    numpy = pytest.importorskip("numpy")
+    path = tmp_path / "results.snacol"
+    _write(path, 20)
+
+    results = ColumnarFile(path)
+    values = results.to_numpy("value")
+    assert values.dtype == numpy.dtype("<f8")
+    assert not values.flags.writeable
+    assert values[-1] == pytest.approx(19 / 4)
+    results.close()
+    assert values[-1] == pytest.approx(19 / 4)
+
+
+def test_failed_write_leaves_no_partial_files(tmp_path: Path) -> None:
+    path = tmp_path / "broken.snacol"
+    with pytest.raises(ValueError):
+        with ColumnarWriter(path, COLUMNS) as writer:
+            writer.write({"row_id": [1, 2], "value": [1.0], "code": [0, 0]})
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_files_without_magic(tmp_path: Path) -> None:
+    path = tmp_path / "not_columns.bin"
+    path.write_bytes(b"0" * 64)
+
+    with pytest.raises(ValueError):
+        ColumnarFile(path)
+
+
+def test_close_tolerates_views_the_caller_still_holds(tmp_path: Path) -> None:
+    path = tmp_path / "results.snacol"
+    _write(path, 20)
+
+    results = ColumnarFile(path)
+    head = results.column("value")[:3]
+    results.close()
+
+    assert results._file.closed
+    assert head.tolist() == [0.0, 0.25, 0.5]
+    results.close()
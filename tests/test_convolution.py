@@ -0,0 +1,143 @@
+import math
+
+import pytest
+
+from sodium_uncertainty.calculator import compute_payload
+from sodium_uncertainty.convolution import (
+    _kernel_spectrum,
+    difference_distribution,
+    validate_error_model,
+)
+from sodium_uncertainty.defaults import load_defaults, validate_defaults
+from sodium_uncertainty.model import normal_ci, two_sided_tail
+from sodium_uncertainty.validation import (
+    INVALID_ERROR_ENGINE,
+    PARAMS_INVALID,
+    error_messages,
+    validate_columns,
+)
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _payload(**overrides) -> dict:
+    payload = {
+        "y1": 128,
+        "y2": 133,
+        "context": "sequential_draws",
+        "method1": CENTRAL,
+        "method2": ISTAT,
+        "ci_level": 0.95,
+        "threshold": 2,
+        "params": load_defaults(),
+        "error_engine": "convolution",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_normal_kernels_reproduce_closed_form() -> None:
+    noise = difference_distribution(None, 1.2, None, 1.6)
+
+    assert noise.mean == pytest.approx(0.0, abs=1e-9)
+    assert noise.sd == pytest.approx(2.0, abs=1e-3)
+    assert noise.prob_abs_ge(3.0) == pytest.approx(two_sided_tail(3.0, 2.0), abs=1e-3)
+    low, high = noise.interval(0.95)
+    expected_low, expected_high = normal_ci(0.0, 2.0, 0.95)
+    assert low == pytest.approx(expected_low, abs=5e-3)
+    assert high == pytest.approx(expected_high, abs=5e-3)
+
+
+def test_heavy_tailed_and_mixture_models_change_tails() -> None:
+    t_noise = difference_distribution({"family": "t", "df": 3}, 1.2, {"family": "t", "df": 3}, 1.6)
+    normal_noise = difference_distribution(None, 1.2, None, 1.6)
+    assert t_noise.prob_abs_ge(6.0) > 3 * normal_noise.prob_abs_ge(6.0)
+
+    shifted = {"family": "mixture", "components": [{"weight": 1, "scale": 1, "shift": 1.5}]}
+    mixture_noise = difference_distribution(None, 1.2, shifted, 1.6)
+    assert mixture_noise.mean == pytest.approx(1.5, abs=1e-6)
+
+
+def test_empirical_histogram_ignores_sigma() -> None:
+    histogram = {"family": "empirical", "start": -2.5, "bin_width": 1, "counts": [1, 4, 10, 4, 1]}
+    noise = difference_distribution(histogram, 9.0, histogram, 0.1)
+
+    variance = sum(c * x * x for c, x in zip([1, 4, 10, 4, 1], [-2, -1, 0, 1, 2], strict=True)) / 20
+    assert noise.mean == pytest.approx(0.0, abs=1e-9)
+    assert noise.sd == pytest.approx(math.sqrt(2 * (variance + 1 / 12)), abs=1e-3)
+
+
+def test_kernels_are_cached_per_method_and_sigma() -> None:
+    _kernel_spectrum.cache_clear()
+    difference_distribution(None, 1.25, {"family": "t", "df": 5}, 1.75)
+    difference_distribution(None, 1.25, {"family": "t", "df": 5}, 1.75)
+
+    info = _kernel_spectrum.cache_info()
+    assert info.misses == 2
+    assert info.hits == 2
+
+
+def test_convolution_engine_in_compute_payload() -> None:
+    params = load_defaults()
+    params["defaults"]["sequential_draws"][ISTAT]["error_model"] = {"family": "t", "df": 4}
+    validate_defaults(params)
+
+    normal = compute_payload(_payload(params=params, y2=140, error_engine="normal"))
+    result = compute_payload(_payload(params=params, y2=140))
+
+    assert result["errors"] == []
+    assert result["details"]["error_engine"] == "convolution"
+    assert result["delta_true"]["mean"] == pytest.approx(12.0, abs=1e-6)
+    assert result["delta_true"]["sd"] == pytest.approx(normal["delta_true"]["sd"], rel=1e-2)
+    # Same SD, heavier tails: a 12 mmol/L change is less surprising than under normality.
+    chance = result["probabilities"]["chance_under_null"]
+    assert chance > normal["probabilities"]["chance_under_null"]
+    assert len(result["curves"]["delta_true"]["x"]) == 401
+    parametric = compute_payload(_payload(params=params, y2=140, curve_mode="parametric"))
+    assert parametric["curves"]["delta_true"] == {
+        "family": "sampled",
+        **result["curves"]["delta_true"],
+    }
+    assert parametric["curves"]["na1"]["family"] == "normal"
+    assert [entry["level"] for entry in result["intervals"]["delta_null"]] == [0.5, 0.95, 0.99]
+    exceedance = result["exceedance"]
+    at_threshold = exceedance["delta_true"][exceedance["thresholds"].index(2.0)]
+    assert at_threshold == pytest.approx(result["probabilities"]["delta_abs_gt_threshold"])
+
+    analytic = compute_payload(_payload(context="analytic_repeatability"))
+    assert analytic["probabilities"]["same_sample_p"] == pytest.approx(
+        analytic["probabilities"]["chance_under_null"]
+    )
+
+
+def test_invalid_engine_and_models_are_reported() -> None:
+    assert compute_payload(_payload(error_engine="fft"))["errors"] == [
+        "Invalid error engine selection."
+    ]
+    with pytest.raises(ValueError, match="greater than 2"):
+        validate_error_model({"family": "t", "df": 2}, "ctx/method")
+    with pytest.raises(ValueError, match="outside the error grid"):
+        validate_error_model(
+            {"family": "empirical", "start": 40, "bin_width": 1, "counts": [1]}, "ctx/method"
+        )
+
+    params = load_defaults()
+    params["defaults"]["sequential_draws"][ISTAT]["error_model"] = {"family": "cauchy"}
+    assert "family" in compute_payload(_payload(params=params))["errors"][0]
+
+    validation = validate_columns(
+        {
+            "y1": 128,
+            "y2": 133,
+            "context": "sequential_draws",
+            "method1": CENTRAL,
+            "method2": ISTAT,
+            "ci_level": 0.95,
+            "threshold": 2,
+            "params": params,
+            "error_engine": ["normal", "convolution", "fft"],
+        }
+    )
+    assert list(validation.error_mask) == [0, PARAMS_INVALID, INVALID_ERROR_ENGINE]
+    assert error_messages(INVALID_ERROR_ENGINE) == ["Invalid error engine selection."]
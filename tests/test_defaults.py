@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from sodium_uncertainty.defaults import load_defaults, resolve_sigma
+from sodium_uncertainty.defaults import load_defaults, params_hash, resolve_sigma
 from sodium_uncertainty.model import loa_half_pair_to_sigma
 
 
@@ -38,3 +38,11 @@ def test_resolve_sigma_from_loa() -> None:
     data = load_defaults()
     sigma = resolve_sigma(data, "analytic_repeatability", "central_lab_indirect_ISE")
     assert sigma == pytest.approx(loa_half_pair_to_sigma(2.8))
+
+
+def test_params_hash_ignores_key_order_but_not_values() -> None:
+    data = load_defaults()
+    reordered = json.loads(json.dumps(data, sort_keys=True))
+    assert params_hash(reordered) == params_hash(data)
+    data["defaults"]["analytic_repeatability"]["central_lab_indirect_ISE"]["sigma"] = 1.5
+    assert params_hash(data) != params_hash(reordered)
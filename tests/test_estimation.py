@@ -0,0 +1,156 @@
+import csv
+import math
+import random
+import statistics
+from pathlib import Path
+
+import pytest
+
+from sodium_uncertainty.defaults import load_defaults, resolve_sigma
+from sodium_uncertainty.estimation import (
+    SKIPPED_ZERO_SPREAD,
+    ReplicateMoments,
+    accumulate_files,
+    accumulate_pairs,
+    build_defaults,
+    main,
+    merge_moments,
+    write_defaults,
+)
+from sodium_uncertainty.model import loa_half_pair_to_sigma
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _synthetic_pairs(seed: int, n: int, sigma: float) -> list[tuple[str, str, float, float]]:
+    rng = random.Random(seed)
+    rows = []
+    for index in range(n):
+        method = CENTRAL if index % 2 else ISTAT
+        true_na = rng.uniform(120, 155)
+        rows.append(
+            (
+                "analytic_repeatability",
+                method,
+                true_na + rng.gauss(0, sigma),
+                true_na + rng.gauss(0, sigma),
+            )
+        )
+    return rows
+
+
+def _write_csv(path: Path, rows: list[tuple]) -> None:
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["patient", "context", "method", "y1", "y2"])
+        for context, method, y1, y2 in rows:
+            writer.writerow(["synthetic", context, method, y1, y2])
+
+
+def test_welford_moments_match_direct_statistics() -> None:
+    rows = _synthetic_pairs(1, 500, 1.0)
+    moments = accumulate_pairs(rows)[("analytic_repeatability", CENTRAL)]
+    diffs = [y2 - y1 for _c, method, y1, y2 in rows if method == CENTRAL]
+
+    assert moments.n == len(diffs)
+    assert moments.bias == pytest.approx(statistics.fmean(diffs))
+    assert moments.sd_diff == pytest.approx(statistics.stdev(diffs))
+    assert moments.loa_half_pair == pytest.approx(1.96 * statistics.stdev(diffs))
+
+
+def test_merged_partial_moments_equal_single_pass() -> None:
+    rows = _synthetic_pairs(2, 900, 1.2)
+    whole = accumulate_pairs(rows)
+    parts = [accumulate_pairs(rows[start : start + 250]) for start in range(0, 900, 250)]
+    merged = merge_moments(*parts)
+
+    assert merged.keys() == whole.keys()
+    for key, moments in whole.items():
+        assert merged[key].n == moments.n
+        assert merged[key].bias == pytest.approx(moments.bias, abs=1e-12)
+        assert merged[key].sd_diff == pytest.approx(moments.sd_diff, rel=1e-12)
+        assert merged[key].min_level == moments.min_level
+    assert ReplicateMoments().merge(whole[key]).n == whole[key].n
+
+
+def test_file_pipeline_in_parallel_matches_serial(tmp_path: Path) -> None:
+    paths = []
+    for seed in range(3):
+        path = tmp_path / f"pairs_{seed}.csv"
+        _write_csv(path, _synthetic_pairs(seed, 200, 1.0) + [("sequential_draws", ISTAT, "x", 1)])
+        paths.append(path)
+
+    serial = accumulate_files(paths)
+    parallel = accumulate_files(paths, workers=2)
+
+    assert ("sequential_draws", ISTAT) not in serial
+    for key, moments in serial.items():
+        assert parallel[key].n == moments.n
+        assert parallel[key].sd_diff == pytest.approx(moments.sd_diff, rel=1e-12)
+
+
+def test_recovers_sigma_and_writes_loadable_defaults(tmp_path: Path) -> None:
+    sigma = 1.1
+    moments = accumulate_pairs(_synthetic_pairs(7, 20000, sigma))
+    data = build_defaults(moments)
+    path = tmp_path / "defaults.json"
+    write_defaults(data, path)
+
+    loaded = load_defaults(path)
+    estimated = resolve_sigma(loaded, "analytic_repeatability", CENTRAL)
+    assert estimated == pytest.approx(sigma, rel=0.03)
+    assert loaded["defaults"]["analytic_repeatability"][CENTRAL]["estimate"]["n_pairs"] == 10000
+
+
+def test_constant_cv_fit_recovers_concentration_dependent_sigma() -> None:
+    rng = random.Random(11)
+    cv = 0.01
+    rows = []
+    for _ in range(20000):
+        level = rng.uniform(110, 170)
+        rows.append(
+            (
+                "sequential_draws",
+                CENTRAL,
+                rng.gauss(level, cv * level),
+                rng.gauss(level, cv * level),
+            )
+        )
+    moments = accumulate_pairs(rows)
+
+    data = build_defaults(moments, fit_cv=True, na_ref=140)
+    entry = data["defaults"]["sequential_draws"][CENTRAL]
+
+    assert entry["estimate"]["cv"] == pytest.approx(cv, rel=0.03)
+    assert loa_half_pair_to_sigma(entry["loa_half_pair"]) == pytest.approx(cv * 140, rel=0.03)
+
+
+def test_min_pairs_and_invalid_inputs() -> None:
+    moments = accumulate_pairs([("sequential_draws", CENTRAL, 140, 141), ("c", "m", "nan", 1)])
+    assert build_defaults(moments, min_pairs=2)["defaults"] == {}
+    with pytest.raises(ValueError):
+        ReplicateMoments().sd_diff  # noqa: B018
+    assert math.isinf(ReplicateMoments().min_level)
+
+
+def test_zero_spread_combinations_are_skipped_not_fatal() -> None:
+    rows = [("sequential_draws", CENTRAL, 140, 140), ("sequential_draws", CENTRAL, 133, 133)]
+    rows += [("sequential_draws", ISTAT, 140, 141), ("sequential_draws", ISTAT, 135, 133)]
+    for fit_cv in (False, True):
+        data = build_defaults(accumulate_pairs(rows), fit_cv=fit_cv)
+
+        assert list(data["defaults"]["sequential_draws"]) == [ISTAT]
+        skipped = data["skipped"]["sequential_draws"][CENTRAL]
+        assert (skipped["n_pairs"], skipped["skipped"]) == (2, SKIPPED_ZERO_SPREAD)
+
+
+def test_cli_writes_defaults(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    source = tmp_path / "pairs.csv"
+    _write_csv(source, _synthetic_pairs(3, 100, 1.0))
+    output = tmp_path / "out.json"
+
+    main([str(source), "--output", str(output)])
+
+    assert load_defaults(output)["defaults"]["analytic_repeatability"][ISTAT]
+    assert "loa_half_pair=" in capsys.readouterr().out
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import sodium_uncertainty
+from sodium_uncertainty import calculator, model
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Wall-clock budget (microseconds) for a cold import plus the first compute_from_json call,
+# timed inside the subprocess so interpreter startup is excluded; about 3x the measured cost.
+FIRST_COMPUTE_BUDGET_US = 250_000
+HEAVY_MODULES = (
+    "argparse",
+    "concurrent.futures",
+    "csv",
+    "decimal",
+    "fractions",
+    "hashlib",
+    "mmap",
+    "numpy",
+    "random",
+    "statistics",
+)
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": str(SRC), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+FIRST_COMPUTE = (
+    "import json\n"
+    "from sodium_uncertainty import compute_from_json, load_defaults\n"
+    "compute_from_json(json.dumps({'params': load_defaults(), 'y1': 130, 'y2': 133,"
+    " 'ci_level': 0.95, 'threshold': 2, 'context': 'sequential_draws',"
+    " 'method1': 'central_lab_indirect_ISE', 'method2': 'istat_direct_ISE'}))\n"
+)
+
+
+def test_package_import_loads_no_submodules() -> None:
+    result = _run(
+        "import sys, sodium_uncertainty;"
+        "print(sorted(m for m in sys.modules if m.startswith('sodium_uncertainty')))"
+    )
+
+    assert result.stdout.strip() == "['sodium_uncertainty']"
+
+
+def test_first_compute_stays_within_budget() -> None:
+    # Times everything the first call pays for, including the submodules and stdlib modules
+    # that lazy exports load through import_module, which -X importtime does not attribute.
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{FIRST_COMPUTE}"
+        "print(round((time.perf_counter() - start) * 1e6))"
+    )
+    timings = [int(_run(code).stdout) for _ in range(3)]
+
+    assert 0 < min(timings) < FIRST_COMPUTE_BUDGET_US, timings
+
+
+def test_hot_path_avoids_heavy_modules() -> None:
+    result = _run(
+        f"import sys\n{FIRST_COMPUTE}print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_lazy_exports_resolve_to_submodule_objects() -> None:
+    assert sodium_uncertainty.compute_from_json is calculator.compute_from_json
+    assert sodium_uncertainty.normal_sf is model.normal_sf
+    assert set(sodium_uncertainty.__all__) <= set(dir(sodium_uncertainty))
+    for name in sodium_uncertainty.__all__:
+        assert getattr(sodium_uncertainty, name) is not None
+    with pytest.raises(AttributeError):
+        _ = sodium_uncertainty.not_an_export
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from sodium_uncertainty.calculator import compute_from_json
+from sodium_uncertainty.defaults import load_defaults
+from sodium_uncertainty.memprofile import SAMPLE_PAYLOAD, main, profile_batch, profile_request
+
+# Per-request allocation budgets (bytes above the pre-call baseline, warm caches); roughly 1.5-3x
+# the measured peaks, so a regression that copies curves or responses trips them.
+POINTS_PEAK_BUDGET = 1024 * 1024
+PARAMETRIC_PEAK_BUDGET = 96 * 1024
+EVALUATE_PEAK_BUDGET = 16 * 1024
+BATCH_BYTES_PER_ROW_BUDGET = 128
+
+
+def _payload_json(**overrides) -> str:
+    payload_json = json.dumps({**SAMPLE_PAYLOAD, "params": load_defaults(), **overrides})
+    compute_from_json(payload_json)
+    return payload_json
+
+
+@pytest.mark.parametrize(
+    ("curve_mode", "budget"),
+    [("points", POINTS_PEAK_BUDGET), ("parametric", PARAMETRIC_PEAK_BUDGET)],
+)
+def test_request_stays_within_allocation_budget(curve_mode: str, budget: int) -> None:
+    payload_json = _payload_json(curve_mode=curve_mode)
+    response, profile = profile_request(payload_json)
+
+    assert response == compute_from_json(payload_json)
+    stages = {stats.stage: stats for stats in profile}
+    assert list(stages) == ["parse", "evaluate", "respond", "serialize"]
+    assert max(stats.peak for stats in profile) < budget
+    assert stages["evaluate"].peak < EVALUATE_PEAK_BUDGET
+    assert all(stats.peak >= stats.net for stats in profile)
+    if curve_mode == "points":
+        assert any("model.py" in site.location for site in stages["respond"].top)
+
+
+def test_batch_chunks_stay_within_per_row_budget() -> None:
+    payload = json.loads(_payload_json())
+    profile = profile_batch([payload] * 2500, chunk_size=1000, top=0)
+
+    assert [stats.stage for stats in profile] == [
+        "chunk 0 (1000 rows)",
+        "chunk 1 (1000 rows)",
+        "chunk 2 (500 rows)",
+    ]
+    for stats, rows in zip(profile, (1000, 1000, 500), strict=True):
+        assert stats.peak / rows < BATCH_BYTES_PER_ROW_BUDGET
+
+
+def test_cli_prints_stage_table(capsys: pytest.CaptureFixture[str]) -> None:
+    main(["--top", "1"])
+    output = capsys.readouterr().out
+    assert output.splitlines()[0].split() == ["stage", "peak", "KiB", "net", "KiB"]
+    assert "respond" in output and "serialize" in output
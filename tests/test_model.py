@@ -4,15 +4,28 @@ from statistics import NormalDist
 import pytest
 
 from sodium_uncertainty.model import (
+    MAX_NULL_STEPS,
+    abs_exceedance,
     chance_probability_under_null,
     loa_half_pair_to_sigma,
+    make_curve,
+    normal_cdf,
+    normal_ci,
+    normal_pdf,
+    normal_sf,
     posterior_same_sample,
     posterior_sequential_draws,
     qualitative_bucket,
+    rounded_chance_under_null,
+    rounded_null_tails,
     same_sample_p_value,
     sigma_to_loa_half_pair,
+    standard_normal_ppf,
+    two_sided_tail,
 )
 
+KERNEL_GRID = [i / 4 for i in range(-160, 161)]
+
 
 def test_loa_half_pair_round_trip() -> None:
     loa_half = 3.0
@@ -93,3 +106,99 @@ def test_qualitative_bucket(p_value: float, key: str) -> None:
 def test_invalid_loa_raises() -> None:
     with pytest.raises(ValueError):
         loa_half_pair_to_sigma(0.0)
+
+
+@pytest.mark.parametrize(("mean", "sd"), [(0.0, 1.0), (133.0, 2.09), (-4.0, 0.35), (3.0, 7.5)])
+def test_normal_kernels_match_normal_dist(mean: float, sd: float) -> None:
+    reference = NormalDist(mu=mean, sigma=sd)
+    for z in KERNEL_GRID:
+        x = mean + z * sd
+        assert normal_cdf(x, mean, sd) == pytest.approx(reference.cdf(x), rel=1e-12, abs=1e-15)
+        assert normal_sf(x, mean, sd) == pytest.approx(1 - reference.cdf(x), abs=1e-15)
+        assert normal_pdf(x, mean, sd) == pytest.approx(reference.pdf(x), rel=1e-12, abs=1e-300)
+
+
+def test_normal_sf_keeps_relative_precision_in_far_upper_tail() -> None:
+    # Reference values from the closed form Q(z) = erfc(z / sqrt(2)) / 2.
+    assert normal_sf(10.0, 0.0, 1.0) == pytest.approx(7.619853024160527e-24, rel=1e-12)
+    assert normal_sf(30.0, 0.0, 1.0) == pytest.approx(4.906713927148187e-198, rel=1e-12)
+    assert 1 - NormalDist().cdf(10.0) == 0.0
+    assert normal_cdf(-10.0, 0.0, 1.0) == pytest.approx(normal_sf(10.0, 0.0, 1.0), rel=1e-15)
+
+
+def test_two_sided_tail_matches_twice_upper_tail() -> None:
+    for z in KERNEL_GRID:
+        assert two_sided_tail(z, 1.0) == pytest.approx(2 * normal_sf(abs(z), 0.0, 1.0), rel=1e-14)
+    assert chance_probability_under_null(40.0, 2.0) > 0.0
+    assert same_sample_p_value(130.0, 160.0, 1.0, 1.0) > 0.0
+
+
+@pytest.mark.parametrize("p", [1e-300, 1e-20, 1e-6, 0.01, 0.025, 0.3, 0.5, 0.8, 0.975, 1 - 1e-12])
+def test_standard_normal_ppf_matches_normal_dist(p: float) -> None:
+    assert standard_normal_ppf(p) == pytest.approx(NormalDist().inv_cdf(p), rel=1e-15, abs=1e-15)
+
+
+@pytest.mark.parametrize("level", [0.5, 0.8, 0.95, 0.99])
+def test_normal_ci_matches_normal_dist_quantiles(level: float) -> None:
+    z = NormalDist().inv_cdf(1 - (1 - level) / 2)
+    low, high = normal_ci(140.0, 2.0, level)
+    assert low == pytest.approx(140.0 - 2.0 * z, rel=1e-15)
+    assert high == pytest.approx(140.0 + 2.0 * z, rel=1e-15)
+
+
+def test_make_curve_matches_pointwise_pdf() -> None:
+    curve = make_curve(131.5, 1.7)
+    assert len(curve["x"]) == len(curve["y"]) == 401
+    for x, y in zip(curve["x"], curve["y"], strict=True):
+        assert y == pytest.approx(NormalDist(mu=131.5, sigma=1.7).pdf(x), rel=1e-12)
+
+
+def test_abs_exceedance_matches_tail_sums() -> None:
+    thresholds = [0.0, 0.5, 2.0, 6.0, 15.0]
+    values = abs_exceedance(3.0, 1.7, thresholds)
+    for threshold, value in zip(thresholds, values, strict=True):
+        expected = normal_sf(threshold, 3.0, 1.7) + normal_cdf(-threshold, 3.0, 1.7)
+        assert value == pytest.approx(expected, rel=1e-12)
+    assert abs_exceedance(0.0, 2.0, [4.0])[0] == pytest.approx(two_sided_tail(4.0, 2.0))
+    assert abs_exceedance(3.0, 0.0, [2.0, 3.0]) == [1.0, 0.0]
+
+
+def _rounded_tail_by_quadrature(steps: int, sd: float, resolution: float) -> float:
+    # Average the continuous two-sided tail over the true value's offset within a step.
+    n = 2000
+    total = 0.0
+    for index in range(n):
+        offset = (index + 0.5) / n * resolution - resolution / 2
+        edge = steps * resolution - resolution / 2
+        total += normal_sf(edge - offset, 0.0, sd) + normal_cdf(-edge - offset, 0.0, sd)
+    return total / n
+
+
+def test_rounded_null_tails_match_direct_integration() -> None:
+    tails = rounded_null_tails(1.2, 0.9, 1.0)
+    sd = math.sqrt(1.2**2 + 0.9**2)
+    assert tails[0] == 1.0
+    for steps in range(1, 8):
+        expected = _rounded_tail_by_quadrature(steps, sd, 1.0)
+        assert tails[steps] == pytest.approx(expected, rel=1e-5)
+    assert all(left > right for left, right in zip(tails, tails[1:], strict=False))
+    assert rounded_chance_under_null(-3.0, 1.2, 0.9, 1.0) == tails[3]
+    assert rounded_chance_under_null(500.0, 1.2, 0.9, 1.0) == 0.0
+    # Integer reporting makes a 1 mmol/L change far more common than the continuous model says.
+    assert tails[1] > chance_probability_under_null(1.0, sd) + 0.2
+    fine = rounded_null_tails(1.2, 0.9, 0.001)
+    assert fine[2000] == pytest.approx(chance_probability_under_null(2.0, sd), rel=1e-3)
+    with pytest.raises(ValueError, match="resolution"):
+        rounded_null_tails(1.2, 0.9, 0.0)
+
+
+def test_rounded_null_table_is_capped_and_evaluated_past_the_cap() -> None:
+    sd = math.sqrt(1.2**2 + 0.9**2)
+    fine = rounded_null_tails(1.2, 0.9, 1e-4)
+    assert len(fine) == MAX_NULL_STEPS + 1
+    # Past the table the tail is computed step by step and still tracks the continuous one.
+    chance = rounded_chance_under_null(2.0, 1.2, 0.9, 1e-4)
+    assert chance == pytest.approx(chance_probability_under_null(2.0, sd), rel=1e-3)
+    assert rounded_chance_under_null(math.inf, 1.2, 0.9, 1.0) == 0.0
+    with pytest.raises(ValueError, match="finite"):
+        rounded_null_tails(1.2, 0.9, math.inf)
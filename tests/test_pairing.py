@@ -0,0 +1,120 @@
+import csv
+
+import pytest
+
+from sodium_uncertainty.batch import iter_column_payloads, score_columns, score_payloads
+from sodium_uncertainty.defaults import load_defaults
+from sodium_uncertainty.pairing import (
+    iter_pair_chunks,
+    main,
+    match_pairs,
+    parse_results,
+    parse_time,
+    score_pairs,
+)
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+FEED = [
+    ("b", "2024-01-01T08:00", 131, CENTRAL),
+    ("a", 10, 125, ISTAT),
+    ("a", 0, 120, CENTRAL),
+    ("a", 4, 122, CENTRAL),
+    ("b", "2024-01-01T06:00", 130, ISTAT),
+    ("a", 40, 130, CENTRAL),
+    ("a", "later", 150, CENTRAL),
+]
+
+
+def _brute_force(results, min_hours, max_hours):
+    ordered = sorted(results)
+    pairs = []
+    for index, (patient, t1, _y1, _m1) in enumerate(ordered):
+        for other, t2, _y2, _m2 in ordered[index + 1 :]:
+            if patient == other and min_hours <= t2 - t1 <= max_hours:
+                pairs.append((patient, t1, t2))
+    return sorted(pairs)
+
+
+def test_parse_time_accepts_hours_and_iso() -> None:
+    assert parse_time("1.5") == 1.5
+    assert parse_time("1970-01-02T00:00:00+00:00") == 24.0
+    with pytest.raises(ValueError):
+        parse_time("yesterday")
+
+
+def test_consecutive_pairs_with_elapsed_and_rate() -> None:
+    pairs = match_pairs(parse_results(FEED))
+
+    assert list(pairs.patient_id) == ["a", "a", "b"]
+    assert list(pairs.elapsed_hours) == [4.0, 6.0, 2.0]
+    assert list(pairs.y1) == [120.0, 122.0, 130.0]
+    assert list(pairs.method2) == [CENTRAL, ISTAT, CENTRAL]
+    assert pairs.delta_per_hour[1] == pytest.approx(0.5)
+
+    tagged = match_pairs(parse_results(FEED), method2=ISTAT)
+    assert list(tagged.y2) == [125.0]
+
+
+def test_window_pairs_match_brute_force() -> None:
+    results = [("p", float(t), 130.0 + t % 3, CENTRAL) for t in (0, 1, 1, 3, 7, 8, 20, 21, 45)]
+    results += [("q", float(t), 135.0, ISTAT) for t in (2, 5, 6)]
+    for min_hours, max_hours in ((0, 24), (1, 6), (4, 4), (0, 0)):
+        pairs = match_pairs(results, mode="window", min_hours=min_hours, max_hours=max_hours)
+        found = sorted(zip(pairs.patient_id, pairs.t1, pairs.t2, strict=True))
+        assert found == _brute_force(results, min_hours, max_hours)
+
+    chunks = list(iter_pair_chunks(results, mode="window", chunk_size=4))
+    assert [len(chunk) for chunk in chunks[:-1]] == [4] * (len(chunks) - 1)
+    with pytest.raises(ValueError, match="sorted"):
+        list(iter_pair_chunks(list(reversed(results)), presorted=True))
+    interleaved = [
+        ("A", 0.0, 140.0, CENTRAL),
+        ("B", 0.0, 140.0, CENTRAL),
+        ("A", 1.0, 141.0, CENTRAL),
+    ]
+    assert len(match_pairs(interleaved, max_hours=24)) == 1
+    with pytest.raises(ValueError, match="sorted"):
+        match_pairs(interleaved, max_hours=24, presorted=True)
+    with pytest.raises(ValueError, match="min_hours"):
+        match_pairs(results, min_hours=5, max_hours=1)
+
+
+def test_score_pairs_matches_payload_scoring() -> None:
+    params = load_defaults()
+    pairs = match_pairs(parse_results(FEED))
+    results = score_pairs(pairs, params)
+
+    base = {"context": "sequential_draws", "ci_level": 0.95, "threshold": 2, "params": params}
+    rows = zip(pairs.y1, pairs.y2, pairs.method1, pairs.method2, strict=True)
+    payloads = [
+        {**base, "y1": y1, "y2": y2, "method1": m1, "method2": m2} for y1, y2, m1, m2 in rows
+    ]
+    assert score_payloads(payloads) == results
+
+
+def test_column_payloads_reuse_one_dict() -> None:
+    payloads = iter_column_payloads({"y1": [1, 2], "context": "sequential_draws"})
+    first = next(payloads)
+    assert next(payloads) is first
+    assert first == {"y1": 2, "context": "sequential_draws"}
+    with pytest.raises(ValueError, match="same length"):
+        score_columns({"y1": [1, 2], "y2": [3]})
+
+
+def test_cli_writes_runner_ready_csv(tmp_path, capsys) -> None:
+    source = tmp_path / "results.csv"
+    with source.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["patient_id", "time", "value", "method"])
+        writer.writerows(FEED)
+    output = tmp_path / "pairs.csv"
+
+    main([str(source), str(output), "--mode", "window", "--max-hours", "12"])
+
+    with output.open(newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 4
+    assert {row["context"] for row in rows} == {"sequential_draws"}
+    assert "Wrote 4 pairs" in capsys.readouterr().out
@@ -0,0 +1,123 @@
+import json
+import math
+
+import pytest
+
+from sodium_uncertainty import panel
+from sodium_uncertainty.batch import ERROR_BUCKET, iter_payloads, score_payloads
+from sodium_uncertainty.defaults import load_defaults
+from sodium_uncertainty.panel import (
+    VALUE1_OUT_OF_RANGE,
+    VALUE2_OUT_OF_RANGE,
+    default_analytes,
+    load_analytes,
+    score_panel,
+)
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _panel_columns() -> dict:
+    return {
+        "method1": [CENTRAL, ISTAT, CENTRAL, CENTRAL],
+        "method2": [ISTAT, ISTAT, CENTRAL, "unknown"],
+        "sodium_1": [128, "131", 99, 140],
+        "sodium_2": [133, 130, 118, 141],
+        "potassium_1": [3.9, 4.1, "x", 4.0],
+        "potassium_2": [4.6, 4.0, 5.1, 4.2],
+    }
+
+
+def _close(left, right) -> bool:
+    return all(
+        (math.isnan(a) and math.isnan(b)) or a == pytest.approx(b, rel=1e-12, abs=1e-12)
+        for a, b in zip(left, right, strict=True)
+    )
+
+
+@pytest.mark.parametrize("context", ["sequential_draws", "analytic_repeatability"])
+@pytest.mark.parametrize("options", [{}, {"resolution": 1}, {"error_engine": "convolution"}])
+def test_sodium_panel_matches_batch_scoring(context: str, options: dict) -> None:
+    columns = _panel_columns()
+    panel_options = dict(options)
+    if "resolution" in options:
+        panel_options["resolution"] = {"sodium": options["resolution"]}
+    results = score_panel(columns, context=context, **panel_options)
+    assert set(results) == {"sodium", "potassium"}
+
+    rows = [
+        {"y1": y1, "y2": y2, "method1": m1, "method2": m2}
+        for y1, y2, m1, m2 in zip(
+            columns["sodium_1"],
+            columns["sodium_2"],
+            columns["method1"],
+            columns["method2"],
+            strict=True,
+        )
+    ]
+    base = {
+        "context": context,
+        "ci_level": 0.95,
+        "threshold": 2,
+        "params": load_defaults(),
+        **options,
+    }
+    expected = score_payloads(iter_payloads(rows, base))
+    for name, column in expected.items():
+        assert _close(results["sodium"][name], column), name
+    assert list(results["sodium"]["warning_mask"]) == [0, 0, VALUE1_OUT_OF_RANGE, 0]
+
+
+def test_other_analytes_use_their_own_profiles() -> None:
+    results = score_panel(_panel_columns(), analytes=["potassium"])
+    potassium = results["potassium"]
+
+    assert list(potassium["bucket"])[2:] == [ERROR_BUCKET, ERROR_BUCKET]
+    assert potassium["observed_delta"][0] == pytest.approx(0.7)
+    # A 0.7 mmol/L potassium rise is large relative to potassium noise.
+    assert potassium["chance_under_null"][0] < 0.05
+    scaled = score_panel(_panel_columns(), analytes=["potassium"], scale_with_level=True)
+    assert scaled["potassium"]["delta_true_sd"][0] != potassium["delta_true_sd"][0]
+    assert list(potassium["warning_mask"]) == [0, 0, 0, 0]
+    assert VALUE2_OUT_OF_RANGE == 2
+
+
+def test_convolved_noise_is_built_once_per_method_pair(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    original = panel._difference_noise
+
+    def counting(*args):
+        calls.append(args[2:4])
+        return original(*args)
+
+    monkeypatch.setattr(panel, "_difference_noise", counting)
+    columns = {
+        "method1": [CENTRAL, CENTRAL, ISTAT, CENTRAL],
+        "method2": [ISTAT, ISTAT, ISTAT, ISTAT],
+        "sodium_1": [128, 131, 140, 136],
+        "sodium_2": [133, 130, 141, 150],
+    }
+    results = score_panel(columns, error_engine="convolution")
+
+    assert sorted(calls) == [(CENTRAL, ISTAT), (ISTAT, ISTAT)]
+    assert ERROR_BUCKET not in results["sodium"]["bucket"]
+
+
+def test_registry_validation(tmp_path) -> None:
+    analytes = default_analytes()
+    assert {"sodium", "potassium", "chloride", "bicarbonate", "glucose"} <= set(analytes)
+    assert (analytes["sodium"].low, analytes["sodium"].high) == (100.0, 170.0)
+
+    path = tmp_path / "registry.json"
+    path.write_text(json.dumps({"analytes": {"k": {"defaults": {}, "reference": 4}}}))
+    with pytest.raises(ValueError, match="physiologic_range"):
+        load_analytes(path)
+    with pytest.raises(ValueError, match="Unknown analyte"):
+        score_panel(_panel_columns(), analytes=["lactate"])
+    with pytest.raises(ValueError, match="error engine"):
+        score_panel(_panel_columns(), error_engine="exact")
+    with pytest.raises(ValueError, match="only supported with the normal"):
+        score_panel(_panel_columns(), resolution=1, error_engine="convolution")
+    with pytest.raises(ValueError, match="at least"):
+        score_panel(_panel_columns(), resolution={"potassium": 1e-6})
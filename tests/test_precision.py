@@ -0,0 +1,82 @@
+import math
+
+import pytest
+
+from sodium_uncertainty.defaults import precision_table_for, validate_defaults
+from sodium_uncertainty.precision import compile_precision_profile, validate_precision_profile
+
+SIGMA_PROFILE = {"kind": "sigma", "points": [[110, 1.4], [140, 1.0], [160, 1.2]]}
+CV_PROFILE = {"kind": "cv", "points": [[120, 0.01], [150, 0.008]], "step": 0.01}
+
+
+def _exact_sigma(points: list[list[float]], x: float) -> float:
+    if x <= points[0][0]:
+        return points[0][1]
+    if x >= points[-1][0]:
+        return points[-1][1]
+    for (x0, y0), (x1, y1) in zip(points, points[1:], strict=False):
+        if x0 <= x <= x1:
+            return y0 + (x - x0) / (x1 - x0) * (y1 - y0)
+    raise AssertionError("unreachable")
+
+
+def test_sigma_table_matches_piecewise_linear_profile() -> None:
+    table = compile_precision_profile(SIGMA_PROFILE)
+    points = SIGMA_PROFILE["points"]
+
+    assert len(table.sigmas) == 50 * 20 + 1
+    for tenth in range(1000, 1700):
+        x = tenth / 10
+        assert table.sigma_at(x) == pytest.approx(_exact_sigma(points, x), abs=5e-4)
+    assert table.sigma_at(140) == pytest.approx(1.0)
+
+
+def test_cv_table_scales_with_concentration_and_clamps_outside_range() -> None:
+    table = compile_precision_profile(CV_PROFILE)
+
+    assert table.sigma_at(120) == pytest.approx(1.2)
+    assert table.sigma_at(135) == pytest.approx(0.009 * 135, abs=1e-4)
+    assert table.sigma_at(100) == table.sigma_at(120)
+    assert table.sigma_at(math.inf) == table.sigma_at(150)
+    assert math.isnan(table.sigma_at(math.nan))
+    assert table.sigma_column([120, 135, 150]) == [table.sigma_at(x) for x in (120, 135, 150)]
+
+
+def test_anchor_points_reported_for_value() -> None:
+    table = compile_precision_profile(SIGMA_PROFILE)
+
+    assert table.anchors_used(125) == [(110.0, 1.4), (140.0, 1.0)]
+    assert table.anchors_used(100) == [(110.0, 1.4)]
+    assert table.anchors_used(165) == [(160.0, 1.2)]
+
+
+def test_compiled_tables_are_cached_by_content() -> None:
+    params = {"defaults": {"c": {"m": {"precision_profile": SIGMA_PROFILE}}}}
+    copy = {"defaults": {"c": {"m": {"precision_profile": dict(SIGMA_PROFILE)}}}}
+
+    assert precision_table_for(params, "c", "m") is precision_table_for(copy, "c", "m")
+    assert precision_table_for({"defaults": {"c": {"m": {"sigma": 1}}}}, "c", "m") is None
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        {"kind": "sd", "points": [[140, 1]]},
+        {"kind": "sigma", "points": []},
+        {"kind": "sigma", "points": [[140, 1], [130, 1]]},
+        {"kind": "sigma", "points": [[140, 0]]},
+        {"kind": "sigma", "points": [[140]]},
+        {"kind": "sigma", "points": [[140, 1], [150, 1]], "step": 0},
+        {"kind": "sigma", "points": [["x", 1]]},
+        {"kind": "sigma", "points": [[140, 1]], "step": None},
+    ],
+)
+def test_invalid_profiles_are_rejected(profile: dict) -> None:
+    with pytest.raises(ValueError):
+        validate_precision_profile(profile, "c/m")
+    with pytest.raises(ValueError):
+        validate_defaults({"defaults": {"c": {"m": {"precision_profile": profile}}}})
+
+
+def test_profile_only_entries_pass_defaults_validation() -> None:
+    validate_defaults({"defaults": {"c": {"m": {"precision_profile": CV_PROFILE}}}})
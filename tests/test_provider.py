@@ -0,0 +1,93 @@
+import json
+import os
+import pickle
+import time
+
+import pytest
+
+from sodium_uncertainty.calculator import compute_payload
+from sodium_uncertainty.defaults import load_defaults
+from sodium_uncertainty.provider import ParameterProvider, freeze
+
+CENTRAL = "central_lab_indirect_ISE"
+PAYLOAD = {
+    "y1": 130,
+    "y2": 133,
+    "method1": CENTRAL,
+    "method2": CENTRAL,
+    "context": "sequential_draws",
+    "ci_level": 0.95,
+    "threshold": 2,
+}
+
+
+def _write(path, data, bump: int = 0) -> None:
+    path.write_text(json.dumps(data))
+    # Filesystems with coarse timestamps could otherwise hide a rewrite of equal size.
+    stamp = time.time_ns() + bump * 1_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+
+
+@pytest.fixture
+def defaults_file(tmp_path):
+    path = tmp_path / "variability_defaults.json"
+    _write(path, load_defaults())
+    return path
+
+
+def test_snapshot_is_frozen_and_matches_load_defaults(defaults_file) -> None:
+    provider = ParameterProvider(defaults_file)
+    snapshot = provider.snapshot
+
+    result = provider.compute_payload(PAYLOAD)
+    expected = compute_payload({**PAYLOAD, "params": load_defaults(defaults_file)})
+    assert result.pop("params_version") == snapshot.version
+    assert result == expected
+    with pytest.raises(TypeError, match="read-only"):
+        snapshot.params["defaults"]["sequential_draws"][CENTRAL]["sigma"] = 9
+    assert pickle.loads(pickle.dumps(snapshot.params)) == snapshot.params
+    assert json.loads(json.dumps(freeze({"a": [1, {"b": 2}]}))) == {"a": [1, {"b": 2}]}
+
+
+def test_refresh_swaps_valid_changes_and_keeps_last_good(defaults_file) -> None:
+    provider = ParameterProvider(defaults_file)
+    first = provider.snapshot
+    assert provider.refresh() is False
+
+    data = load_defaults()
+    data["defaults"]["sequential_draws"][CENTRAL]["loa_half_pair"] = 6.0
+    _write(defaults_file, data, bump=1)
+    assert provider.refresh() is True
+    second = provider.snapshot
+    assert (second.generation, second.version != first.version) == (2, True)
+    # In-flight callers that grabbed the old snapshot still see the old values.
+    assert first.params["defaults"]["sequential_draws"][CENTRAL]["loa_half_pair"] != 6.0
+    sd = provider.compute_payload(PAYLOAD)["delta_true"]["sd"]
+    assert sd > compute_payload({**PAYLOAD, "params": first.params})["delta_true"]["sd"]
+
+    data["defaults"]["sequential_draws"][CENTRAL]["loa_half_pair"] = -1
+    _write(defaults_file, data, bump=2)
+    assert provider.refresh() is False
+    assert "must be positive" in provider.last_error
+    assert provider.snapshot is second
+
+    defaults_file.write_text("{not json")
+    assert provider.refresh() is False
+    assert provider.snapshot is second
+
+
+def test_background_poller_picks_up_changes(defaults_file) -> None:
+    data = load_defaults()
+    with ParameterProvider(defaults_file, poll_interval=0.01) as provider:
+        version = provider.snapshot.version
+        data["defaults"]["sequential_draws"][CENTRAL]["loa_half_pair"] = 7.5
+        _write(defaults_file, data, bump=1)
+        deadline = time.monotonic() + 5
+        while provider.snapshot.version == version and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert provider.snapshot.version != version
+    assert json.loads(provider.compute_from_json(json.dumps(PAYLOAD)))["params_version"] == (
+        provider.snapshot.version
+    )
+    with pytest.raises(ValueError, match="Poll interval"):
+        ParameterProvider(defaults_file, poll_interval=0)
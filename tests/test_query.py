@@ -0,0 +1,190 @@
+import csv
+import math
+from pathlib import Path
+
+import pytest
+
+from sodium_uncertainty import query
+from sodium_uncertainty.batch import BUCKET_KEYS, ERROR_BUCKET, RESULT_COLUMNS
+from sodium_uncertainty.columnar import write_columns
+from sodium_uncertainty.query import BLOCK_ROWS, IndexBuilder, ResultIndex, index_paths, main
+from sodium_uncertainty.runner import run_batch
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+METHOD_PAIRS = ((CENTRAL, CENTRAL), (CENTRAL, ISTAT), (ISTAT, ISTAT), (ISTAT, CENTRAL))
+CONTEXTS = ("sequential_draws", "analytic_repeatability")
+
+
+def _write_input(path: Path, n_rows: int) -> list[dict[str, str]]:
+    rows = []
+    for index in range(n_rows):
+        method1, method2 = METHOD_PAIRS[index % len(METHOD_PAIRS)]
+        y2 = "bad" if index % 41 == 5 else str(118 + (index * 7) % 45)
+        rows.append(
+            {
+                "y1": str(130 + index % 11),
+                "y2": y2,
+                "method1": method1,
+                "method2": method2,
+                "context": CONTEXTS[(index // 3) % 2],
+            }
+        )
+    with path.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+@pytest.fixture
+def indexed(tmp_path: Path) -> tuple[Path, list[dict[str, str]]]:
+    source = tmp_path / "pairs.csv"
+    rows = _write_input(source, 157)
+    output = tmp_path / "results.snacol"
+    # Index built after an interrupted run picks its labels back up from the checkpoint.
+    run_batch(source, output, chunk_size=20, max_chunks=3, index=True)
+    run_batch(source, output, chunk_size=20, index=True)
+    return output, rows
+
+
+def _scan(output: Path, rows: list[dict[str, str]], predicate) -> list[int]:
+    with ResultIndex(output) as index:
+        loaded = index.rows(range(index.n_rows))
+    matches = []
+    for row_id, row in enumerate(rows):
+        bucket = loaded["bucket"][row_id]
+        record = {
+            **row,
+            "bucket": "error" if bucket == ERROR_BUCKET else BUCKET_KEYS[bucket],
+            "delta": loaded["observed_delta"][row_id],
+            "chance": loaded["chance_under_null"][row_id],
+        }
+        if predicate(record):
+            matches.append(row_id)
+    return matches
+
+
+@pytest.mark.parametrize(
+    ("query", "predicate"),
+    [
+        (
+            {"bucket": "very_unlikely", "min_abs_delta": 8, "method": ISTAT},
+            lambda r: (
+                r["bucket"] == "very_unlikely"
+                and abs(r["delta"]) >= 8
+                and ISTAT in (r["method1"], r["method2"])
+            ),
+        ),
+        (
+            {"method1": CENTRAL, "method2": ISTAT, "context": "analytic_repeatability"},
+            lambda r: (
+                (r["method1"], r["method2"]) == (CENTRAL, ISTAT)
+                and r["context"] == "analytic_repeatability"
+            ),
+        ),
+        (
+            {"min_delta": -6, "max_delta": 4, "max_chance": 0.5},
+            lambda r: -6 <= r["delta"] <= 4 and r["chance"] <= 0.5,
+        ),
+        (
+            {"bucket": ["common", "error"], "context": "sequential_draws"},
+            lambda r: r["bucket"] in ("common", "error") and r["context"] == "sequential_draws",
+        ),
+        ({"min_chance": 0.2}, lambda r: r["chance"] >= 0.2),
+        ({"min_abs_delta": 0}, lambda r: not math.isnan(r["delta"])),
+        ({}, lambda _r: True),
+    ],
+)
+def test_query_matches_full_scan(indexed, query, predicate) -> None:
+    output, rows = indexed
+    expected = _scan(output, rows, predicate)
+    assert expected or not query
+
+    with ResultIndex(output) as index:
+        assert index.query(**query).tolist() == expected
+
+
+def test_rows_loads_only_requested_ids(indexed) -> None:
+    output, _rows = indexed
+    with ResultIndex(output) as index:
+        row_ids = index.query(bucket="very_unlikely")[:3]
+        loaded = index.rows(row_ids)
+        assert loaded["row_id"].tolist() == row_ids.tolist()
+        assert all(math.isfinite(value) for value in loaded["observed_delta"])
+        assert index.query(context="unknown").tolist() == []
+        # Both contexts are real calculator contexts, so each has scored (non-error) rows.
+        for context in CONTEXTS:
+            assert len(index.query(context=context, min_chance=0)) > 0
+        assert set(index.labels("context")) == set(CONTEXTS)
+
+
+def test_unindexed_rewrite_drops_stale_index(indexed, tmp_path: Path) -> None:
+    output, _rows = indexed
+    run_batch(tmp_path / "pairs.csv", output, chunk_size=50)
+
+    assert not any(path.exists() for path in index_paths(output))
+    with pytest.raises(FileNotFoundError):
+        ResultIndex(output)
+
+
+def test_missing_bitmaps_close_the_opened_files(indexed, monkeypatch: pytest.MonkeyPatch) -> None:
+    output, _rows = indexed
+    index_paths(output)[1].unlink()
+    opened = []
+    original = query.ColumnarFile
+
+    def tracking(path):
+        opened.append(original(path))
+        return opened[-1]
+
+    monkeypatch.setattr(query, "ColumnarFile", tracking)
+    with pytest.raises(FileNotFoundError):
+        ResultIndex(output)
+    assert [handle._file.closed for handle in opened] == [True, True]
+
+
+def test_cli_counts_matches(indexed, capsys: pytest.CaptureFixture[str]) -> None:
+    output, rows = indexed
+    expected = _scan(output, rows, lambda r: r["bucket"] == "error")
+
+    main([str(output), "--bucket", "error", "--count"])
+    assert capsys.readouterr().out.strip() == str(len(expected))
+
+    main([str(output), "--bucket", "error"])
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert len(lines) == len(expected) + 1
+    assert lines[1].endswith(",error")
+
+
+def test_block_filters_and_method_names_with_separators(tmp_path: Path) -> None:
+    n_rows = 3 * BLOCK_ROWS + 5
+    results = {name: [0] * n_rows for name, _typecode in RESULT_COLUMNS}
+    results["row_id"] = list(range(n_rows))
+    results["observed_delta"] = [float(row % 7 - 3) for row in range(n_rows)]
+    results["chance_under_null"] = [row % 100 / 100 for row in range(n_rows)]
+    results["bucket"] = [row % len(BUCKET_KEYS) for row in range(n_rows)]
+    methods1 = ["a|b" if row % 5 == 0 else "a" for row in range(n_rows)]
+    methods2 = ["b" if row % 5 == 0 else "a|b" for row in range(n_rows)]
+    # "late" rows sit only in the last block, so a context query never touches the others.
+    contexts = ["late" if row > 3 * BLOCK_ROWS else "early" for row in range(n_rows)]
+    output = tmp_path / "results.snacol"
+    write_columns(output, RESULT_COLUMNS, results)
+    builder = IndexBuilder()
+    builder.add(results, methods1, methods2, contexts)
+    builder.write(output)
+
+    def expected(predicate) -> list[int]:
+        return [row for row in range(n_rows) if predicate(row)]
+
+    with ResultIndex(output) as index:
+        assert index.query(context="late").tolist() == list(range(3 * BLOCK_ROWS + 1, n_rows))
+        assert index.query(method1="a|b", method2="b").tolist() == expected(lambda r: r % 5 == 0)
+        assert index.query(method="a|b", bucket="common").tolist() == expected(
+            lambda r: r % len(BUCKET_KEYS) == 0
+        )
+        assert index.query(method1="a", context="late", min_delta=3).tolist() == expected(
+            lambda r: r % 5 and r > 3 * BLOCK_ROWS and r % 7 == 6
+        )
+        assert index.query(method1="a|b", method2="a|b").tolist() == []
+        assert set(index.labels("method1")) == {"a", "a|b"}
@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from sodium_uncertainty.calculator import compute_payload
+from sodium_uncertainty.defaults import resolve_sigma
+from sodium_uncertainty.model import loa_half_pair_to_sigma
+from sodium_uncertainty.registry import ProfileRegistry, profile_key, write_registry
+
+
+def _profiles(n_sites: int = 3, n_analyzers: int = 4) -> list[dict]:
+    profiles = []
+    for site in range(n_sites):
+        for analyzer in range(n_analyzers):
+            loa = 2.0 + site + analyzer / 10
+            profiles.append(
+                {
+                    "site": f"site{site}",
+                    "analyzer": f"istat-{analyzer:02d}",
+                    "defaults": {
+                        "analytic_repeatability": {"loa_half_pair": loa},
+                        "sequential_draws": {"loa_half_pair": loa * 2},
+                    },
+                }
+            )
+    profiles.append(
+        {
+            "site": "site0",
+            "analyzer": "central-01",
+            "defaults": {"sequential_draws": {"loa_half_pair": 5.0, "sigma": 1.5}},
+        }
+    )
+    return profiles
+
+
+@pytest.fixture
+def registry_root(tmp_path: Path) -> Path:
+    write_registry(tmp_path, _profiles())
+    return tmp_path
+
+
+def test_index_is_built_without_loading_profiles(registry_root: Path) -> None:
+    registry = ProfileRegistry(registry_root)
+
+    assert len(registry) == 13
+    assert "site2/istat-03" in registry
+    assert "site0/central-01" in registry.params["defaults"]["sequential_draws"]
+    assert "site0/central-01" not in registry.params["defaults"]["analytic_repeatability"]
+    assert registry.loads == 0
+
+
+def test_resolve_sigma_compatible_lookup_loads_lazily(registry_root: Path) -> None:
+    registry = ProfileRegistry(registry_root)
+
+    sigma = resolve_sigma(registry.params, "analytic_repeatability", "site1/istat-02")
+    assert sigma == pytest.approx(loa_half_pair_to_sigma(3.2))
+    assert registry.resolve_sigma("sequential_draws", "site0/central-01") == pytest.approx(1.5)
+    assert registry.loaded == ["site1/istat-02", "site0/central-01"]
+    with pytest.raises(KeyError):
+        registry.resolve_sigma("analytic_repeatability", "site0/central-01")
+
+
+def test_lru_bound_evicts_least_recently_used_profile(registry_root: Path) -> None:
+    registry = ProfileRegistry(registry_root, max_profiles=2)
+
+    registry.profile("site0/istat-00")
+    registry.profile("site0/istat-01")
+    registry.profile("site0/istat-00")
+    registry.profile("site0/istat-02")
+
+    assert registry.loaded == ["site0/istat-00", "site0/istat-02"]
+    assert registry.loads == 3
+    assert registry.hits == 1
+
+
+def test_batch_resolution_caches_sigma_per_context_and_analyzer(registry_root: Path) -> None:
+    registry = ProfileRegistry(registry_root, max_profiles=1)
+    keys = [f"site{row % 3}/istat-{row % 4:02d}" for row in range(1200)]
+
+    sigmas = registry.resolve_sigmas("sequential_draws", keys)
+
+    assert registry.loads == 12
+    assert sigmas[5] == pytest.approx(loa_half_pair_to_sigma((2.0 + 2 + 0.1) * 2))
+    registry.resolve_sigmas(["sequential_draws"] * len(keys), keys)
+    assert registry.loads == 12
+
+
+def test_compute_payload_accepts_registry_params(registry_root: Path) -> None:
+    registry = ProfileRegistry(registry_root)
+    payload = {
+        "y1": 130,
+        "y2": 134,
+        "method1": "site0/central-01",
+        "method2": "site2/istat-01",
+        "context": "sequential_draws",
+        "ci_level": 0.95,
+        "threshold": 2,
+        "params": registry.params,
+    }
+    result = compute_payload(payload)
+
+    assert result["errors"] == []
+    assert result["details"]["sigma1"] == pytest.approx(1.5)
+    assert result["details"]["entry1"]["override_used"] is True
+
+    missing = compute_payload({**payload, "method1": "siteX/none"})
+    assert missing["errors"] == [
+        "Variability parameters are missing for the selected context or method."
+    ]
+
+
+def test_invalid_profiles_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        profile_key("site 1", "istat")
+    with pytest.raises(ValueError):
+        write_registry(tmp_path, [{"site": "a", "analyzer": "b", "defaults": {"c": {}}}])
+
+    write_registry(tmp_path, _profiles(1, 1))
+    shard = tmp_path / "profiles" / "site0" / "istat-00.json"
+    shard.write_text(
+        json.dumps({"site": "site9", "analyzer": "istat-00", "defaults": {"c": {"sigma": 1}}})
+    )
+    with pytest.raises(ValueError):
+        ProfileRegistry(tmp_path).profile("site0/istat-00")
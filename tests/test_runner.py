@@ -0,0 +1,123 @@
+import csv
+import io
+import math
+from pathlib import Path
+
+import pytest
+
+from sodium_uncertainty.batch import BUCKET_KEYS, ERROR_BUCKET
+from sodium_uncertainty.columnar import ColumnarFile
+from sodium_uncertainty.defaults import load_defaults, params_hash
+from sodium_uncertainty.runner import (
+    CHECKPOINT_NAME,
+    SCORED_CSV_COLUMNS,
+    main,
+    run_batch,
+    score_csv_text,
+)
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _write_input(path: Path, n_rows: int) -> None:
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["y1", "y2", "method1", "method2", "context", "scale_with_na"])
+        for index in range(n_rows):
+            y2 = "bad" if index == 7 else 125 + index % 15
+            scale = "true" if index % 3 == 0 else "false"
+            writer.writerow([130 + index % 9, y2, CENTRAL, ISTAT, "sequential_draws", scale])
+
+
+def test_interrupted_run_resumes_to_identical_output(tmp_path: Path) -> None:
+    source = tmp_path / "pairs.csv"
+    _write_input(source, 23)
+    reference = tmp_path / "reference.snacol"
+    resumed = tmp_path / "resumed.snacol"
+
+    run_batch(source, reference, chunk_size=5)
+    partial = run_batch(source, resumed, chunk_size=5, max_chunks=2)
+
+    checkpoint_dir = tmp_path / "resumed.snacol.checkpoint"
+    assert not resumed.exists()
+    assert partial["chunks_done"] == 2
+    assert partial["rows_done"] == 10
+    assert (checkpoint_dir / CHECKPOINT_NAME).exists()
+
+    final = run_batch(source, resumed, chunk_size=5)
+
+    assert final["rows_done"] == 23
+    assert final["chunks_done"] == 5
+    assert resumed.read_bytes() == reference.read_bytes()
+    assert not checkpoint_dir.exists()
+
+
+def test_resume_refuses_changed_parameters(tmp_path: Path) -> None:
+    source = tmp_path / "pairs.csv"
+    _write_input(source, 12)
+    output = tmp_path / "out.snacol"
+    run_batch(source, output, chunk_size=4, max_chunks=1)
+
+    params = load_defaults()
+    params["defaults"]["sequential_draws"][CENTRAL]["sigma"] = 9.0
+    assert params_hash(params) != params_hash(load_defaults())
+
+    with pytest.raises(ValueError, match="Parameters changed"):
+        run_batch(source, output, params=params, chunk_size=4)
+    with pytest.raises(ValueError, match="chunk_size"):
+        run_batch(source, output, chunk_size=6)
+
+
+def test_cli_scores_csv(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    source = tmp_path / "pairs.csv"
+    _write_input(source, 3)
+    output = tmp_path / "cli.snacol"
+
+    main([str(source), "--output", str(output), "--chunk-size", "2"])
+
+    assert output.exists()
+    assert "Scored 3 rows in 2 chunks" in capsys.readouterr().out
+
+
+def test_csv_text_chunks_match_the_file_runner(tmp_path: Path) -> None:
+    source = tmp_path / "pairs.csv"
+    _write_input(source, 23)
+    run_batch(source, tmp_path / "out.snacol", chunk_size=50)
+    header, *lines = source.read_text().splitlines()
+    base = {"ci_level": 0.95, "threshold": 2, "na_ref": 140, "params": load_defaults()}
+
+    # Chunks are independent, so any split of the records (plus blank lines) scores the same.
+    first, first_counts = score_csv_text("\n".join(lines[:10]) + "\n\n", header.split(","), base)
+    second, second_counts = score_csv_text("\n".join(lines[10:]), header.split(","), base)
+    rows = list(csv.reader((first + second).splitlines()))
+
+    assert len(rows) == 23
+    assert sum(first_counts.values()) == 10 and second_counts["error"] == 0
+    assert first_counts["error"] == 1
+    with ColumnarFile(tmp_path / "out.snacol") as expected:
+        for row, chance, code in zip(
+            rows, expected.column("chance_under_null"), expected.column("bucket"), strict=True
+        ):
+            scored = dict(zip([*header.split(","), *SCORED_CSV_COLUMNS], row, strict=True))
+            if code == ERROR_BUCKET:
+                assert scored["bucket"] == "error" and scored["chance_under_null"] == ""
+                assert math.isnan(chance)
+            else:
+                assert scored["bucket"] == BUCKET_KEYS[code]
+                assert float(scored["chance_under_null"]) == chance
+
+
+def test_csv_text_keeps_quoted_fields_whole() -> None:
+    base = {"ci_level": 0.95, "threshold": 2, "na_ref": 140, "params": load_defaults()}
+    header = ["note", "y1", "y2", "method1", "method2", "context"]
+    text = (
+        f'"ward 4, bed 2\nredrawn",130,136,{CENTRAL},{ISTAT},sequential_draws\n'
+        f'"said ""haemolysed""",131,131,{CENTRAL},{ISTAT},sequential_draws\n'
+    )
+
+    scored, counts = score_csv_text(text, header, base)
+    rows = list(csv.reader(io.StringIO(scored)))
+
+    assert [row[0] for row in rows] == ["ward 4, bed 2\nredrawn", 'said "haemolysed"']
+    assert counts["error"] == 0 and sum(counts.values()) == 2
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from sodium_uncertainty import calculator
+from sodium_uncertainty.calculator import compute_payload
+from sodium_uncertainty.defaults import load_defaults
+from sodium_uncertainty.scenarios import (
+    COMPARISON_COLUMNS,
+    MAX_SCENARIOS,
+    compute_scenarios,
+    compute_scenarios_from_json,
+)
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _payload() -> dict:
+    return {
+        "y1": 130,
+        "y2": 136,
+        "method1": CENTRAL,
+        "method2": ISTAT,
+        "context": "analytic_repeatability",
+        "ci_level": 0.95,
+        "threshold": 2,
+        "scale_with_na": False,
+        "na_ref": 140,
+        "curve_mode": "parametric",
+        "params": load_defaults(),
+    }
+
+
+def test_scenarios_match_separate_computations() -> None:
+    payload = _payload()
+    variations = [
+        {"label": "Sequential draws", "context": "sequential_draws"},
+        {"label": "Na2 on central lab", "method2": CENTRAL},
+        {"context": "sequential_draws", "method2": CENTRAL},
+    ]
+    result = json.loads(
+        compute_scenarios_from_json(json.dumps({**payload, "scenarios": variations}))
+    )
+
+    assert result["errors"] == []
+    labels = [scenario["label"] for scenario in result["scenarios"]]
+    assert labels == ["Base", "Sequential draws", "Na2 on central lab", "Scenario 3"]
+    assert result["comparison"]["columns"] == list(COMPARISON_COLUMNS)
+    for scenario, variation, row in zip(
+        result["scenarios"], [{}, *variations], result["comparison"]["rows"], strict=True
+    ):
+        overrides = {key: value for key, value in variation.items() if key != "label"}
+        expected = compute_payload({**payload, **overrides})
+        assert scenario["overrides"] == overrides
+        assert scenario["result"] == json.loads(json.dumps(expected))
+        table = dict(zip(COMPARISON_COLUMNS, row, strict=True))
+        assert table["context"] == expected["context"]
+        assert table["chance_under_null"] == expected["probabilities"]["chance_under_null"]
+        assert table["delta_true_ci_high"] == expected["delta_true"]["ci_high"]
+        assert table["error"] is None
+
+
+def test_shared_sigma_sources_and_identical_scenarios(monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = _payload()
+    entry = payload["params"]["defaults"]["analytic_repeatability"][ISTAT]
+    entry["precision_profile"] = {"kind": "sigma", "points": [[110, 1.0], [150, 0.8]]}
+    calls = []
+    original = calculator.precision_table_for
+
+    def counting(params, context, method):
+        calls.append((context, method))
+        return original(params, context, method)
+
+    monkeypatch.setattr(calculator, "precision_table_for", counting)
+    variations = [{"y2": 140}, {"y2": 145}, {"label": "Same as base", "y2": 136}]
+
+    result = compute_scenarios({**payload, "scenarios": variations})
+
+    # Two (context, method) sources for four scenarios, and the repeat of the base reuses it.
+    assert sorted(calls) == [("analytic_repeatability", CENTRAL), ("analytic_repeatability", ISTAT)]
+    assert result["scenarios"][3]["result"] is result["scenarios"][0]["result"]
+    sigma2 = [scenario["result"]["details"]["sigma2"] for scenario in result["scenarios"]]
+    assert sigma2[1] != sigma2[2]
+
+
+def test_invalid_scenarios_are_reported() -> None:
+    payload = _payload()
+
+    result = compute_scenarios({**payload, "scenarios": [{"params": {}}]})
+    assert result["errors"][0].startswith("Scenario 1 cannot vary params;")
+    assert compute_scenarios({**payload, "scenarios": "context"})["errors"]
+    too_many = [{"y2": 130 + index} for index in range(MAX_SCENARIOS + 1)]
+    assert compute_scenarios({**payload, "scenarios": too_many})["errors"]
+
+    result = compute_scenarios({**payload, "scenarios": [{"context": "bedside"}]})
+    assert result["errors"] == []
+    failed = dict(zip(COMPARISON_COLUMNS, result["comparison"]["rows"][1], strict=True))
+    assert failed["error"] == "Invalid context selection."
+    assert result["scenarios"][1]["result"]["errors"] == ["Invalid context selection."]
@@ -1,3 +1,4 @@
+import importlib.util
 import json
 import os
 import re
@@ -12,6 +13,22 @@ SRC_PACKAGE = ROOT / "src" / "sodium_uncertainty"
 DOCS_PACKAGE = ROOT / "docs" / "sodium_uncertainty"
 
 
+def _load_stage_script():
+    spec = importlib.util.spec_from_file_location(
+        "stage_docs_python", ROOT / "scripts" / "stage_docs_python.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _precache_manifest() -> dict:
+    text = (ROOT / "docs" / "precache-manifest.js").read_text()
+    match = re.search(r"self\.PRECACHE_MANIFEST = (\{.*\});", text, re.DOTALL)
+    assert match is not None
+    return json.loads(match.group(1))
+
+
 def _expected_staged_text(source: Path) -> str:
     text = source.read_text()
     if source.name == "defaults.py":
@@ -60,10 +77,62 @@ def test_docs_app_compiles_and_exposes_compute_from_json() -> None:
     compile((ROOT / "docs" / "app.py").read_text(), str(ROOT / "docs" / "app.py"), "exec")
     env = os.environ.copy()
     env["PYTHONPATH"] = str(ROOT / "docs")
-    code = "import app; assert callable(app.compute_from_json)"
+    code = (
+        "import app; assert callable(app.compute_from_json)"
+        " and callable(app.compute_scenarios_from_json)"
+    )
     subprocess.run(
         [sys.executable, "-c", code],
         cwd=ROOT / "docs",
         env=env,
         check=True,
     )
+
+
+def test_precache_manifest_matches_staged_content_hashes() -> None:
+    assert _precache_manifest() == _load_stage_script().build_precache_manifest()
+
+
+def test_precache_manifest_covers_everything_the_page_loads() -> None:
+    manifest = _precache_manifest()
+    index_text = (ROOT / "docs" / "index.html").read_text()
+    match = re.search(r"const packageFiles = \[(.*?)\];", index_text, re.DOTALL)
+    assert match is not None
+
+    for path in re.findall(r'"([^"]+)"', match.group(1)):
+        assert path in manifest["assets"]
+    app_assets = ("index.html", "styles.css", "app.py", "variability_defaults.json")
+    for path in (*app_assets, "plot-render.js", "plot-worker.js", "bulk-worker.js"):
+        assert path in manifest["assets"]
+    pyodide_script = re.search(r'<script src="([^"]+pyodide\.js)"></script>', index_text)
+    assert pyodide_script is not None
+    assert pyodide_script.group(1) in manifest["runtime"]
+
+
+def test_index_registers_service_worker_that_imports_manifest() -> None:
+    index_text = (ROOT / "docs" / "index.html").read_text()
+    worker_text = (ROOT / "docs" / "service-worker.js").read_text()
+
+    assert 'navigator.serviceWorker.register("service-worker.js"' in index_text
+    assert 'importScripts("precache-manifest.js")' in worker_text
+
+
+def test_plots_render_through_shared_layered_renderer() -> None:
+    index_text = (ROOT / "docs" / "index.html").read_text()
+    worker_text = (ROOT / "docs" / "plot-worker.js").read_text()
+
+    assert '<script src="plot-render.js"></script>' in index_text
+    assert "PlotRender.createClient(" in index_text
+    assert "ctx.clearRect" not in index_text
+    assert 'importScripts("plot-render.js")' in worker_text
+
+
+def test_bulk_scoring_runs_in_workers_on_local_files() -> None:
+    index_text = (ROOT / "docs" / "index.html").read_text()
+    worker_text = (ROOT / "docs" / "bulk-worker.js").read_text()
+
+    assert 'new Worker("bulk-worker.js")' in index_text
+    assert "navigator.hardwareConcurrency" in index_text
+    assert 'pyimport("sodium_uncertainty.runner")' in worker_text
+    # Chunks and results only travel between the page and its workers.
+    assert "fetch(" not in index_text[index_text.index("const runBulk") :].split("const init")[0]
@@ -0,0 +1,69 @@
+import csv
+import json
+
+import pytest
+
+from sodium_uncertainty.columnar import ColumnarFile
+from sodium_uncertainty.pairing import match_pairs, parse_results
+from sodium_uncertainty.runner import run_batch
+from sodium_uncertainty.synthetic import generate_cohort, generate_shard
+
+
+def test_shards_are_deterministic_and_sized() -> None:
+    first = generate_shard(3, 500, seed=7)
+    assert first == generate_shard(3, 500, seed=7)
+    assert first != generate_shard(3, 500, seed=8)
+    assert len(first["value"]) == 500
+    assert all(100 <= value <= 175 for value in first["value"])
+    assert set(first["method"]) == {0, 1}
+    assert all(isinstance(value, int) for value in first["value"])
+
+    pairs = generate_shard(0, 200, kind="pairs")
+    assert len(pairs["y1"]) == 200
+    assert all(elapsed > 0 for elapsed in pairs["elapsed_hours"])
+
+
+def test_output_is_independent_of_workers(tmp_path) -> None:
+    serial = tmp_path / "serial.csv"
+    parallel = tmp_path / "parallel.csv"
+    generate_cohort(serial, 2_500, seed=1, shard_rows=1_000)
+    generate_cohort(parallel, 2_500, seed=1, shard_rows=1_000, workers=2)
+
+    assert serial.read_bytes() == parallel.read_bytes()
+    with serial.open(newline="") as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == ["patient_id", "time", "value", "method"]
+    assert len(rows) == 2_501
+
+
+def test_formats_agree(tmp_path) -> None:
+    generate_cohort(tmp_path / "pairs.ndjson", 300, seed=2, kind="pairs")
+    generate_cohort(tmp_path / "pairs.snacol", 300, seed=2, kind="pairs")
+
+    records = [json.loads(line) for line in (tmp_path / "pairs.ndjson").read_text().splitlines()]
+    with ColumnarFile(tmp_path / "pairs.snacol") as columns:
+        methods = columns.meta["methods"]
+        assert list(columns.column("y1")) == [record["y1"] for record in records]
+        assert [methods[code] for code in columns.column("method2")] == [
+            record["method2"] for record in records
+        ]
+    assert {record["context"] for record in records} == {"sequential_draws"}
+    with pytest.raises(ValueError, match="Format"):
+        generate_cohort(tmp_path / "pairs.txt", 10)
+
+
+def test_generated_data_feeds_pairing_and_runner(tmp_path) -> None:
+    results = generate_shard(0, 400, seed=4)
+    methods = ["central_lab_indirect_ISE", "istat_direct_ISE"]
+    feed = (
+        (patient, time, value, methods[code])
+        for patient, time, value, code in zip(*results.values(), strict=True)
+    )
+    assert len(match_pairs(parse_results(feed), max_hours=48)) > 0
+
+    pairs_path = tmp_path / "pairs.csv"
+    generate_cohort(pairs_path, 250, seed=4, kind="pairs")
+    state = run_batch(pairs_path, tmp_path / "scored.snacol")
+    assert state["rows_done"] == 250
+    with pytest.raises(ValueError, match="no sequential_draws"):
+        generate_shard(0, 10, method_mix={"unknown": 1})
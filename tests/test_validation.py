@@ -0,0 +1,244 @@
+import itertools
+from array import array
+
+import pytest
+
+from sodium_uncertainty.calculator import compute_payload
+from sodium_uncertainty.defaults import load_defaults
+from sodium_uncertainty.validation import (
+    CI_LEVEL_OUT_OF_RANGE,
+    ERROR_FLAGS,
+    INVALID_CONTEXT,
+    LOA_MISSING,
+    MISSING_PARAMS,
+    NA1_NOT_NUMBER,
+    NA1_OUT_OF_RANGE,
+    NA2_OUT_OF_RANGE,
+    PARAMS_INVALID,
+    PRECISION_PROFILE_INVALID,
+    SCALED_SIGMA_NOT_POSITIVE,
+    SIGMA_NOT_POSITIVE,
+    error_messages,
+    validate_columns,
+    warning_messages,
+)
+
+CENTRAL = "central_lab_indirect_ISE"
+ISTAT = "istat_direct_ISE"
+
+
+def _params() -> dict:
+    params = load_defaults()
+    params["defaults"]["sequential_draws"]["bad_sigma"] = {"sigma": -1}
+    params["defaults"]["sequential_draws"]["no_loa"] = {"sigma": "", "loa_half_pair": ""}
+    params["defaults"]["sequential_draws"]["profiled"] = {
+        "precision_profile": {"kind": "cv", "points": [[110, 0.012], [150, 0.009]]}
+    }
+    return params
+
+
+def _rows() -> list[dict]:
+    grid = itertools.product(
+        [130, "131", "abc", None, 95, 180.5, 0, -4],
+        ["sequential_draws", "analytic_repeatability", "bogus"],
+        [CENTRAL, ISTAT, "unknown", "bad_sigma", "no_loa", "profiled"],
+        [0.95, 1.5, "x"],
+        [2, -1, None],
+        [True, False],
+        [140, 0, "ref"],
+    )
+    return [
+        {
+            "y1": y1,
+            "y2": 133,
+            "context": context,
+            "method1": CENTRAL,
+            "method2": method2,
+            "ci_level": ci_level,
+            "threshold": threshold,
+            "scale_with_na": scale,
+            "na_ref": na_ref,
+        }
+        for y1, context, method2, ci_level, threshold, scale, na_ref in grid
+    ]
+
+
+def test_bulk_masks_reproduce_compute_payload_messages() -> None:
+    params = _params()
+    rows = _rows()
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+    columns["params"] = params
+
+    validation = validate_columns(columns)
+
+    assert validation.n_rows == len(rows)
+    for index, row in enumerate(rows):
+        result = compute_payload({**row, "params": params})
+        assert error_messages(validation.error_mask[index]) == result["errors"], row
+        assert warning_messages(validation.warning_mask[index]) == result["warnings"], row
+
+
+def test_scalar_columns_broadcast_and_masks_are_compact() -> None:
+    validation = validate_columns(
+        {
+            "y1": [130, 90, "n/a", 140],
+            "y2": [133, 133, 133, 175],
+            "context": "sequential_draws",
+            "method1": CENTRAL,
+            "method2": ISTAT,
+            "ci_level": 0.95,
+            "threshold": 2,
+            "params": load_defaults(),
+        }
+    )
+
+    assert isinstance(validation.error_mask, array)
+    assert validation.error_mask.itemsize == 4
+    assert list(validation.error_mask) == [0, 0, NA1_NOT_NUMBER, 0]
+    assert list(validation.warning_mask) == [0, NA1_OUT_OF_RANGE, 0, NA2_OUT_OF_RANGE]
+    assert validation.error_rows == 1
+    assert validation.warning_rows == 2
+    assert validation.error_counts["na1_not_number"] == 1
+    assert validation.warning_counts == {
+        "na1_out_of_range": 1,
+        "na2_out_of_range": 1,
+        "off_resolution_grid": 0,
+    }
+
+
+def test_parameter_errors_stop_at_first_failure_like_compute_payload() -> None:
+    validation = validate_columns(
+        {
+            "y1": 130,
+            "y2": 133,
+            "context": ["bogus", "sequential_draws", "sequential_draws", "sequential_draws"],
+            "method1": [CENTRAL, "unknown", "no_loa", CENTRAL],
+            "method2": [CENTRAL, "bad_sigma", CENTRAL, "bad_sigma"],
+            "ci_level": [0.95, 0.95, 0.95, 2.0],
+            "threshold": 2,
+            "params": _params(),
+        }
+    )
+
+    assert list(validation.error_mask) == [
+        INVALID_CONTEXT,
+        MISSING_PARAMS,
+        LOA_MISSING,
+        CI_LEVEL_OUT_OF_RANGE,
+    ]
+    assert SIGMA_NOT_POSITIVE not in validation.error_mask
+
+
+@pytest.mark.parametrize("params", [None, "defaults", [1], {"defaults": [1]}])
+def test_malformed_params_share_the_compute_payload_message(params) -> None:
+    payload = {
+        "y1": 130,
+        "y2": 133,
+        "context": "sequential_draws",
+        "method1": CENTRAL,
+        "method2": ISTAT,
+        "ci_level": 0.95,
+        "threshold": 2,
+        "params": params,
+    }
+    validation = validate_columns(payload)
+
+    assert list(validation.error_mask) == [PARAMS_INVALID]
+    assert error_messages(PARAMS_INVALID) == compute_payload(payload)["errors"]
+    assert compute_payload(payload)["errors"] == ["Invalid variability parameters."]
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        {"kind": "sigma", "points": [["x", 1.0], [150, 0.8]]},
+        {"kind": "sigma", "points": [[110, None]]},
+        {"kind": "sigma", "points": [[110, 1.0], [150, 0.8]], "step": "fine"},
+        {"kind": "sd", "points": [[110, 1.0]]},
+    ],
+)
+def test_malformed_precision_profiles_match_compute_payload(profile: dict) -> None:
+    params = load_defaults()
+    params["defaults"]["sequential_draws"][ISTAT]["precision_profile"] = profile
+    payload = {
+        "y1": 130,
+        "y2": 133,
+        "context": "sequential_draws",
+        "method1": CENTRAL,
+        "method2": ISTAT,
+        "ci_level": 0.95,
+        "threshold": 2,
+        "params": params,
+    }
+    validation = validate_columns(payload)
+
+    assert list(validation.error_mask) == [PRECISION_PROFILE_INVALID]
+    assert error_messages(PRECISION_PROFILE_INVALID) == compute_payload(payload)["errors"]
+
+
+def test_scaled_sigma_check_only_applies_when_scaling() -> None:
+    columns = {
+        "y1": [0, 0],
+        "y2": 133,
+        "context": "sequential_draws",
+        "method1": CENTRAL,
+        "method2": CENTRAL,
+        "ci_level": 0.95,
+        "threshold": 2,
+        "scale_with_na": [True, False],
+        "params": load_defaults(),
+    }
+
+    validation = validate_columns(columns)
+
+    assert list(validation.error_mask) == [SCALED_SIGMA_NOT_POSITIVE, 0]
+
+
+def test_flag_table_is_ordered_single_bits() -> None:
+    bits = [bit for bit, _name, _message in ERROR_FLAGS]
+    assert bits == [1 << index for index in range(len(bits))]
+    assert error_messages(0) == []
+
+
+def test_mismatched_column_lengths_raise() -> None:
+    with pytest.raises(ValueError):
+        validate_columns({"y1": [130, 131], "y2": [133], "params": load_defaults()})
+
+
+def test_resolution_curve_mode_and_exceedance_masks_match_compute_payload() -> None:
+    params = _params()
+    grid = itertools.product(
+        [130, 130.5],
+        [None, "", 1, 0.5, 0, -1, "inf", "nan", 1e-5, "step"],
+        ["normal", "convolution"],
+        ["points", "parametric", "svg"],
+        [CENTRAL, "no_loa"],
+    )
+    rows = [
+        {
+            "y1": y1,
+            "y2": 133,
+            "context": "sequential_draws",
+            "method1": CENTRAL,
+            "method2": method2,
+            "ci_level": 0.95,
+            "threshold": 2,
+            "resolution": resolution,
+            "error_engine": engine,
+            "curve_mode": curve_mode,
+        }
+        for y1, resolution, engine, curve_mode, method2 in grid
+    ]
+    per_row = [[1, 2], None, [-1], list(range(1001)), "x"]
+    for exceedance in (None, [0, 2.5], [-1], per_row * (len(rows) // len(per_row))):
+        columns = {key: [row[key] for row in rows] for key in rows[0]}
+        columns["params"] = params
+        columns["exceedance_thresholds"] = exceedance
+
+        validation = validate_columns(columns)
+
+        for index, row in enumerate(rows):
+            value = exceedance[index] if exceedance and len(exceedance) == len(rows) else exceedance
+            result = compute_payload({**row, "exceedance_thresholds": value, "params": params})
+            assert error_messages(validation.error_mask[index]) == result["errors"], row
+            assert warning_messages(validation.warning_mask[index]) == result["warnings"], row